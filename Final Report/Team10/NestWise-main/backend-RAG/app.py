@@ -1,15 +1,29 @@
 # app.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers.chatBot import chatRouter
-from routers.userAuth import authRouter
-from routers.textizer import router as textizer_router
-from pymongo import MongoClient
+from routers.search import searchRouter
+from routers.documents import documentsRouter
+from retrieval.rag_index import load_or_build_index, read_manifest, RAG_INDEX_DIR
+from retrieval.chunk_index import ChunkIndex
+from retrieval.batcher import SearchBatcher
+from retrieval.namespaces import NamespaceStore
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the persisted index for retirement_pdfs once per process (or build it on first start)
+    embeddings, vector_store = load_or_build_index()
+    app.state.chunk_index = ChunkIndex.from_vector_store(vector_store)
+    app.state.manifest = read_manifest(RAG_INDEX_DIR)
+    app.state.batcher = SearchBatcher(app.state.chunk_index)
+    # Users' own uploaded documents, searched together with the shared corpus
+    app.state.namespaces = NamespaceStore(embeddings)
+    print("Chunks per topic:", app.state.chunk_index.topic_counts())
+    yield
 
 
-app = FastAPI(title="Basic FastAPI App")
+app = FastAPI(title="NestWise Retrieval Service", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -22,33 +36,12 @@ app.add_middleware(
 
 @app.get("/")
 async def home():
-    return {"message": "Hello, FastAPI is running!"}
-
-app.include_router(authRouter, prefix="/userauth", tags=["userAuth"])
-
-
-
+    return {"message": "Retrieval service is running!"}
 
+app.include_router(searchRouter, tags=["search"])
+app.include_router(documentsRouter, tags=["documents"])
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
-
-
-
-
-
-# MongoDB setup
-client = MongoClient("mongodb://nestwise-mongo:27017/")
-db = client["nestwise_db"]
-users_collection = db["users"]
-
-
-
-# Test MongoDB connection
-try:
-    client.admin.command("ping")
-    print("MongoDB connected successfully!")
-except Exception as e:
-    print("MongoDB connection failed:", e)
+    uvicorn.run("app:app", host="0.0.0.0", port=8002, reload=True)
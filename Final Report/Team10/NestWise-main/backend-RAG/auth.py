@@ -1,10 +1,13 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+import hmac
 import os
 
 SECRET_KEY = os.getenv("AUTH_JWT_SECRET")
 ALGORITHM = os.getenv("AUTH_JWT_ALGORITHM")
+# Shared secret the chat service sends as its bearer token; it may search any user's namespace
+RAG_SERVICE_TOKEN = os.getenv("RAG_SERVICE_TOKEN", "").strip()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -16,4 +19,10 @@ def verify_access_token(token: str = Depends(oauth2_scheme)):
             raise HTTPException(status_code=401, detail="Invalid token")
         return email
     except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+def verify_search_access(token: str = Depends(oauth2_scheme)):
+    """None for the chat service (trusted to name the user's namespace), else the end user's email."""
+    if RAG_SERVICE_TOKEN and hmac.compare_digest(token.encode(), RAG_SERVICE_TOKEN.encode()):
+        return None
+    return verify_access_token(token)
@@ -0,0 +1,146 @@
+# backend_RAG/benchmarks/retrieval_bench.py
+# Run from backend-RAG:
+#   python -m benchmarks.retrieval_bench                       # current CHUNK_SIZE/CHUNK_OVERLAP
+#   python -m benchmarks.retrieval_bench --sweep               # chunking grid
+#   python -m benchmarks.retrieval_bench --sweep --chunk-sizes 600 900 --overlaps 100 150 --k 1 3 5
+# Every run builds a fresh in-memory index (nothing is persisted). With EMBEDDING_BACKEND=openai each
+# configuration re-embeds the whole corpus, so prefer the local backend for wide sweeps.
+import os
+import json
+import time
+import pickle
+import argparse
+import numpy as np
+
+from retrieval.embeddings import EMBEDDING_BACKEND, LocalEmbeddings
+from retrieval.rag_index import PDF_FOLDER, CHUNK_SIZE, CHUNK_OVERLAP, list_pdf_files, build_index
+from retrieval.chunk_index import ChunkIndex
+
+GOLDEN_FILE = os.path.join(os.path.dirname(__file__), "retrieval_golden.json")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_K = (1, 3, 5)
+SWEEP_CHUNK_SIZES = (500, 900, 1300)
+SWEEP_OVERLAPS = (0, 150, 300)
+
+
+def load_golden(path=GOLDEN_FILE):
+    """[{"question", "expected": [{"source", "page"}]}] -> [(question, {(source, page)})]"""
+    with open(path) as f:
+        data = json.load(f)
+    return [(item["question"], {(e["source"], int(e["page"])) for e in item["expected"]}) for item in data]
+
+
+def index_memory(chunk_index) -> dict:
+    vectors = chunk_index.matrix.nbytes
+    text = sum(len(doc.page_content.encode("utf-8")) for doc in chunk_index.docs)
+    model = len(pickle.dumps(chunk_index.embeddings)) if isinstance(chunk_index.embeddings, LocalEmbeddings) else 0
+    return {"vectors_bytes": vectors, "text_bytes": text, "model_bytes": model, "total_bytes": vectors + text + model}
+
+
+def evaluate(chunk_index, golden, ks) -> dict:
+    max_k = max(ks)
+    hits = {k: [] for k in ks}
+    recalls = {k: [] for k in ks}
+    reciprocal_ranks, latencies, per_question = [], [], []
+    for question, expected in golden:
+        start = time.perf_counter()
+        results = chunk_index.search(question, k=max_k)
+        latencies.append(time.perf_counter() - start)
+
+        retrieved = [(os.path.basename(doc.metadata.get("source", "")), int(doc.metadata.get("page", -1))) for doc, _ in results]
+        relevant = [pair in expected for pair in retrieved]
+        first = next((i for i, r in enumerate(relevant) if r), None)
+        reciprocal_ranks.append(0.0 if first is None else 1.0 / (first + 1))
+        for k in ks:
+            top = set(p for p, r in zip(retrieved[:k], relevant[:k]) if r)
+            hits[k].append(bool(top))
+            recalls[k].append(len(top) / len(expected) if expected else 0.0)
+        per_question.append({"question": question, "first_relevant_rank": None if first is None else first + 1, "retrieved": retrieved})
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "hit_rate": {f"@{k}": round(float(np.mean(hits[k])), 4) for k in ks},
+        "recall": {f"@{k}": round(float(np.mean(recalls[k])), 4) for k in ks},
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+        "latency_ms": {
+            "mean": round(float(latencies.mean()), 3),
+            "p50": round(float(np.percentile(latencies, 50)), 3),
+            "p95": round(float(np.percentile(latencies, 95)), 3),
+        },
+        "questions": per_question,
+    }
+
+
+def run_config(pdf_files, golden, backend, chunk_size, chunk_overlap, ks) -> dict:
+    start = time.perf_counter()
+    embeddings, vector_store = build_index(pdf_files, backend, chunk_size, chunk_overlap)
+    chunk_index = ChunkIndex.from_vector_store(vector_store)
+    build_seconds = time.perf_counter() - start
+    return {
+        "backend": backend,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "chunks": len(chunk_index),
+        "build_seconds": round(build_seconds, 3),
+        "memory": index_memory(chunk_index),
+        **evaluate(chunk_index, golden, ks),
+    }
+
+
+def markdown_table(results, ks) -> str:
+    header = ["backend", "chunk_size", "overlap", "chunks", "build s", "index MB"]
+    header += [f"hit@{k}" for k in ks] + [f"recall@{k}" for k in ks] + ["MRR", "p50 ms", "p95 ms"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for r in results:
+        row = [r["backend"], r["chunk_size"], r["chunk_overlap"], r["chunks"], r["build_seconds"],
+               round(r["memory"]["total_bytes"] / 1e6, 2)]
+        row += [r["hit_rate"][f"@{k}"] for k in ks] + [r["recall"][f"@{k}"] for k in ks]
+        row += [r["mrr"], r["latency_ms"]["p50"], r["latency_ms"]["p95"]]
+        lines.append("| " + " | ".join(str(v) for v in row) + " |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval quality and latency benchmark over retirement_pdfs")
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, choices=["openai", "local"])
+    parser.add_argument("--pdf-folder", default=PDF_FOLDER)
+    parser.add_argument("--golden", default=GOLDEN_FILE)
+    parser.add_argument("--k", type=int, nargs="+", default=list(DEFAULT_K))
+    parser.add_argument("--sweep", action="store_true", help="evaluate every chunk size x overlap combination")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=list(SWEEP_CHUNK_SIZES))
+    parser.add_argument("--overlaps", type=int, nargs="+", default=list(SWEEP_OVERLAPS))
+    parser.add_argument("--output", default=None, help="report path (default benchmarks/results/retrieval_<timestamp>.json)")
+    args = parser.parse_args()
+
+    golden = load_golden(args.golden)
+    pdf_files = list_pdf_files(args.pdf_folder)
+    ks = sorted(set(args.k))
+    if args.sweep:
+        configs = [(size, overlap) for size in args.chunk_sizes for overlap in args.overlaps if overlap < size]
+    else:
+        configs = [(CHUNK_SIZE, CHUNK_OVERLAP)]
+
+    results = []
+    for chunk_size, chunk_overlap in configs:
+        print(f"\n=== {args.backend} chunk_size={chunk_size} chunk_overlap={chunk_overlap} ===")
+        results.append(run_config(pdf_files, golden, args.backend, chunk_size, chunk_overlap, ks))
+
+    table = markdown_table(results, ks)
+    print("\n" + table)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"retrieval_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "golden_questions": len(golden),
+            "pdf_files": [os.path.basename(p) for p in pdf_files],
+            "results": results,
+        }, f, indent=2)
+    with open(os.path.splitext(output)[0] + ".md", "w") as f:
+        f.write(table + "\n")
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
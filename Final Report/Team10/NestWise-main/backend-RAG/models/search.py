@@ -0,0 +1,57 @@
+# models/search.py
+from pydantic import BaseModel, Field
+
+# Pydantic models
+class SearchRequest(BaseModel):
+    query: str
+    k: int = Field(3, ge=1, le=50)
+    topic: str | None = None
+    namespace: str | None = None    # also search this user's uploaded documents (chat service only; end users get their own)
+    include_shared: bool = True     # False: only the namespace
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[SearchRequest] = Field(..., max_length=256)
+
+
+class SearchHit(BaseModel):
+    id: str | None = None
+    page_content: str
+    metadata: dict
+    score: float
+
+
+class SearchResponse(BaseModel):
+    results: list[SearchHit]
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[list[SearchHit]]
+
+
+class EmbedRequest(BaseModel):
+    texts: list[str] = Field(..., max_length=512)
+
+
+class EmbedResponse(BaseModel):
+    vectors: list[list[float]]
+
+
+class IndexInfoResponse(BaseModel):
+    fingerprint: str | None = None
+    backend: str | None = None
+    chunks: int
+    topics: dict
+    batching: dict
+    namespaces: dict
+
+
+class DocumentInfo(BaseModel):
+    doc_id: str
+    filename: str
+    chunks: int
+    uploaded_at: float
+
+
+class DocumentListResponse(BaseModel):
+    documents: list[DocumentInfo]
@@ -0,0 +1,75 @@
+# backend_RAG/retrieval/batcher.py
+import os
+import asyncio
+import logging
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Concurrent /search requests arriving within the window share one embedding call and one matrix multiply
+RAG_BATCH_WINDOW_MS = float(os.getenv("RAG_BATCH_WINDOW_MS", "5"))
+RAG_MAX_BATCH = int(os.getenv("RAG_MAX_BATCH", "64"))
+
+
+class SearchBatcher:
+    """
+    Micro-batches single searches: the first query in an empty batch starts a short timer, and the
+    batch runs as one ChunkIndex.search_batch when the timer fires or RAG_MAX_BATCH queries are queued.
+    """
+
+    def __init__(self, chunk_index, window_ms: float = RAG_BATCH_WINDOW_MS, max_batch: int = RAG_MAX_BATCH):
+        self.chunk_index = chunk_index
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._pending = []              # (query, k, topic, future)
+        self._timer = None
+        self.batches = 0
+        self.queries = 0
+        self.largest_batch = 0
+
+    async def search(self, query: str, k: int = 3, topic=None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, k, topic, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.queries += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        queries = [query for query, _, _, _ in batch]
+        topics = [topic for _, _, topic, _ in batch]
+        k = max(k for _, k, _, _ in batch)
+        try:
+            # Embedding may call OpenAI, so keep it off the event loop
+            results = await run_in_threadpool(self.chunk_index.search_batch, queries, k, topics)
+        except Exception as exc:
+            logger.exception("Batched search of %d queries failed", len(batch))
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, query_k, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result[:query_k])
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,94 @@
+# backend_RAG/retrieval/chunk_index.py
+import numpy as np
+from langchain_core.documents import Document
+
+from retrieval.topics import normalize_topic
+
+
+class ChunkIndex:
+    """
+    Dense matrix view over an InMemoryVectorStore with per-topic postings.
+    Vectors are L2-normalized once, so a search is a single matrix-vector product over
+    either the whole corpus or just the rows tagged with the requested topic.
+    """
+
+    def __init__(self, embeddings, docs: list[Document], vectors):
+        self.embeddings = embeddings
+        self.docs = docs
+        self.by_id = {doc.id: doc for doc in docs}
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(docs), -1) if docs else np.zeros((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+
+        postings = {}
+        for row, doc in enumerate(docs):
+            for topic in doc.metadata.get("topics", []):
+                postings.setdefault(topic, []).append(row)
+        self.postings = {topic: np.asarray(rows, dtype=np.int64) for topic, rows in postings.items()}
+
+    @classmethod
+    def from_vector_store(cls, vector_store):
+        records = list(vector_store.store.values())
+        docs = [Document(id=r["id"], page_content=r["text"], metadata=r["metadata"]) for r in records]
+        vectors = [r["vector"] for r in records]
+        return cls(vector_store.embeddings, docs, vectors)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def topic_counts(self) -> dict:
+        return {topic: len(rows) for topic, rows in self.postings.items()}
+
+    def _topic_rows(self, topic):
+        topic = normalize_topic(topic)
+        if topic is None:
+            return None
+        rows = self.postings.get(topic)
+        if rows is None or len(rows) == 0:
+            print(f"No chunks tagged '{topic}', searching the full corpus")
+            return None
+        return rows
+
+    def _top_k(self, scores, k, rows=None) -> list[tuple[Document, float]]:
+        """scores covers the whole corpus (rows selects a topic subset) or just rows when already sliced."""
+        if rows is not None and len(scores) == len(self.docs):
+            scores = scores[rows]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        positions = top if rows is None else rows[top]
+        return [(self.docs[int(p)], float(scores[i])) for p, i in zip(positions, top)]
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def search_by_vector(self, query_vector, k: int = 3, topic=None) -> list[tuple[Document, float]]:
+        if not self.docs:
+            return []
+        query = self._normalize(query_vector)
+        rows = self._topic_rows(topic)
+        candidates = self.matrix if rows is None else self.matrix[rows]
+        return self._top_k(candidates @ query, k, rows)
+
+    def search(self, query: str, k: int = 3, topic=None) -> list[tuple[Document, float]]:
+        if not self.docs:
+            return []
+        return self.search_by_vector(self.embeddings.embed_query(query), k=k, topic=topic)
+
+    def search_batch(self, queries: list[str], k: int = 3, topics=None) -> list[list[tuple[Document, float]]]:
+        """Many queries with one embedding call and one matrix multiply; topics is per query (or None)."""
+        if not queries:
+            return []
+        if not self.docs:
+            return [[] for _ in queries]
+        topics = list(topics) if topics is not None else [None] * len(queries)
+        query_matrix = self._normalize(self.embeddings.embed_documents(list(queries)))
+        scores = query_matrix @ self.matrix.T
+        return [self._top_k(row, k, self._topic_rows(topic)) for row, topic in zip(scores, topics)]
@@ -0,0 +1,103 @@
+# backend_RAG/retrieval/embeddings.py
+import os
+import pickle
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import Normalizer
+
+# "openai" calls the OpenAI embeddings API, "local" uses a TF-IDF + SVD model fitted on the PDFs
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai").strip().lower()
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "256"))
+LOCAL_EMBEDDING_MAX_FEATURES = 20000
+LOCAL_EMBEDDINGS_FILE = "local_embeddings.pkl"
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    Offline embeddings: TF-IDF over word uni/bi-grams reduced with TruncatedSVD (LSA).
+    Must be fitted on the corpus before use and is persisted next to the vector index.
+    """
+
+    def __init__(self, n_components: int = LOCAL_EMBEDDING_DIM):
+        self.n_components = n_components
+        self.vectorizer = None
+        self.svd = None
+        self.normalizer = Normalizer(copy=False)
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    def fit(self, texts: list[str]):
+        if not texts:
+            return self
+        vectorizer = TfidfVectorizer(
+            lowercase=True,
+            stop_words="english",
+            ngram_range=(1, 2),
+            sublinear_tf=True,
+            min_df=1,
+            max_features=LOCAL_EMBEDDING_MAX_FEATURES,
+        )
+        tfidf = vectorizer.fit_transform(texts)
+        # SVD needs fewer components than both samples and features
+        n_components = max(1, min(self.n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=42)
+        svd.fit(tfidf)
+        # Keep the persisted model small: drop the pruned-term list and store components as float32
+        vectorizer.stop_words_ = None
+        svd.components_ = svd.components_.astype("float32")
+        self.vectorizer = vectorizer
+        self.svd = svd
+        return self
+
+    def _transform(self, texts: list[str]):
+        if not self.is_fitted:
+            raise RuntimeError("LocalEmbeddings must be fitted on the corpus before embedding")
+        vectors = self.svd.transform(self.vectorizer.transform(texts))
+        return self.normalizer.transform(vectors)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        return self._transform(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._transform([text])[0].tolist()
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            pickle.dump({"n_components": self.n_components, "vectorizer": self.vectorizer, "svd": self.svd}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalEmbeddings":
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        embeddings = cls(n_components=data["n_components"])
+        embeddings.vectorizer = data["vectorizer"]
+        embeddings.svd = data["svd"]
+        return embeddings
+
+
+def get_embeddings(backend: str = EMBEDDING_BACKEND) -> Embeddings:
+    """Return a fresh (unfitted for 'local') embeddings object for the given backend."""
+    if backend == "local":
+        return LocalEmbeddings()
+    if backend == "openai":
+        return OpenAIEmbeddings()
+    raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}' (expected 'openai' or 'local')")
+
+
+def save_embeddings(embeddings: Embeddings, index_dir: str):
+    """Persist embedding model state alongside the index (only the local backend has any)."""
+    if isinstance(embeddings, LocalEmbeddings):
+        embeddings.save(os.path.join(index_dir, LOCAL_EMBEDDINGS_FILE))
+
+
+def load_embeddings(backend: str, index_dir: str) -> Embeddings:
+    """Restore the embeddings used to build a persisted index."""
+    if backend == "local":
+        return LocalEmbeddings.load(os.path.join(index_dir, LOCAL_EMBEDDINGS_FILE))
+    return get_embeddings(backend)
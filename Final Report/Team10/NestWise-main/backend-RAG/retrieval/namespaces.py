@@ -0,0 +1,210 @@
+# backend_RAG/retrieval/namespaces.py
+import os
+import json
+import time
+import uuid
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from retrieval.chunk_index import ChunkIndex
+from retrieval.rag_index import RAG_INDEX_DIR, CHUNK_SIZE, CHUNK_OVERLAP, load_and_split
+from retrieval.topics import tag_chunks
+
+# Each user's uploaded documents are a small index of their own under RAG_NAMESPACE_DIR/<hash of user>.
+# Loaded namespaces stay in memory while in use; idle ones are dropped (they are always on disk).
+RAG_NAMESPACE_DIR = os.getenv("RAG_NAMESPACE_DIR", os.path.join(RAG_INDEX_DIR, "namespaces"))
+RAG_NAMESPACE_IDLE_SECONDS = float(os.getenv("RAG_NAMESPACE_IDLE_SECONDS", "900"))
+RAG_NAMESPACE_MAX_LOADED = int(os.getenv("RAG_NAMESPACE_MAX_LOADED", "256"))
+RAG_NAMESPACE_MAX_DOCUMENTS = int(os.getenv("RAG_NAMESPACE_MAX_DOCUMENTS", "50"))
+
+DOCUMENTS_FILE = "documents.json"
+CHUNKS_FILE = "chunks.json"
+VECTORS_FILE = "vectors.npy"
+
+
+def _write_atomic(path, write):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except Exception:
+        os.unlink(tmp)
+        raise
+
+
+def merge_results(*result_lists, k: int) -> list[tuple[Document, float]]:
+    """Top k of several (doc, cosine score) lists; all indexes are L2-normalized so scores compare."""
+    merged = [hit for results in result_lists for hit in results]
+    merged.sort(key=lambda hit: -hit[1])
+    return merged[:k]
+
+
+class Namespace:
+    """One user's documents: metadata per upload plus a ChunkIndex over their chunks."""
+
+    def __init__(self, path: str, embeddings, documents=None, docs=None, vectors=None):
+        self.path = path
+        self.documents = documents or []        # [{"doc_id", "filename", "chunks", "uploaded_at"}]
+        self.index = ChunkIndex(embeddings, docs or [], vectors if vectors is not None else np.zeros((0, 0), dtype=np.float32))
+        self.last_used = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str, embeddings):
+        with open(os.path.join(path, DOCUMENTS_FILE)) as f:
+            documents = json.load(f)
+        with open(os.path.join(path, CHUNKS_FILE)) as f:
+            chunks = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE))
+        docs = [Document(id=c["id"], page_content=c["text"], metadata=c["metadata"]) for c in chunks]
+        return cls(path, embeddings, documents, docs, vectors)
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        chunks = [{"id": d.id, "text": d.page_content, "metadata": d.metadata} for d in self.index.docs]
+        _write_atomic(os.path.join(self.path, VECTORS_FILE), lambda f: np.save(f, self.index.matrix))
+        _write_atomic(os.path.join(self.path, CHUNKS_FILE), lambda f: f.write(json.dumps(chunks).encode()))
+        # Document list last: it is what marks the namespace as existing
+        _write_atomic(os.path.join(self.path, DOCUMENTS_FILE), lambda f: f.write(json.dumps(self.documents).encode()))
+
+    def replace(self, docs, vectors):
+        self.index = ChunkIndex(self.index.embeddings, docs, vectors)
+
+
+class NamespaceStore:
+    """
+    Per-user document indexes next to the shared corpus. A query searches the shared index plus the
+    caller's own namespace only, so its cost does not grow with the number of users.
+    """
+
+    def __init__(self, embeddings, root: str = RAG_NAMESPACE_DIR,
+                 idle_seconds: float = RAG_NAMESPACE_IDLE_SECONDS, max_loaded: int = RAG_NAMESPACE_MAX_LOADED):
+        self.embeddings = embeddings
+        self.root = root
+        self.idle_seconds = idle_seconds
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()            # namespace -> Namespace, least recently used first
+        self._lock = threading.RLock()
+        self.loads = self.evictions = 0
+
+    def _path(self, namespace: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:32])
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        for name in [n for n, ns in self._loaded.items() if now - ns.last_used > self.idle_seconds]:
+            del self._loaded[name]
+            self.evictions += 1
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, namespace: str, create: bool = False):
+        """Namespace for a user (loaded from disk if needed), or None if it has no documents."""
+        with self._lock:
+            self._evict_idle()
+            ns = self._loaded.get(namespace)
+            if ns is None:
+                path = self._path(namespace)
+                if os.path.exists(os.path.join(path, DOCUMENTS_FILE)):
+                    ns = Namespace.load(path, self.embeddings)
+                    self.loads += 1
+                elif create:
+                    ns = Namespace(path, self.embeddings)
+                else:
+                    return None
+                self._loaded[namespace] = ns
+            self._loaded.move_to_end(namespace)
+            ns.last_used = time.monotonic()
+            return ns
+
+    def has_documents(self, namespace) -> bool:
+        if not namespace:
+            return False
+        ns = self.get(namespace)
+        return ns is not None and len(ns.index) > 0
+
+    def list_documents(self, namespace: str) -> list[dict]:
+        ns = self.get(namespace)
+        return list(ns.documents) if ns else []
+
+    def add_document(self, namespace: str, filename: str, data: bytes) -> dict:
+        """Split, topic-tag and embed an uploaded PDF (or plain text) into the user's namespace."""
+        with self._lock:
+            ns = self.get(namespace, create=True)
+            if len(ns.documents) >= RAG_NAMESPACE_MAX_DOCUMENTS:
+                raise ValueError(f"At most {RAG_NAMESPACE_MAX_DOCUMENTS} documents per user")
+
+        splits = self._split(filename, data)
+        if not splits:
+            raise ValueError("No text could be extracted from the document")
+        doc_id = uuid.uuid4().hex
+        for i, doc in enumerate(splits):
+            doc.id = f"{doc_id}:{i}"
+            doc.metadata.update({"source": filename, "doc_id": doc_id, "user_document": True})
+        vectors = np.asarray(self.embeddings.embed_documents([d.page_content for d in splits]), dtype=np.float32)
+
+        with self._lock:
+            # Reload in case the namespace was evicted while embedding
+            ns = self.get(namespace, create=True)
+            old_vectors = ns.index.matrix if len(ns.index) else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            ns.replace(ns.index.docs + splits, np.vstack([old_vectors, vectors]))
+            document = {"doc_id": doc_id, "filename": filename, "chunks": len(splits), "uploaded_at": time.time()}
+            ns.documents.append(document)
+            ns.save()
+        return document
+
+    def delete_document(self, namespace: str, doc_id: str) -> bool:
+        with self._lock:
+            ns = self.get(namespace)
+            if ns is None or not any(d["doc_id"] == doc_id for d in ns.documents):
+                return False
+            keep = [i for i, d in enumerate(ns.index.docs) if d.metadata.get("doc_id") != doc_id]
+            ns.replace([ns.index.docs[i] for i in keep], ns.index.matrix[keep])
+            ns.documents = [d for d in ns.documents if d["doc_id"] != doc_id]
+            ns.save()
+            return True
+
+    @staticmethod
+    def _split(filename: str, data: bytes) -> list[Document]:
+        if filename.lower().endswith(".pdf"):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "upload.pdf")
+                with open(path, "wb") as f:
+                    f.write(data)
+                splits = load_and_split([path], CHUNK_SIZE, CHUNK_OVERLAP)
+        else:
+            splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+            splits = splitter.split_documents([Document(page_content=data.decode("utf-8", errors="replace"), metadata={"page": 0})])
+        return tag_chunks(splits)
+
+    def search_batch(self, shared_index, queries, k: int, topics, namespaces, include_shared) -> list[list[tuple[Document, float]]]:
+        """
+        One embedding call for all queries; each query searches the shared corpus (if include_shared)
+        and its own namespace, and the hits are merged by score.
+        """
+        query_matrix = ChunkIndex._normalize(self.embeddings.embed_documents(list(queries)))
+        shared_scores = query_matrix @ shared_index.matrix.T if len(shared_index) and any(include_shared) else None
+        results = []
+        for i, (topic, namespace) in enumerate(zip(topics, namespaces)):
+            shared = []
+            if include_shared[i] and shared_scores is not None:
+                shared = shared_index._top_k(shared_scores[i], k, shared_index._topic_rows(topic))
+            ns = self.get(namespace) if namespace else None
+            own = ns.index.search_by_vector(query_matrix[i], k=k, topic=topic) if ns is not None and len(ns.index) else []
+            results.append(merge_results(shared, own, k=k))
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": len(self._loaded),
+                "loaded_chunks": sum(len(ns.index) for ns in self._loaded.values()),
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
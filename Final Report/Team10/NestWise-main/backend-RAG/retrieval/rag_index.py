@@ -0,0 +1,126 @@
+# backend_RAG/retrieval/rag_index.py
+import os
+import glob
+import json
+import hashlib
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from retrieval.embeddings import (
+    EMBEDDING_BACKEND,
+    LocalEmbeddings,
+    get_embeddings,
+    save_embeddings,
+    load_embeddings,
+)
+from retrieval.topics import TAGGER_VERSION, tag_chunks
+
+# Next to this package, so the chat service can build the same index from a checkout (see local_index.py there)
+PDF_FOLDER = os.getenv("RAG_PDF_FOLDER", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "retirement_pdfs"))
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", "./rag_index")
+CHUNK_SIZE = 900
+CHUNK_OVERLAP = 150
+
+MANIFEST_FILE = "manifest.json"
+VECTOR_STORE_FILE = "vector_store.json"
+
+
+def list_pdf_files(pdf_folder: str = PDF_FOLDER) -> list[str]:
+    return sorted(glob.glob(os.path.join(pdf_folder, "*.pdf")))
+
+
+def corpus_fingerprint(pdf_files, backend, chunk_size, chunk_overlap) -> str:
+    """Hash of everything that changes the index contents; a mismatch forces a rebuild."""
+    h = hashlib.sha256()
+    h.update(f"{backend}|{chunk_size}|{chunk_overlap}|tagger{TAGGER_VERSION}".encode())
+    for path in pdf_files:
+        stat = os.stat(path)
+        h.update(f"|{os.path.basename(path)}:{stat.st_size}:{int(stat.st_mtime)}".encode())
+    return h.hexdigest()
+
+
+def load_and_split(pdf_files, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
+    loaded_docs = []
+    for file_path in pdf_files:
+        try:
+            loader = PyPDFLoader(file_path)
+            pages = loader.load()   # returns one Document per page
+            loaded_docs.extend(pages)
+            print(f"Loaded {file_path} -> {len(pages)} pages")
+        except Exception as e:
+            print(f"Failed to load {file_path}: {e}")
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return splitter.split_documents(loaded_docs)
+
+
+def read_manifest(index_dir=RAG_INDEX_DIR):
+    try:
+        with open(os.path.join(index_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _persist_index(index_dir, manifest, embeddings, vector_store):
+    try:
+        os.makedirs(index_dir, exist_ok=True)
+        save_embeddings(embeddings, index_dir)
+        vector_store.dump(os.path.join(index_dir, VECTOR_STORE_FILE))
+        # Manifest last so a half-written index is never treated as valid
+        with open(os.path.join(index_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+    except Exception as e:
+        print(f"Failed to persist RAG index to {index_dir}: {e}")
+
+
+def build_index(pdf_files, backend=EMBEDDING_BACKEND, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
+    """Load, split, topic-tag and embed the PDFs into a fresh InMemoryVectorStore."""
+    splits = tag_chunks(load_and_split(pdf_files, chunk_size, chunk_overlap))
+    embeddings = get_embeddings(backend)
+    if isinstance(embeddings, LocalEmbeddings):
+        embeddings.fit([doc.page_content for doc in splits])
+
+    vector_store = InMemoryVectorStore(embeddings)
+    if splits:
+        vector_store.add_documents(documents=splits)
+    print(f"Added PDF documents to InMemoryVectorStore ({backend} embeddings). Total chunks:", len(splits))
+    return embeddings, vector_store
+
+
+def load_or_build_index(
+    pdf_folder=PDF_FOLDER,
+    index_dir=RAG_INDEX_DIR,
+    backend=EMBEDDING_BACKEND,
+    chunk_size=CHUNK_SIZE,
+    chunk_overlap=CHUNK_OVERLAP,
+):
+    """
+    Return (embeddings, vector_store), reusing the index persisted in index_dir when the
+    corpus, chunking and embedding backend are unchanged, and rebuilding it otherwise.
+    """
+    pdf_files = list_pdf_files(pdf_folder)
+    fingerprint = corpus_fingerprint(pdf_files, backend, chunk_size, chunk_overlap)
+
+    if read_manifest(index_dir).get("fingerprint") == fingerprint:
+        try:
+            embeddings = load_embeddings(backend, index_dir)
+            vector_store = InMemoryVectorStore.load(os.path.join(index_dir, VECTOR_STORE_FILE), embeddings)
+            print(f"Loaded persisted RAG index from {index_dir}. Total chunks:", len(vector_store.store))
+            return embeddings, vector_store
+        except Exception as e:
+            print(f"Failed to load persisted RAG index, rebuilding: {e}")
+
+    embeddings, vector_store = build_index(pdf_files, backend, chunk_size, chunk_overlap)
+    manifest = {
+        "fingerprint": fingerprint,
+        "backend": backend,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "files": [os.path.basename(p) for p in pdf_files],
+        "chunks": len(vector_store.store),
+        "tagger_version": TAGGER_VERSION,
+    }
+    _persist_index(index_dir, manifest, embeddings, vector_store)
+    return embeddings, vector_store
@@ -0,0 +1,91 @@
+# backend_RAG/retrieval/topics.py
+import re
+
+# Bump when the rules below change so persisted indexes get re-tagged
+TAGGER_VERSION = 1
+
+# topic -> patterns matched against lowercased chunk text
+TOPIC_PATTERNS = {
+    "contribution_limits": [
+        r"contribution limit", r"contribute up to", r"catch-up", r"maximum (?:annual )?contribution",
+        r"annual limit", r"elective deferral", r"limits? (?:on|to) how much",
+    ],
+    "taxes": [
+        r"\btax(?:es|ed|able|-deferred|-free)?\b", r"tax bracket", r"withholding", r"capital gains", r"\birs\b",
+    ],
+    "withdrawals": [
+        r"withdraw", r"\bdistributions?\b", r"required minimum", r"\brmds?\b", r"59\s?(?:½|1/2)",
+        r"early withdrawal", r"\bpenalt(?:y|ies)\b", r"cash(?:ing)? out", r"roll ?over",
+    ],
+    "early_career": [
+        r"\b20s\b", r"\b30s\b", r"\byoung\b", r"early in your career", r"first job", r"start(?:ing)? (?:to )?sav(?:e|ing) early",
+        r"compound(?:ing)?", r"entry-level",
+    ],
+    "employer_match": [
+        r"employer match", r"\bmatch(?:es|ing)?\b", r"employer contributions?", r"\bvest(?:ed|ing)\b",
+    ],
+    "investing": [
+        r"\bstocks?\b", r"\bbonds?\b", r"diversif", r"asset allocation", r"index funds?", r"target[- ]date",
+        r"mutual funds?", r"risk tolerance",
+    ],
+}
+
+# canonical account type -> patterns
+ACCOUNT_TYPE_PATTERNS = {
+    "401(k)": [r"\b401\s?\(?k\)?"],
+    "403(b)": [r"\b403\s?\(?b\)?"],
+    "457(b)": [r"\b457\s?\(?b\)?"],
+    "roth ira": [r"\broth iras?\b"],
+    "traditional ira": [r"\btraditional iras?\b"],
+    "ira": [r"\biras?\b"],
+    "roth 401(k)": [r"\broth 401\s?\(?k\)?"],
+    "sep ira": [r"\bsep[- ]iras?\b"],
+    "simple ira": [r"\bsimple iras?\b"],
+    "hsa": [r"\bhsas?\b", r"health savings account"],
+    "pension": [r"\bpensions?\b", r"defined benefit"],
+    "social security": [r"social security"],
+}
+
+YEAR_PATTERN = re.compile(r"\b(19[5-9]\d|20[0-4]\d)\b")
+
+_TOPIC_REGEX = {t: re.compile("|".join(p)) for t, p in TOPIC_PATTERNS.items()}
+_ACCOUNT_REGEX = {a: re.compile("|".join(p)) for a, p in ACCOUNT_TYPE_PATTERNS.items()}
+
+TOPICS = tuple(TOPIC_PATTERNS)
+
+
+def detect_topics(text: str) -> list[str]:
+    lowered = (text or "").lower()
+    return [topic for topic, regex in _TOPIC_REGEX.items() if regex.search(lowered)]
+
+
+def detect_account_types(text: str) -> list[str]:
+    lowered = (text or "").lower()
+    return [account for account, regex in _ACCOUNT_REGEX.items() if regex.search(lowered)]
+
+
+def detect_years(text: str) -> list[int]:
+    return sorted({int(y) for y in YEAR_PATTERN.findall(text or "")})
+
+
+def normalize_topic(topic):
+    """Map free-form topic names ("Contribution Limits", "tax") onto TOPICS; None if unknown."""
+    if not topic:
+        return None
+    key = str(topic).strip().lower().replace("-", "_").replace(" ", "_")
+    if key in TOPIC_PATTERNS:
+        return key
+    for name in TOPICS:
+        if name.startswith(key) or key.startswith(name.rstrip("s")):
+            return name
+    return None
+
+
+def tag_chunks(docs):
+    """Attach topic and entity metadata (years, account types) to split Documents in place."""
+    for doc in docs:
+        text = doc.page_content
+        doc.metadata["topics"] = detect_topics(text)
+        doc.metadata["account_types"] = detect_account_types(text)
+        doc.metadata["years"] = detect_years(text)
+    return docs
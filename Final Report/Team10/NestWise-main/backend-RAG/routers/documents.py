@@ -0,0 +1,47 @@
+# routers/documents.py
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
+import os
+import logging
+from auth import verify_access_token
+
+from models.search import DocumentInfo, DocumentListResponse
+
+logger = logging.getLogger(__name__)
+documentsRouter = APIRouter()
+
+RAG_MAX_UPLOAD_BYTES = int(os.getenv("RAG_MAX_UPLOAD_MB", "20")) * 1024 * 1024
+ALLOWED_EXTENSIONS = (".pdf", ".txt", ".md")
+
+
+# --- Upload a plan document (401(k) SPD, pension statement) into the user's own namespace ---
+@documentsRouter.post("/documents", response_model=DocumentInfo, status_code=status.HTTP_201_CREATED)
+async def upload_document(request: Request, file: UploadFile = File(...), user_email: str = Depends(verify_access_token)) -> DocumentInfo:
+    filename = os.path.basename(file.filename or "")
+    if not filename.lower().endswith(ALLOWED_EXTENSIONS):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only PDF and text documents are supported")
+    data = await file.read(RAG_MAX_UPLOAD_BYTES + 1)
+    if len(data) > RAG_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Document is too large")
+
+    try:
+        document = await run_in_threadpool(request.app.state.namespaces.add_document, user_email, filename, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except Exception as exc:
+        logger.exception("Document upload failed")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Document upload failed") from exc
+    return DocumentInfo(**document)
+
+
+@documentsRouter.get("/documents", response_model=DocumentListResponse)
+async def list_documents(request: Request, user_email: str = Depends(verify_access_token)) -> DocumentListResponse:
+    documents = await run_in_threadpool(request.app.state.namespaces.list_documents, user_email)
+    return DocumentListResponse(documents=[DocumentInfo(**d) for d in documents])
+
+
+@documentsRouter.delete("/documents/{doc_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_document(doc_id: str, request: Request, user_email: str = Depends(verify_access_token)):
+    deleted = await run_in_threadpool(request.app.state.namespaces.delete_document, user_email, doc_id)
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
@@ -0,0 +1,116 @@
+# routers/search.py
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
+import logging
+from auth import verify_search_access
+
+from models.search import (
+    SearchRequest,
+    SearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    SearchHit,
+    EmbedRequest,
+    EmbedResponse,
+    IndexInfoResponse,
+)
+
+logger = logging.getLogger(__name__)
+searchRouter = APIRouter()
+
+
+def caller_namespace(requested, user_email):
+    """End users only ever search their own namespace; the chat service names the user it is serving."""
+    return requested if user_email is None else user_email
+
+
+def to_hits(results) -> list[SearchHit]:
+    return [
+        SearchHit(id=doc.id, page_content=doc.page_content, metadata=doc.metadata, score=score)
+        for doc, score in results
+    ]
+
+
+# --- Single query (micro-batched with concurrent requests) ---
+@searchRouter.post("/search", response_model=SearchResponse)
+async def search(payload: SearchRequest, request: Request, user_email: str | None = Depends(verify_search_access)) -> SearchResponse:
+    if not payload.query.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query cannot be empty")
+    namespaces = request.app.state.namespaces
+    namespace = caller_namespace(payload.namespace, user_email)
+    try:
+        if namespaces.has_documents(namespace):
+            results = (await run_in_threadpool(
+                namespaces.search_batch,
+                request.app.state.chunk_index,
+                [payload.query], payload.k, [payload.topic], [namespace], [payload.include_shared],
+            ))[0]
+        elif not payload.include_shared:
+            results = []
+        else:
+            results = await request.app.state.batcher.search(payload.query, payload.k, payload.topic)
+    except Exception as exc:
+        logger.exception("Search failed")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Search failed") from exc
+    return SearchResponse(results=to_hits(results))
+
+
+# --- Many queries from one caller in a single embedding call + matrix multiply ---
+@searchRouter.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(payload: BatchSearchRequest, request: Request, user_email: str | None = Depends(verify_search_access)) -> BatchSearchResponse:
+    if not payload.queries:
+        return BatchSearchResponse(results=[])
+    chunk_index = request.app.state.chunk_index
+    namespaces = request.app.state.namespaces
+    query_namespaces = [caller_namespace(q.namespace, user_email) for q in payload.queries]
+    k = max(q.k for q in payload.queries)
+    try:
+        if any(namespaces.has_documents(name) for name in {name for name in query_namespaces if name}):
+            results = await run_in_threadpool(
+                namespaces.search_batch,
+                chunk_index,
+                [q.query for q in payload.queries],
+                k,
+                [q.topic for q in payload.queries],
+                query_namespaces,
+                [q.include_shared for q in payload.queries],
+            )
+        else:
+            results = await run_in_threadpool(
+                chunk_index.search_batch,
+                [q.query for q in payload.queries],
+                k,
+                [q.topic for q in payload.queries],
+            )
+            results = [r if q.include_shared else [] for q, r in zip(payload.queries, results)]
+    except Exception as exc:
+        logger.exception("Batch search failed")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Batch search failed") from exc
+    return BatchSearchResponse(results=[to_hits(r[:q.k]) for q, r in zip(payload.queries, results)])
+
+
+# --- Embeddings from the index's own model (FAQ matching in the chat service) ---
+@searchRouter.post("/embed", response_model=EmbedResponse)
+async def embed(payload: EmbedRequest, request: Request, user_email: str | None = Depends(verify_search_access)) -> EmbedResponse:
+    if not payload.texts:
+        return EmbedResponse(vectors=[])
+    embeddings = request.app.state.chunk_index.embeddings
+    try:
+        vectors = await run_in_threadpool(embeddings.embed_documents, payload.texts)
+    except Exception as exc:
+        logger.exception("Embedding failed")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Embedding failed") from exc
+    return EmbedResponse(vectors=[[float(x) for x in v] for v in vectors])
+
+
+@searchRouter.get("/index", response_model=IndexInfoResponse)
+async def index_info(request: Request, user_email: str | None = Depends(verify_search_access)) -> IndexInfoResponse:
+    manifest = request.app.state.manifest
+    return IndexInfoResponse(
+        fingerprint=manifest.get("fingerprint"),
+        backend=manifest.get("backend"),
+        chunks=len(request.app.state.chunk_index),
+        topics=request.app.state.chunk_index.topic_counts(),
+        batching=request.app.state.batcher.stats(),
+        namespaces=request.app.state.namespaces.stats(),
+    )
@@ -0,0 +1,216 @@
+# backend_langgraph/Agentic_AI/batch_eval.py
+import os
+import json
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from Agentic_AI.langgraph import chat_step, start_session
+from Agentic_AI.plan_jobs import plan_jobs
+from Agentic_AI.sessions import sessions
+
+logger = logging.getLogger(__name__)
+
+# Scripted conversations run through chat_step, each in its own session, EVAL_PARALLELISM at a time
+EVAL_PARALLELISM = int(os.getenv("EVAL_PARALLELISM", "8"))
+EVAL_PLAN_TIMEOUT_SECONDS = float(os.getenv("EVAL_PLAN_TIMEOUT_SECONDS", "300"))
+EVAL_RUN_TTL_SECONDS = float(os.getenv("EVAL_RUN_TTL_SECONDS", "3600"))
+# The /eval API runs real model calls outside the chat rate limits, so it is off unless enabled
+# and limited to the admin accounts in EVAL_ADMIN_EMAILS (see auth.py)
+EVAL_API_ENABLED = os.getenv("EVAL_API_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+PLAN_POLL_SECONDS = 0.2
+
+
+def load_conversations(path: str) -> list[dict]:
+    """
+    JSON list or JSONL of {"id": ..., "messages": ["user turn", ...]}; a bare list of strings is one
+    conversation. Missing ids become conv-<n>.
+    """
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            data = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
+    return normalize_conversations(data)
+
+
+def normalize_conversations(data) -> list[dict]:
+    if isinstance(data, dict):
+        data = data.get("conversations", [data])
+    conversations = []
+    for i, item in enumerate(data):
+        if isinstance(item, list):
+            item = {"messages": item}
+        messages = [m for m in item.get("messages", []) if isinstance(m, str) and m.strip()]
+        if not messages:
+            raise ValueError(f"Conversation {item.get('id', i)} has no messages")
+        conversations.append({"id": str(item.get("id", f"conv-{i + 1}")), "messages": messages})
+    return conversations
+
+
+def wait_for_plan(job_id: str, timeout: float = EVAL_PLAN_TIMEOUT_SECONDS) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = plan_jobs.status(job_id)
+        if job is None or job["status"] != "running":
+            return job or {"job_id": job_id, "status": "failed", "error": "Plan job expired"}
+        if time.monotonic() > deadline:
+            return {**job, "status": "failed", "error": f"Plan not ready after {timeout}s"}
+        time.sleep(PLAN_POLL_SECONDS)
+
+
+def run_conversation(conversation: dict, run_id: str, index: int = 0) -> dict:
+    """Play one scripted conversation in a fresh session and record every turn."""
+    # The index keeps conversations with duplicate ids out of each other's session
+    session_id = f"eval-{run_id}-{index}-{conversation['id']}"
+    start_session(session_id)
+    turns, plan, error = [], None, None
+    started = time.perf_counter()
+    try:
+        for message in conversation["messages"]:
+            turn_start = time.perf_counter()
+            result = chat_step(message, session_id)
+            turn = {
+                "user": message,
+                "assistant": result.get("response", ""),
+                "real_profile": result.get("real_profile", {}),
+                "conversation_title": result.get("conversation_title"),
+                "seconds": round(time.perf_counter() - turn_start, 3),
+            }
+            if result.get("plan_job_id"):
+                job = wait_for_plan(result["plan_job_id"])
+                turn["plan_seconds"] = job.get("elapsed_seconds")
+                if job["status"] == "done":
+                    plan = job["result"]
+                else:
+                    error = job.get("error") or "Plan generation failed"
+            turns.append(turn)
+    except Exception as exc:
+        logger.exception("Conversation %s failed", conversation["id"])
+        error = str(exc) or exc.__class__.__name__
+    finally:
+        sessions.discard(session_id)
+
+    return {
+        "id": conversation["id"],
+        "turns": turns,
+        "final_profile": turns[-1]["real_profile"] if turns else {},
+        "conversation_title": turns[-1]["conversation_title"] if turns else None,
+        "plan": plan,
+        "error": error,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def summarize(results: list[dict]) -> dict:
+    turn_seconds = np.array([t["seconds"] for r in results for t in r["turns"]] or [0.0])
+    plan_seconds = [t["plan_seconds"] for r in results for t in r["turns"] if t.get("plan_seconds") is not None]
+    return {
+        "conversations": len(results),
+        "failed": sum(1 for r in results if r["error"]),
+        "plans": sum(1 for r in results if r["plan"]),
+        "turns": sum(len(r["turns"]) for r in results),
+        "turn_seconds": {
+            "p50": round(float(np.percentile(turn_seconds, 50)), 3),
+            "p95": round(float(np.percentile(turn_seconds, 95)), 3),
+            "max": round(float(turn_seconds.max()), 3),
+        },
+        "plan_seconds_p50": round(float(np.percentile(plan_seconds, 50)), 3) if plan_seconds else None,
+    }
+
+
+def run_batch(conversations: list[dict], parallelism: int = EVAL_PARALLELISM, run_id: str | None = None, on_result=None) -> dict:
+    """Run conversations concurrently; results keep the input order."""
+    run_id = run_id or uuid.uuid4().hex[:8]
+    started = time.perf_counter()
+    results = [None] * len(conversations)
+
+    def run(i):
+        results[i] = run_conversation(conversations[i], run_id, i)
+        if on_result:
+            on_result(results[i])
+
+    with ThreadPoolExecutor(max_workers=max(1, parallelism), thread_name_prefix="eval") as pool:
+        list(pool.map(run, range(len(conversations))))
+
+    return {
+        "run_id": run_id,
+        "summary": {**summarize(results), "wall_seconds": round(time.perf_counter() - started, 3), "parallelism": parallelism},
+        "results": results,
+    }
+
+
+class EvalRun:
+    def __init__(self, run_id: str, total: int, owner: str | None = None):
+        self.run_id = run_id
+        self.total = total
+        self.owner = owner
+        self.completed = 0
+        self.status = "running"
+        self.report = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    def to_dict(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "report": self.report,
+            "error": self.error,
+        }
+
+
+class EvalRunManager:
+    """Batch runs started over the API, executed one at a time in the background and kept for polling."""
+
+    def __init__(self, ttl_seconds: float = EVAL_RUN_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eval-run")
+        self._runs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, conversations: list[dict], parallelism: int = EVAL_PARALLELISM, owner: str | None = None) -> str:
+        self._expire()
+        run = EvalRun(uuid.uuid4().hex, len(conversations), owner)
+        with self._lock:
+            self._runs[run.run_id] = run
+        self._executor.submit(self._run, run, conversations, parallelism)
+        return run.run_id
+
+    def status(self, run_id: str, owner: str | None = None):
+        """The run as a dict, or None if it does not exist or was started by someone else."""
+        with self._lock:
+            run = self._runs.get(run_id)
+            return run.to_dict() if run and run.owner == owner else None
+
+    def _run(self, run: EvalRun, conversations, parallelism):
+        def on_result(_result):
+            with self._lock:
+                run.completed += 1
+
+        try:
+            report = run_batch(conversations, parallelism, run.run_id, on_result)
+            with self._lock:
+                run.report = report
+                run.status = "done"
+        except Exception as exc:
+            logger.exception("Eval run %s failed", run.run_id)
+            with self._lock:
+                run.error = str(exc) or exc.__class__.__name__
+                run.status = "failed"
+        run.updated_at = time.time()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for run_id in [r for r, run in self._runs.items() if run.status != "running" and run.updated_at < cutoff]:
+                del self._runs[run_id]
+
+
+eval_runs = EvalRunManager()
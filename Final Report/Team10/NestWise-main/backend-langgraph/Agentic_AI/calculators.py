@@ -0,0 +1,242 @@
+# backend_langgraph/Agentic_AI/calculators.py
+import json
+import numpy as np
+from typing import Annotated
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+
+from Agentic_AI.monte_carlo import simulate_profile, summarize
+
+# Exact arithmetic for the planner, so numbers in a plan never come from token-by-token reasoning.
+# All tables are IRS figures for the listed tax years; lookups for other years use the nearest year.
+
+# year -> (401(k)/403(b) elective deferral, 50+ catch-up, ages 60-63 catch-up, IRA limit, IRA 50+ catch-up)
+CONTRIBUTION_LIMITS = {
+    2023: (22500, 7500, 7500, 6500, 1000),
+    2024: (23000, 7500, 7500, 7000, 1000),
+    2025: (23500, 7500, 11250, 7000, 1000),
+}
+
+# year -> filing status -> (bracket lower bounds, marginal rates, standard deduction)
+_RATES = np.array([0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37])
+TAX_BRACKETS = {
+    2024: {
+        "single": (np.array([0, 11600, 47150, 100525, 191950, 243725, 609350], dtype=float), _RATES, 14600),
+        "married_joint": (np.array([0, 23200, 94300, 201050, 383900, 487450, 731200], dtype=float), _RATES, 29200),
+        "married_separate": (np.array([0, 11600, 47150, 100525, 191950, 243725, 365600], dtype=float), _RATES, 14600),
+        "head_of_household": (np.array([0, 16550, 63100, 100500, 191950, 243700, 609350], dtype=float), _RATES, 21900),
+    },
+    2025: {
+        "single": (np.array([0, 11925, 48475, 103350, 197300, 250525, 626350], dtype=float), _RATES, 15750),
+        "married_joint": (np.array([0, 23850, 96950, 206700, 394600, 501050, 751600], dtype=float), _RATES, 31500),
+        "married_separate": (np.array([0, 11925, 48475, 103350, 197300, 250525, 375800], dtype=float), _RATES, 15750),
+        "head_of_household": (np.array([0, 17000, 64850, 103350, 197300, 250500, 626350], dtype=float), _RATES, 23625),
+    },
+}
+# Other spellings of the filing statuses above (qualifying surviving spouses use the joint brackets)
+FILING_STATUS_ALIASES = {
+    "married": "married_joint",
+    "joint": "married_joint",
+    "married_jointly": "married_joint",
+    "married_filing_jointly": "married_joint",
+    "mfj": "married_joint",
+    "qualifying_surviving_spouse": "married_joint",
+    "qualifying_widow": "married_joint",
+    "qualifying_widower": "married_joint",
+    "separate": "married_separate",
+    "married_separately": "married_separate",
+    "married_filing_separately": "married_separate",
+    "mfs": "married_separate",
+    "head": "head_of_household",
+    "hoh": "head_of_household",
+    "unmarried": "single",
+}
+
+# Uniform Lifetime Table (2022+): distribution period indexed by age - RMD_TABLE_START_AGE
+RMD_TABLE_START_AGE = 72
+# Without a birth year: 73, since everyone still below 73 today was born in 1951 or later (72 only applied before)
+RMD_DEFAULT_START_AGE = 73
+RMD_DISTRIBUTION_PERIODS = np.array([
+    27.4, 26.5, 25.5, 24.6, 23.7, 22.9, 22.0, 21.1, 20.2, 19.4, 18.5, 17.7, 16.8, 16.0, 15.2, 14.4, 13.7,
+    12.9, 12.2, 11.5, 10.8, 10.1, 9.5, 8.9, 8.4, 7.8, 7.3, 6.8, 6.4, 6.0, 5.6, 5.2, 4.9, 4.6, 4.3, 4.1,
+    3.9, 3.7, 3.5, 3.4, 3.3, 3.1, 3.0, 2.9, 2.8, 2.7, 2.5, 2.3, 2.0,
+])
+
+# Precomputed bracket widths and the cumulative tax owed at each bracket's lower bound
+_TAX_TABLES = {}
+for _year, _statuses in TAX_BRACKETS.items():
+    for _status, (_lower, _rates, _deduction) in _statuses.items():
+        _widths = np.diff(np.append(_lower, np.inf))
+        _base = np.concatenate(([0.0], np.cumsum(_widths[:-1] * _rates[:-1])))
+        _TAX_TABLES[(_year, _status)] = (_lower, _rates, _base, _deduction)
+
+
+def _nearest_year(year, table) -> int:
+    years = sorted(table)
+    year = int(year) if year else years[-1]
+    return min(max(year, years[0]), years[-1])
+
+
+def growth_factors(rate, years: int) -> np.ndarray:
+    """(1 + rate) ** t for t = 0..years."""
+    return np.power(1.0 + rate, np.arange(int(years) + 1, dtype=float))
+
+
+def project_balance(current_savings, annual_contribution, annual_return, years: int) -> np.ndarray:
+    """Year-end balances for t = 0..years with end-of-year contributions (closed form, no loop)."""
+    factors = growth_factors(annual_return, years)
+    if annual_return == 0:
+        annuity = np.arange(int(years) + 1, dtype=float)
+    else:
+        annuity = (factors - 1.0) / annual_return
+    return current_savings * factors + annual_contribution * annuity
+
+
+def required_annual_savings(target, current_savings, annual_return, years: int) -> float:
+    """Level end-of-year contribution that grows current_savings to target in the given years."""
+    years = int(years)
+    if years <= 0:
+        return max(0.0, float(target - current_savings))
+    factor = (1.0 + annual_return) ** years
+    shortfall = target - current_savings * factor
+    if shortfall <= 0:
+        return 0.0
+    annuity = years if annual_return == 0 else (factor - 1.0) / annual_return
+    return float(shortfall / annuity)
+
+
+def contribution_limits(age: int, year: int = None) -> dict:
+    year = _nearest_year(year, CONTRIBUTION_LIMITS)
+    deferral, catch_up, catch_up_60_63, ira, ira_catch_up = CONTRIBUTION_LIMITS[year]
+    if 60 <= age <= 63:
+        extra = catch_up_60_63
+    elif age >= 50:
+        extra = catch_up
+    else:
+        extra = 0
+    return {
+        "year": year,
+        "401k_elective_deferral": deferral + extra,
+        "401k_catch_up_included": extra,
+        "ira": ira + (ira_catch_up if age >= 50 else 0),
+        "ira_catch_up_included": ira_catch_up if age >= 50 else 0,
+    }
+
+
+def normalize_filing_status(filing_status) -> str:
+    """'Married filing jointly', 'MFJ', 'head-of-household' ... -> a TAX_BRACKETS key (unknown values pass through)."""
+    status = "_".join(str(filing_status or "single").strip().lower().replace("-", " ").replace("(", "").replace(")", "").split())
+    return FILING_STATUS_ALIASES.get(status, status)
+
+
+def federal_income_tax(gross_income, filing_status: str = "single", year: int = None, itemized_deductions: float = 0.0):
+    """Federal ordinary income tax; gross_income may be a scalar or an array of incomes."""
+    year = _nearest_year(year, TAX_BRACKETS)
+    filing_status = normalize_filing_status(filing_status)
+    if (year, filing_status) not in _TAX_TABLES:
+        raise ValueError(f"Unknown filing status '{filing_status}' (use one of: {', '.join(TAX_BRACKETS[year])})")
+    lower, rates, base, deduction = _TAX_TABLES[(year, filing_status)]
+    taxable = np.maximum(np.asarray(gross_income, dtype=float) - max(deduction, itemized_deductions), 0.0)
+    bracket = np.searchsorted(lower, taxable, side="right") - 1
+    tax = base[bracket] + (taxable - lower[bracket]) * rates[bracket]
+    return tax, rates[bracket], taxable
+
+
+def rmd_start_age(birth_year: int | None = None) -> int:
+    # SECURE 2.0: 73 for those born 1951-1959, 75 for 1960 and later
+    if not birth_year:
+        return RMD_DEFAULT_START_AGE
+    if birth_year >= 1960:
+        return 75
+    if birth_year >= 1951:
+        return 73
+    return 72
+
+
+def required_minimum_distribution(balance, age, start_age: int = RMD_DEFAULT_START_AGE):
+    """RMD for a prior year-end balance at the given age(s); zero below the owner's RMD start age."""
+    age = np.asarray(age, dtype=int)
+    index = np.clip(age - RMD_TABLE_START_AGE, 0, len(RMD_DISTRIBUTION_PERIODS) - 1)
+    periods = RMD_DISTRIBUTION_PERIODS[index]
+    due = age >= max(int(start_age), RMD_TABLE_START_AGE)
+    return np.where(due, np.asarray(balance, dtype=float) / periods, 0.0), periods
+
+
+## Planner tools
+
+@tool
+def project_savings(current_savings: float, annual_contribution: float, annual_return: float, years: int):
+    """Project a retirement balance year by year with compound growth.
+    annual_return is a decimal (0.06 for 6%). Returns the balance at the end of every year."""
+    balances = project_balance(current_savings, annual_contribution, annual_return, years)
+    return json.dumps({
+        "final_balance": round(float(balances[-1]), 2),
+        "balances_by_year": [round(float(b), 2) for b in balances[1:]],
+    })
+
+
+@tool
+def savings_needed(target_amount: float, current_savings: float, annual_return: float, years: int):
+    """Annual contribution needed to reach target_amount in the given number of years.
+    annual_return is a decimal (0.06 for 6%)."""
+    needed = required_annual_savings(target_amount, current_savings, annual_return, years)
+    return json.dumps({"annual_contribution": round(needed, 2), "monthly_contribution": round(needed / 12, 2)})
+
+
+@tool
+def contribution_limit(age: int, year: int | None = None):
+    """IRS 401(k) and IRA contribution limits (including catch-up contributions) for a person's age and tax year."""
+    return json.dumps(contribution_limits(age, year))
+
+
+@tool
+def income_tax(gross_income: float, filing_status: str = "single", year: int | None = None):
+    """Federal income tax, marginal and effective rate.
+    filing_status is single, married_joint, married_separate or head_of_household."""
+    try:
+        tax, marginal, taxable = federal_income_tax(gross_income, filing_status, year)
+    except ValueError as e:
+        return json.dumps({"error": str(e)})
+    return json.dumps({
+        "taxable_income": round(float(taxable), 2),
+        "federal_tax": round(float(tax), 2),
+        "marginal_rate": float(marginal),
+        "effective_rate": round(float(tax) / gross_income, 4) if gross_income else 0.0,
+    })
+
+
+@tool
+def rmd(balance: float, age: int, birth_year: int | None = None):
+    """Required minimum distribution for a retirement account balance at a given age (0 before RMDs start).
+    Pass birth_year when known: RMDs start at 73 for those born 1951-1959 and 75 from 1960."""
+    start_age = rmd_start_age(birth_year)
+    amount, period = required_minimum_distribution(balance, age, start_age)
+    return json.dumps({"rmd": round(float(amount), 2), "distribution_period": float(period), "rmd_start_age": start_age})
+
+
+@tool
+def retirement_projection(
+    stocks: float,
+    bonds: float,
+    cash: float,
+    other: float,
+    state: Annotated[dict, InjectedState],
+    retirement_age: int | None = None,
+    annual_contribution: float | None = None,
+    annual_spending: float | None = None,
+):
+    """Monte Carlo projection of the user's retirement for an asset allocation (percentages).
+    Age, salary and savings come from the user's profile. Returns the probability the money lasts
+    to age 95 and 10th-90th percentile balance bands in today's dollars."""
+    result = simulate_profile(
+        state.get("real_profile", {}),
+        {"stocks": stocks, "bonds": bonds, "cash": cash, "other": other},
+        retirement_age=retirement_age,
+        annual_contribution=annual_contribution,
+        annual_spending=annual_spending,
+    )
+    return json.dumps(summarize(result))
+
+
+CALCULATOR_TOOLS = [project_savings, savings_needed, contribution_limit, income_tax, rmd, retirement_projection]
+CALCULATOR_TOOL_NAMES = {t.name for t in CALCULATOR_TOOLS}
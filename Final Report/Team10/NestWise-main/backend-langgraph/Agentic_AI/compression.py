@@ -0,0 +1,97 @@
+# backend_langgraph/Agentic_AI/compression.py
+import os
+import re
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Max tokens for the whole "Retrieved Context" block in the planner prompt (0 disables compression)
+PLANNER_CONTEXT_TOKEN_BUDGET = int(os.getenv("PLANNER_CONTEXT_TOKEN_BUDGET", "900"))
+MIN_SENTENCE_CHARS = 20
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9$\"'(])|\s+(?=•)")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")   # gpt-4o / gpt-4o-mini tokenizer
+except Exception:
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+def split_sentences(text: str) -> list[str]:
+    # PDF text is hard-wrapped, so join lines before splitting on sentence boundaries
+    flat = re.sub(r"\s*\n\s*", " ", text or "").strip()
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(flat)]
+    return [s for s in sentences if len(s) >= MIN_SENTENCE_CHARS]
+
+
+def format_snippet(doc, content: str) -> str:
+    meta = getattr(doc, "metadata", {}) or {}
+    source = meta.get("source", "Unknown source")
+    page = meta.get("page", "N/A")
+    return f"Source: {os.path.basename(source)}, Page: {page}\nContent:\n{content.strip()}"
+
+
+def compress_context(query_docs, token_budget: int = PLANNER_CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    Extractive compression of retrieved chunks.
+    query_docs is a list of (query, Document) pairs. Every sentence is scored against the query that
+    retrieved its chunk (TF-IDF cosine, one sparse product for all sentences), then sentences are kept
+    best-first until token_budget is spent. Each chunk keeps at least its best sentence so every source
+    header (and therefore every citation) survives; kept sentences stay in their original order.
+    """
+    if not query_docs:
+        return ""
+    if token_budget <= 0:
+        return "\n\n---\n\n".join(format_snippet(doc, doc.page_content) for _, doc in query_docs)
+
+    sentences, owners = [], []
+    query_ids = {}
+    for chunk_id, (query, doc) in enumerate(query_docs):
+        query_ids.setdefault(query or "", len(query_ids))
+        for sentence in split_sentences(doc.page_content) or [doc.page_content.strip()]:
+            sentences.append(sentence)
+            owners.append((chunk_id, query_ids[query or ""]))
+    queries = list(query_ids)
+
+    owners = np.asarray(owners, dtype=np.int64)
+    try:
+        vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        matrix = vectorizer.fit_transform(sentences + queries)
+        sentence_vecs, query_vecs = matrix[: len(sentences)], matrix[len(sentences):]
+        scores = np.asarray(sentence_vecs.multiply(query_vecs[owners[:, 1]]).sum(axis=1)).ravel()
+    except ValueError:
+        # Only stop words / empty vocabulary: keep sentences in document order
+        scores = np.zeros(len(sentences))
+
+    header_tokens = sum(count_tokens(format_snippet(doc, "")) for _, doc in query_docs)
+    remaining = token_budget - header_tokens
+    sentence_tokens = np.fromiter((count_tokens(s) for s in sentences), dtype=np.int64, count=len(sentences))
+
+    keep = np.zeros(len(sentences), dtype=bool)
+    # Stable sort so ties keep document order
+    order = np.argsort(-scores, kind="stable")
+    seen_chunks = set()
+    for idx in order:
+        chunk_id = owners[idx, 0]
+        if chunk_id not in seen_chunks:
+            seen_chunks.add(chunk_id)
+            keep[idx] = True
+            remaining -= sentence_tokens[idx]
+    for idx in order:
+        if keep[idx]:
+            continue
+        if sentence_tokens[idx] <= remaining:
+            keep[idx] = True
+            remaining -= sentence_tokens[idx]
+
+    snippets = []
+    for chunk_id, (_, doc) in enumerate(query_docs):
+        kept = [sentences[i] for i in np.flatnonzero(keep & (owners[:, 0] == chunk_id))]
+        snippets.append(format_snippet(doc, " ... ".join(kept)))
+    return "\n\n---\n\n".join(snippets)
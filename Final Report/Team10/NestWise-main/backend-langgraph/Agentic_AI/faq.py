@@ -0,0 +1,267 @@
+# backend_langgraph/Agentic_AI/faq.py
+import os
+import re
+import json
+import numpy as np
+
+from Agentic_AI.calculators import CONTRIBUTION_LIMITS
+
+# Short generic questions answered with reviewed text, before the chatbot and planner run
+FAQ_ENABLED = os.getenv("FAQ_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+# Cosine similarity needed for a match, per embedding backend (tuned with benchmarks/faq_bench.py);
+# FAQ_MATCH_THRESHOLD overrides it for every backend
+FAQ_MATCH_THRESHOLDS = {"local": 0.82, "openai": 0.85}
+FAQ_MATCH_THRESHOLD = float(os.getenv("FAQ_MATCH_THRESHOLD")) if os.getenv("FAQ_MATCH_THRESHOLD") else None
+# Chunks retrieved per canonical question to confirm its cited pages are in the index
+FAQ_SOURCE_CANDIDATES = int(os.getenv("FAQ_SOURCE_CANDIDATES", "20"))
+FAQ_MAX_WORDS = int(os.getenv("FAQ_MAX_WORDS", "12"))
+FAQ_FILE = "faq_index.json"
+
+_QUESTION_START = re.compile(
+    r"^(what|whats|what's|how|why|when|who|which|where|can|should|is|are|do|does|explain|tell me)\b", re.IGNORECASE
+)
+# Anything about the user themselves (or with their numbers in it) goes to the agent graph instead
+_FIRST_PERSON = re.compile(r"\b(i|i'm|im|i've|i'd|i'll|me|my|mine|myself|we|our|us)\b", re.IGNORECASE)
+_ACCOUNT_NAMES = re.compile(r"\b(401|403|457)\s*\(?[kb]\)?|\b4\s*%\s*rule|\b59\s*(1/2|½)", re.IGNORECASE)
+
+_YEAR = max(CONTRIBUTION_LIMITS)
+_DEFERRAL, _CATCH_UP, _CATCH_UP_60_63, _IRA, _IRA_CATCH_UP = CONTRIBUTION_LIMITS[_YEAR]
+
+# PDFs in the retrieval corpus that the reviewed answers cite
+_INVESTOPEDIA = "401(k) Plans_ What Are They, How They Work.pdf"
+_SCHWAB = "What is a 401(k) and How Does It Work_ _ Charles Schwab.pdf"
+_SCHWAB_20S = "Making the Most of Your 401(k) in Your 20s _ Charles Schwab.pdf"
+_SECURIAN = "Preparing for Retirement in Your 20s and 30s _ Securian Financial.pdf"
+_SELCO = "Plan For Retirement, Especially In Your 20s _ SELCO.pdf"
+_TAXES = "Taxes in Retirement_ How to Reduce Taxes on Your Withdrawals.pdf"
+_DOL_PLAN = "What You Should Know About Your Retirement Plan _ U.S. Department of Labor.pdf"
+_DOL_TOP_10 = "dol-top-10-ways-to-prepare-for-retirement-booklet-2023.pdf"
+_CAMBRIDGE = "What is a 401k_ _ Cambridge Credit.pdf"
+
+_CATCH_UP_TEXT = f"${_CATCH_UP:,}" + (f" (${_CATCH_UP_60_63:,} at ages 60 to 63)" if _CATCH_UP_60_63 != _CATCH_UP else "")
+
+# (canonical question, paraphrases, answer, supporting pages as (PDF, page)). Paraphrases must ask the
+# same question; contribution figures come from the planner's IRS tables, so they are stated for that year
+FAQ_QUESTIONS = [
+    ("What is a 401(k)?", ["what is a 401k", "how does a 401(k) work", "how do 401k plans work", "explain 401k plans"],
+     "A 401(k) is a retirement plan offered through your employer. You choose a percentage of each paycheck to "
+     "contribute, and it is invested in the funds the plan offers. Traditional contributions go in before income tax "
+     "and grow tax-deferred; you pay income tax when you withdraw. Many plans also offer a Roth option (after-tax "
+     "contributions, tax-free qualified withdrawals), and many employers add matching contributions. Withdrawals "
+     "before age 59½ generally carry a 10% additional tax on top of income tax, with some exceptions.",
+     [(_SCHWAB, 0), (_INVESTOPEDIA, 2), (_INVESTOPEDIA, 3)]),
+    ("What is an IRA?", ["what is an individual retirement account", "how does an IRA work", "explain IRAs"],
+     "An individual retirement account (IRA) is a retirement account you open yourself at a bank or brokerage, "
+     "separate from any employer. A traditional IRA may give you a tax deduction now (depending on your income and "
+     "whether you have a workplace plan) and is taxed when you withdraw. A Roth IRA is funded with after-tax money "
+     "and qualified withdrawals are tax-free. You need earned income to contribute, and the annual limit is much "
+     "lower than a 401(k)'s.",
+     [(_DOL_TOP_10, 1), (_SELCO, 1), (_TAXES, 1)]),
+    ("What is the difference between Roth and traditional retirement accounts?",
+     ["Roth vs traditional", "Roth or traditional IRA", "Roth vs traditional 401(k)"],
+     "The difference is when you pay tax. Traditional contributions are deducted now and withdrawals are taxed as "
+     "income later; Roth contributions are taxed now and qualified withdrawals are tax-free. Roth tends to come out "
+     "ahead if your tax rate in retirement will be higher than today (common early in a career), traditional if your "
+     "tax rate today is higher than it will be in retirement. Many people contribute to both to spread their future "
+     "tax exposure.",
+     [(_INVESTOPEDIA, 3), (_INVESTOPEDIA, 10), (_SCHWAB, 1), (_TAXES, 1)]),
+    (f"How much can you contribute to a 401(k) in {_YEAR}?",
+     ["401k contribution limit", "what is the 401(k) limit", "max 401k contribution", "how much can you put in a 401(k)",
+      "Roth 401(k) contribution limit"],
+     f"For {_YEAR}, employees can defer up to ${_DEFERRAL:,} of salary into a 401(k), 403(b) or most 457 plans, "
+     f"traditional and Roth contributions combined. Savers aged 50 or older can add a catch-up contribution of "
+     f"{_CATCH_UP_TEXT}. Employer contributions do not count toward this limit; they fall under a separate, higher "
+     "combined limit.",
+     [(_INVESTOPEDIA, 2), (_INVESTOPEDIA, 4), (_SCHWAB, 3)]),
+    ("What are catch-up contributions?", ["catch up contributions after 50", "how do catch-up contributions work"],
+     f"Catch-up contributions let savers aged 50 and older contribute more than the standard limit. For {_YEAR} that is "
+     f"an extra {_CATCH_UP_TEXT} in a 401(k), 403(b) or 457 plan and an extra ${_IRA_CATCH_UP:,} in an IRA.",
+     [(_INVESTOPEDIA, 4), (_SCHWAB, 3), (_SCHWAB_20S, 2)]),
+    ("What is an employer 401(k) match?", ["how does employer matching work", "how does a 401k match work", "what is a company match"],
+     "An employer match is money your employer adds to your 401(k) based on what you contribute, for example 50 cents "
+     "per dollar on the first 6% of salary. Contributing at least enough to get the full match is usually the first "
+     "priority, since it is an immediate return on your money. Matching contributions may vest over a few years of "
+     "service, meaning you keep them only after working there long enough; your own contributions are always yours.",
+     [(_INVESTOPEDIA, 4), (_SCHWAB, 1), (_SCHWAB, 2)]),
+    ("What is vesting in a 401(k)?", ["what is vesting", "how does 401k vesting work", "what is a vesting schedule"],
+     "Vesting is when money in your plan becomes permanently yours. Your own 401(k) contributions and their earnings "
+     "are always 100% vested. Employer contributions usually vest with years of service, either all at once after a "
+     "set period (cliff vesting) or a percentage each year (graded vesting); safe harbor and SIMPLE 401(k) plans vest "
+     "employer contributions immediately. If you leave before you are fully vested, you give up the unvested part.",
+     [(_DOL_PLAN, 4), (_DOL_PLAN, 5), (_CAMBRIDGE, 1)]),
+    ("What are required minimum distributions?", ["what is an RMD", "when do RMDs start", "required minimum distribution age"],
+     "Required minimum distributions (RMDs) are amounts you must withdraw each year from traditional IRAs and workplace "
+     "plans starting at age 73 if you were born from 1951 through 1959, or 75 if you were born in 1960 or later. Each "
+     "year's amount is the prior year-end balance divided by a factor from the IRS Uniform Lifetime Table. Roth IRAs "
+     "have no RMDs for the original owner, and a missed RMD triggers an excise tax on the amount not taken.",
+     [(_INVESTOPEDIA, 6), (_SCHWAB, 5), (_TAXES, 2)]),
+    ("What is the penalty for early withdrawal from a 401(k) or IRA?",
+     ["early withdrawal penalty", "penalty for withdrawing early from a 401k", "withdrawing from a 401k before 59 1/2",
+      "10 percent early withdrawal penalty"],
+     "Withdrawals from a 401(k) or IRA before age 59½ are generally taxed as income plus a 10% additional tax. "
+     "Exceptions include disability, some medical expenses, substantially equal periodic payments and, for a 401(k), "
+     "leaving your employer in or after the year you turn 55. IRAs also allow penalty-free withdrawals of up to "
+     "$10,000 for a first home and for qualified education costs. Roth IRA contributions can be taken out at any time.",
+     [(_INVESTOPEDIA, 6), (_INVESTOPEDIA, 10), (_SCHWAB, 5)]),
+    ("How are retirement account withdrawals taxed?", ["are 401k withdrawals taxed", "are retirement withdrawals taxed", "taxes on IRA distributions"],
+     "Withdrawals from traditional 401(k)s and IRAs are taxed as ordinary income in the year you take them, because "
+     "the money went in before tax. Qualified Roth withdrawals (from age 59½, with the account open five years or "
+     "more) are tax-free. Withdrawals before 59½ may also owe a 10% additional tax unless an exception applies.",
+     [(_TAXES, 1), (_TAXES, 2)]),
+    ("Why start saving for retirement early?", ["why save for retirement in your 20s", "why start investing early"],
+     "Money invested early has more years to compound, so its returns earn returns of their own. At a 7% annual "
+     "return, $5,000 a year saved only from 25 to 35 and then left invested grows to more by 65 than $5,000 a year "
+     "saved every year from 35 to 65. Starting early means smaller contributions reach the same goal.",
+     [(_SECURIAN, 0), (_SECURIAN, 2), (_SCHWAB_20S, 1)]),
+    ("How should retirement savings be invested?", ["how to diversify retirement investments", "how should retirement savings be diversified"],
+     "Retirement savings are usually spread across stocks for growth, bonds for stability and income, and cash for "
+     "near-term needs. The further away retirement is, the more can typically sit in stocks, since there is time to "
+     "ride out downturns; many people shift gradually toward bonds as retirement nears, which is what target-date "
+     "funds do automatically. Low-cost, broadly diversified index funds keep fees down, and rebalancing about once "
+     "a year keeps the mix on target.",
+     [(_SCHWAB_20S, 2), (_SECURIAN, 3), (_DOL_TOP_10, 1)]),
+]
+
+
+def looks_like_question(message: str) -> bool:
+    text = (message or "").strip()
+    return text.endswith("?") or bool(_QUESTION_START.match(text))
+
+
+def is_generic_question(message: str) -> bool:
+    """Short question with nothing personal in it: no first person, no numbers besides account names."""
+    text = (message or "").strip()
+    if not looks_like_question(text) or len(text.split()) > FAQ_MAX_WORDS:
+        return False
+    if _FIRST_PERSON.search(text):
+        return False
+    return not re.search(r"\d", _ACCOUNT_NAMES.sub(" ", text))
+
+
+def match_threshold(backend) -> float:
+    if FAQ_MATCH_THRESHOLD is not None:
+        return FAQ_MATCH_THRESHOLD
+    return FAQ_MATCH_THRESHOLDS.get((backend or os.getenv("EMBEDDING_BACKEND", "openai")).strip().lower(), 0.8)
+
+
+def cited_sources(chunk_index, entries) -> list[list[dict]]:
+    """
+    Per entry, the reviewed pages that the index retrieves for its canonical question. A page that is
+    not in the index (or no longer matches the question) is not cited.
+    """
+    if not entries:
+        return []
+    results = chunk_index.search_batch([entry["question"] for entry in entries], k=FAQ_SOURCE_CANDIDATES)
+    cited = []
+    for (*_, reviewed), docs in zip(FAQ_QUESTIONS, results):
+        retrieved = {
+            (os.path.basename(str(doc.metadata.get("source", ""))), doc.metadata.get("page"))
+            for doc, _score in docs
+        }
+        cited.append([{"source": source, "page": page} for source, page in reviewed if (source, page) in retrieved])
+    return cited
+
+
+def format_sources(sources) -> str:
+    # Pages in the index are 0-based
+    return "; ".join(f"{os.path.splitext(s['source'])[0]}, page {s['page'] + 1}" for s in sources)
+
+
+class FAQIndex:
+    """
+    Reviewed answers to common generic questions, each citing the corpus pages that support it.
+    Incoming questions are matched by embedding similarity against every canonical question and paraphrase;
+    entries with no page left to cite are never served.
+    """
+
+    def __init__(self, embeddings, entries, vectors, owners, threshold: float = 0.8):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.entries = entries              # [{"question", "answer", "sources": [{"source", "page"}]}]
+        self.vectors = np.asarray(vectors, dtype=np.float32).reshape(len(owners), -1)
+        self.owners = np.asarray(owners, dtype=np.int64)   # vector row -> entry index
+        self.served = np.array([bool(entries[owner]["sources"]) for owner in owners], dtype=bool)
+        for entry in entries:
+            if not entry["sources"]:
+                print(f"FAQ answer '{entry['question']}' has no supporting page in the index; not serving it")
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.vectors /= norms
+
+    @staticmethod
+    def _entries():
+        entries, texts, owners = [], [], []
+        for question, paraphrases, answer, _sources in FAQ_QUESTIONS:
+            for text in [question, *paraphrases]:
+                texts.append(text)
+                owners.append(len(entries))
+            entries.append({"question": question, "answer": answer, "sources": []})
+        return entries, texts, owners
+
+    @staticmethod
+    def _with_sources(entries, sources):
+        for entry, cited in zip(entries, sources):
+            entry["sources"] = cited
+        return entries
+
+    @classmethod
+    def build(cls, chunk_index, threshold: float = 0.8):
+        entries, texts, owners = cls._entries()
+        cls._with_sources(entries, cited_sources(chunk_index, entries))
+        vectors = chunk_index.embeddings.embed_documents(texts) if texts else []
+        return cls(chunk_index.embeddings, entries, vectors, owners, threshold)
+
+    @classmethod
+    def load_or_build(cls, chunk_index, index_dir: str, fingerprint, backend=None):
+        """
+        Question vectors and confirmed citations are cached per embedding index; answers always come from
+        FAQ_QUESTIONS. backend names the embedding model (the retrieval service reports it) for the threshold.
+        """
+        path = os.path.join(index_dir, FAQ_FILE)
+        threshold = match_threshold(backend)
+        entries, texts, owners = cls._entries()
+        reviewed = [[list(source) for source in sources] for *_, sources in FAQ_QUESTIONS]
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if (fingerprint and data.get("fingerprint") == fingerprint and data.get("texts") == texts
+                    and data.get("reviewed") == reviewed):
+                print(f"Loaded FAQ index from {path}")
+                cls._with_sources(entries, data["sources"])
+                return cls(chunk_index.embeddings, entries, data["vectors"], owners, threshold)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = cls.build(chunk_index, threshold)
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({
+                    "fingerprint": fingerprint, "texts": texts, "reviewed": reviewed,
+                    "sources": [entry["sources"] for entry in index.entries], "vectors": index.vectors.tolist(),
+                }, f)
+        except OSError as e:
+            print(f"Failed to persist FAQ index: {e}")
+        print(f"Built FAQ index with {sum(bool(entry['sources']) for entry in index.entries)} cited answers")
+        return index
+
+    def best_match(self, message: str):
+        """(entry, score) of the closest question, or None; no threshold or generic-question check."""
+        if not self.served.any():
+            return None
+        query = np.asarray(self.embeddings.embed_query(message), dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm:
+            return None
+        scores = np.where(self.served, self.vectors @ (query / norm), -np.inf)
+        best = int(np.argmax(scores))
+        return self.entries[int(self.owners[best])], float(scores[best])
+
+    def match(self, message: str, threshold: float | None = None):
+        """(entry, score) for a high-confidence match on a generic question, or None."""
+        if not is_generic_question(message):
+            return None
+        best = self.best_match(message)
+        if best is None or best[1] < (self.threshold if threshold is None else threshold):
+            return None
+        return best
@@ -2,16 +2,11 @@
 import os
 from getpass import getpass
 from langchain_community.chat_models import ChatOpenAI
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.prompts import PromptTemplate # Corrected import
 import json
 from langchain_openai import ChatOpenAI
-import glob
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_core.tools import tool
-from langgraph.prebuilt import ToolNode, tools_condition, create_react_agent
+from langgraph.prebuilt import ToolNode, tools_condition, create_react_agent, InjectedState
 
 MAXNUMOFFIELDS = 10
 COMPLETENESSRATIO = 1
@@ -25,14 +20,16 @@ openai_api_key = os.getenv('OPENAI_API_KEY')
 # Set the API key as an environment variable
 os.environ['OPENAI_API_KEY'] = openai_api_key
 
-model_chatbot = ChatOpenAI(model="gpt-4o", temperature=0)
-model_summarizer = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-model_matcher = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-model_extractor = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-model_planner= ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-embeddings = OpenAIEmbeddings()
-vector_store = InMemoryVectorStore(embeddings)
+# All models share one pooled HTTP client (see llm_clients.py) and go through the
+# priority scheduler (see llm_scheduler.py) so planner bursts don't starve chat turns
+from Agentic_AI.model_registry import model_registry
+# Primary/fallback model, timeout and hedging per node come from the registry (MODEL_REGISTRY overrides)
+model_chatbot = model_registry.model("chatbot")
+model_summarizer = model_registry.model("summarizer")
+model_matcher = model_registry.model("matcher")
+model_extractor = model_registry.model("extractor")
+model_planner= model_registry.model("planner")
+model_formatter = model_registry.model("formatter")
 
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 ## System Propmt chatbot
@@ -181,7 +178,7 @@ shadow_profile = {
 }
 """
 
-from typing import Literal,TypedDict
+from typing import Literal,TypedDict,Annotated
 from langgraph.graph import MessagesState
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -189,6 +186,8 @@ from langgraph.checkpoint.memory import MemorySaver
 # State class to store messages
 class ChatbotState(MessagesState):
    shadow_profile: dict
+   profile_suggestions: dict
+   profile_snapshot: HumanMessage
 
 # Extractor State
 class ExtractorState(MessagesState):
@@ -213,8 +212,12 @@ class SummarizerState(MessagesState):
 class PlannerState(MessagesState):
   real_profile: dict
   shadow_profile: dict
+  prefetched_context: list
+  user_email: str
+
 
 
+from Agentic_AI.message_log import MessageLog
 
 # Master state for final graph
 class MasterState(MessagesState):
@@ -226,6 +229,12 @@ class MasterState(MessagesState):
   shadow_profile: dict
   conversation_title: str
   planner: dict
+  session_id: str
+  plan_job_id: str
+  message_log: MessageLog
+  turn_ref: int
+  user_email: str
+  profile_suggestions: dict
 
 class RouterState(TypedDict):
     messages: list
@@ -268,20 +277,12 @@ def call_chatbot(state: ChatbotState):
     msgs = state.get("messages", [])
     if not msgs or not (isinstance(msgs[0], SystemMessage) and "NestWise" in msgs[0].content):
         # Prepend the static system prompt (set earlier as system_prompt_chatbot)
-        state["messages"] = [system_prompt_chatbot] + msgs
+        msgs = [system_prompt_chatbot] + msgs
     # Load & log shadow profile
     shadow_profile = state.get("shadow_profile", {}) or {}
     #print("Shadow profile from Chat Bot", shadow_profile)
     state["shadow_profile"] = shadow_profile
 
-    # Remove previous dynamic profile messages (avoid duplicate/conflicting snapshots)
-    cleaned = []
-    for m in state["messages"]:
-        if isinstance(m, HumanMessage) and "Below is the user's current profile status." in (m.content or ""):
-            continue
-        cleaned.append(m)
-    state["messages"] = cleaned
-
     # Build missing_fields robustly
     missing_fields = []
     for field, info in shadow_profile.items():
@@ -303,7 +304,17 @@ def call_chatbot(state: ChatbotState):
 
     missing_fields_text = "\n".join([f"- {f} (importance: {imp})" for f, imp in missing_fields]) or "None"
 
-    # Add a single, clean HumanMessage that contains the current profile snapshot
+    # Estimates from linked transactions are offered for confirmation, never taken as answers
+    missing_names = {f for f, _imp in missing_fields}
+    suggestions = {f: v for f, v in (state.get("profile_suggestions") or {}).items() if f in missing_names}
+    suggestions_text = ""
+    if suggestions:
+        suggestions_text = "Unconfirmed estimates from the user's linked bank transactions:\n" + "\n".join(
+            f"    - {f}: {v}" for f, v in suggestions.items()
+        ) + "\n    When you ask about one of these fields, mention the estimate and ask the user to confirm or correct it."
+
+    # A single HumanMessage with the current profile snapshot; it is sent to the model
+    # but never appended to the history, so there are no stale snapshots to strip
     profile_prompt = f"""
     Below is the user's current profile status.
     Each field has a 'collected' boolean and an 'importance' score (1.0 = most important):
@@ -313,6 +324,8 @@ def call_chatbot(state: ChatbotState):
     Missing fields sorted by importance:
     {missing_fields_text}
 
+    {suggestions_text}
+
     ## Your Task:
     1. **If fields are missing**: Ask about the MOST important missing field in a conversational way
     2. **If all collected**: Respond with "All necessary info collected. Proceeding to generate your plan."
@@ -322,13 +335,13 @@ def call_chatbot(state: ChatbotState):
     """
 
 
-    state["messages"].append(HumanMessage(content=profile_prompt))
+    profile_snapshot = HumanMessage(content=profile_prompt)
 
     # Debug print (optional)
     #print("missing_fields:", missing_fields)
 
     # Invoke model
-    response = model_chatbot.invoke(state["messages"])
+    response = model_chatbot.invoke(msgs + [profile_snapshot])
 
     # Get text
     reply_text = getattr(response, "content", None) or str(response)
@@ -340,12 +353,10 @@ def call_chatbot(state: ChatbotState):
         override_text = f"Could you please provide your {top_field}?"
         print("Model incorrectly said all collected — overriding to ask for:", top_field)
         override_message = AIMessage(content=override_text)
-        state["messages"].append(override_message)
-        return state
+        return {"messages": [override_message], "shadow_profile": shadow_profile, "profile_snapshot": profile_snapshot}
 
     # Otherwise append the model response and return
-    state["messages"].append(response)
-    return state
+    return {"messages": [response], "shadow_profile": shadow_profile, "profile_snapshot": profile_snapshot}
 
 ### Helper Function
 def is_valid_matcher_response(response_text):
@@ -495,7 +506,7 @@ def call_matcher(state: MatcherState):
 def call_summarizer(state: SummarizerState):
   state["messages"] = [system_prompt_summarize]  + state["messages"]
   #print(f"SUMMARIZER: {state['messages']}")
-  response = model_extractor.invoke(state["messages"])
+  response = model_summarizer.invoke(state["messages"])
   #print(f"Summarizer response: {response.content}")
   return {"summary": response.content}
 
@@ -506,7 +517,8 @@ def query_or_respond(state: PlannerState):
   "queries (each 1–2 sentences) that will return the most relevant PDF chunks for building a retirement plan. "
   "For each retrieval query include: (1) what fact/type of evidence you want (e.g., contribution limits, withdrawal "
   "rates, tax rules, life expectancy tables), (2) any date or jurisdiction constraints, and (3) why the snippet is needed. "
-  f"User Profile:\n{real_profile}\n\n"
+  f"When a query clearly targets one topic, pass it as the retrieve tool's topic argument (one of: {', '.join(TOPICS)}). "
+  f"User Profile:\n{state.get('real_profile', {})}\n\n"
 
 
   )
@@ -531,15 +543,23 @@ def call_planner(state: PlannerState):
           flattened_profile[k] = str(v.get("value", v.get("collected", "unknown")))
       else:
           flattened_profile[k] = str(v)
-  recent_tool_messages = []
-  for message in reversed(state["messages"]):
-      if message.type == "tool":
-          recent_tool_messages.append(message)
-      else:
-          break
-  tool_messages = recent_tool_messages[::-1]
-
-  docs_content = "\n\n".join(doc.content for doc in tool_messages)
+  # Retrieval results (calculator results stay in the conversation as tool messages)
+  tool_messages = [m for m in state["messages"] if m.type == "tool" and m.name == "retrieve"]
+
+  # Compress retrieved chunks down to the sentences most relevant to the query that fetched them
+  tool_call_queries = {}
+  for message in state["messages"]:
+      for call in getattr(message, "tool_calls", None) or []:
+          tool_call_queries[call["id"]] = call["args"].get("query", "")
+  # Context retrieved speculatively before the last field arrived (see prefetch.py)
+  query_docs = list(state.get("prefetched_context") or [])
+  for message in tool_messages:
+      for doc in message.artifact or []:
+          query_docs.append((tool_call_queries.get(message.tool_call_id, ""), doc))
+  if query_docs:
+      docs_content = compress_context(query_docs)
+  else:
+      docs_content = "\n\n".join(doc.content for doc in tool_messages)
   import json
 
   structured_json_schema = {
@@ -633,9 +653,22 @@ def call_planner(state: PlannerState):
   2. Include citations for all numerical data or regulatory references.
   3. Provide step-by-step advice for retirement savings, investment allocation, and milestones.
   4. Give the plan in a pretty print format. No JSON
+  5. Use the calculator tools for every number (balance projections, required savings, contribution limits,
+     income tax, RMDs) instead of doing arithmetic yourself. Request all the numbers you need in one turn.
+  6. Run retirement_projection for your asset_allocation and report its success probability and
+     percentile bands in the risk_assessment.
   """
   state["messages"] =  [SystemMessage(system_message_content)] + state["messages"]
-  response = model_planner.invoke(state["messages"])
+  # One round is one planner turn that called calculators, however many calls it made in parallel
+  calculator_rounds = sum(
+      1 for m in state["messages"]
+      if m.type == "ai" and any(call["name"] in CALCULATOR_TOOL_NAMES for call in getattr(m, "tool_calls", None) or [])
+  )
+  if calculator_rounds >= PLANNER_MAX_CALCULATOR_ROUNDS:
+    # Enough numbers, write the plan
+    response = model_planner.invoke(state["messages"])
+  else:
+    response = model_planner.bind_tools(CALCULATOR_TOOLS).invoke(state["messages"])
   return {"messages": [response]}
 
 ## to decide to call the planner agent.
@@ -653,6 +686,10 @@ def route_decision_extractor(state: MasterState) -> str:
     needsCriticalInfo = needsCriticalInfo or (info["importance"] == MAXRATING and not info["collected"])
   currentCompleteness = totFilledImportance/totImportance
 
+  # Start retrieval for the likely planner queries before the final field arrives
+  if retrieval_prefetcher.maybe_start(state.get("session_id"), current_template, state.get("real_profile", {}), currentCompleteness):
+    print(f"Started retrieval prefetch for template {current_template}")
+
   print(f"Current completeness: {currentCompleteness}")
   print(f"Does need critical info: {needsCriticalInfo}")
 
@@ -669,7 +706,7 @@ def route_decision_extractor(state: MasterState) -> str:
 
 def route_decision_summarize(state: MasterState) -> str:
   summarize_threshold = 20
-  messages_count = len(state.get("chatbot").get("messages"))
+  messages_count = len(state.get("chatbot").get("message_refs"))
 
   if messages_count >= summarize_threshold:
     return "summarizer"
@@ -678,45 +715,61 @@ def route_decision_summarize(state: MasterState) -> str:
 
 ## RAG Implementation
 
-# ---- Load PDFs from Google Drive folder ----
-pdf_folder = "./"
-pdf_files = glob.glob(f"{pdf_folder}/*.pdf")
+from Agentic_AI.local_index import load_local_index, RAG_INDEX_DIR
+from Agentic_AI.rag_client import RemoteChunkIndex, RAG_SERVICE_URL
+from Agentic_AI.compression import compress_context, format_snippet
+from Agentic_AI.calculators import CALCULATOR_TOOLS, CALCULATOR_TOOL_NAMES
+
+# Cap on planner turns that call calculators before the planner must answer
+PLANNER_MAX_CALCULATOR_ROUNDS = int(os.getenv("PLANNER_MAX_CALCULATOR_ROUNDS", "4"))
+
+if RAG_SERVICE_URL:
+    # backend-RAG owns the index; searches go over a pooled HTTP client
+    chunk_index = RemoteChunkIndex(RAG_SERVICE_URL)
+    index_fingerprint = chunk_index.fingerprint
+else:
+    # Local development: backend-RAG's index code from the checkout (EMBEDDING_BACKEND=local works offline)
+    chunk_index, index_fingerprint = load_local_index()
+print("Chunks per topic:", chunk_index.topic_counts())
+# Topics the retrieve tool can filter on
+TOPICS = tuple(chunk_index.topic_counts())
+
+# Chunks from the user's own uploaded documents added to prefetched planner context
+USER_DOCUMENT_K = int(os.getenv("USER_DOCUMENT_K", "3"))
+
+def search_chunks(query: str, k: int = 3, topic=None, user_email=None):
+  """Shared corpus plus, when retrieval goes through backend-RAG, the user's uploaded documents."""
+  if user_email and RAG_SERVICE_URL:
+    return chunk_index.search(query, k=k, topic=topic, namespace=user_email)
+  return chunk_index.search(query, k=k, topic=topic)
+
+from Agentic_AI.prefetch import RetrievalPrefetcher
+retrieval_prefetcher = RetrievalPrefetcher(chunk_index.search)
+
+# Top chunks per template and age band, precomputed for each index build
+from Agentic_AI.template_context import TemplateContextCache, TEMPLATE_CONTEXT_ENABLED, profile_query
+template_context = TemplateContextCache.load_or_build(chunk_index, RAG_INDEX_DIR, index_fingerprint)
+
+# Cited answers to common generic questions, served without running the agent graph
+from Agentic_AI.faq import FAQIndex, FAQ_ENABLED, format_sources
+faq_index = FAQIndex.load_or_build(
+    chunk_index, RAG_INDEX_DIR, index_fingerprint, backend=getattr(chunk_index, "info", {}).get("backend")
+)
 
-loaded_docs = []
-for file_path in pdf_files:
-    try:
-        loader = PyPDFLoader(file_path)
-        pages = loader.load()   # returns one Document per page
-        print(f"Loaded {file_path} -> {len(pages)} pages")
-        loaded_docs.extend(pages)
-        print(f"Loaded {file_path} -> {len(pages)} pages")
-    except Exception as e:
-        print(f"Failed to load {file_path}: {e}")
-
-# Split docs into chunks
-splitter = RecursiveCharacterTextSplitter(chunk_size=900, chunk_overlap=150)
-splits = splitter.split_documents(loaded_docs)
-
-# Add to vector store
-_ = vector_store.add_documents(documents=splits)
-print("Added PDF documents to InMemoryVectorStore. Total chunks:", len(splits))
+# Canned redirect for off-topic / abusive input
+from Agentic_AI.topic_guard import guard_reply
 
 # Define retriever tool
 @tool(response_format="content_and_artifact")
-def retrieve(query: str):
-    """Retrieve information related to a query from the vector store."""
-    retrieved_docs = vector_store.similarity_search(query, k=3)
+def retrieve(query: str, state: Annotated[dict, InjectedState], topic: str | None = None):
+    """Retrieve information related to a query from the vector store.
+    Optionally pass a topic (contribution_limits, taxes, withdrawals, early_career,
+    employer_match, investing) to only search chunks tagged with that topic."""
+    retrieved_docs = [doc for doc, _score in search_chunks(query, k=3, topic=topic, user_email=state.get("user_email"))]
     formatted_snippets = []
     for doc in retrieved_docs:
-        meta = getattr(doc, "metadata", {})
-        source = meta.get("source", "Unknown source")
-        print("Doc source:", source)
-        page = meta.get("page", "N/A")
-        formatted_snippets.append(
-            f"Source: {os.path.basename(source)}, Page: {page}\n"
-            f"Content:\n{doc.page_content.strip()}"
-        )
-
+        print("Doc source:", doc.metadata.get("source", "Unknown source"))
+        formatted_snippets.append(format_snippet(doc, doc.page_content))
 
     serialized = "\n\n---\n\n".join(formatted_snippets)
     return serialized, retrieved_docs
@@ -728,6 +781,8 @@ def retrieve(query: str):
 
 memory = MemorySaver()
 tools_node = ToolNode([retrieve])
+# A failing calculator call goes back to the planner as an error message instead of failing the plan job
+calculators_node = ToolNode(CALCULATOR_TOOLS, name="calculators", handle_tool_errors=True)
 # Chatbot (persistent)
 chatbot_graph = StateGraph(ChatbotState)
 chatbot_graph.add_node("chatbot", call_chatbot)
@@ -758,45 +813,58 @@ planner_graph = StateGraph(PlannerState)
 planner_graph.add_node(query_or_respond)
 planner_graph.add_node(tools_node)
 planner_graph.add_node(call_planner)
-planner_graph.set_entry_point("query_or_respond")
+planner_graph.add_node(calculators_node)
+# Skip LLM query planning and retrieval when the context was prefetched
+def route_planner_entry(state: PlannerState) -> str:
+  if state.get("prefetched_context"):
+    return "call_planner"
+  return "query_or_respond"
+
+planner_graph.add_conditional_edges(
+    START, route_planner_entry, {"query_or_respond": "query_or_respond", "call_planner": "call_planner"}
+)
 planner_graph.add_conditional_edges(
     "query_or_respond", tools_condition, {END: END, "tools": "tools"}
 )
 planner_graph.add_edge("tools", "call_planner")
-planner_graph.add_edge("call_planner", END)
+planner_graph.add_conditional_edges(
+    "call_planner", tools_condition, {END: END, "tools": "calculators"}
+)
+planner_graph.add_edge("calculators", "call_planner")
 planner_subgraph = planner_graph.compile(checkpointer=memory)
 
 ### Functions to run individual graphs
 
 def run_chatbot(master_state: MasterState):
-  chatbot_data = master_state.get("chatbot", {})
+  message_log = master_state["message_log"]
+  message_refs = list(master_state.get("chatbot", {}).get("message_refs", []))
   shadow_profile = master_state.get("shadow_profile", {})
-  chatbot_data["shadow_profile"] = shadow_profile
-  chatbot_state = ChatbotState(**chatbot_data)
-
-  all_messages = master_state.get("messages", [])
-  human_messages = [m for m in all_messages if m.type == "human"][-1:]  # last human message
-  last_human = human_messages[-1:] if human_messages else []
 
-  if chatbot_state:
-    chatbot_state["messages"] = chatbot_state["messages"] + last_human
-  else:
-    chatbot_state["messages"] = last_human
+  # Add this turn's human message to the chatbot's history
+  turn_ref = master_state.get("turn_ref")
+  if turn_ref is not None and turn_ref not in message_refs[-1:]:
+    message_refs.append(turn_ref)
 
+  chatbot_messages = message_log.get(message_refs)
+  chatbot_state = ChatbotState(messages=chatbot_messages, shadow_profile=shadow_profile,
+                               profile_suggestions=master_state.get("profile_suggestions") or {})
   chatbot_state = chatbot_subgraph.invoke(chatbot_state)
 
-  master_state["chatbot"] = dict(chatbot_state)
+  # Only the messages the chatbot added this turn go into the log
+  message_refs.extend(message_log.extend(chatbot_state["messages"][len(chatbot_messages):]))
+  message_log.profile_snapshot = chatbot_state.get("profile_snapshot")
+
+  master_state["chatbot"] = {"message_refs": message_refs}
   master_state["shadow_profile"] = chatbot_state.get("shadow_profile", {})
   return master_state
 
 def run_extractor(master_state: MasterState):
   extractor_data = master_state.get("extractor", {})
-  chatbot_data = master_state.get("chatbot", {})
+  message_log = master_state["message_log"]
   shadow_profile = master_state.get("shadow_profile", {})
   real_profile = master_state.get("real_profile", {})
   extractor_data["shadow_profile"] = shadow_profile
   extractor_state = ExtractorState(**extractor_data)
-  chatbot_state = ChatbotState(**chatbot_data)
 
   # Get the last human message from the master conversation
   all_messages = master_state.get("messages", [])
@@ -804,17 +872,17 @@ def run_extractor(master_state: MasterState):
   last_human = human_messages[-1:] if human_messages else []
 
   # Get the last message that the chatbot sent to the user
-  chatbot_messages = [
-        m for m in chatbot_state.get("messages", []) if m.type in ("ai", "system")
-  ]
-  last_chatbot = chatbot_messages[-1] if chatbot_messages else AIMessage(content="No Chatbot Messages Found")
+  last_chatbot = message_log.last(master_state.get("chatbot", {}).get("message_refs", []), ("ai", "system"))
+  if last_chatbot is None:
+    last_chatbot = AIMessage(content="No Chatbot Messages Found")
 
   # Combine for the extractor's current processing
   extractor_state["messages"] = [HumanMessage(content=last_chatbot.content)] + last_human
 
   extractor_state = extractor_subgraph.invoke(extractor_state)
 
-  master_state["extractor"] = dict(extractor_state)
+  # The extractor's prompt messages are rebuilt every turn, so only its fields are kept
+  master_state["extractor"] = {k: v for k, v in extractor_state.items() if k != "messages"}
   #print(master_state["extractor"].keys())
   master_state["real_profile"] = extractor_state.get("real_profile", {})
   master_state["shadow_profile"] = extractor_state.get("shadow_profile", {})
@@ -837,36 +905,90 @@ def run_matcher(master_state: MasterState):
   matcher_state = matcher_subgraph.invoke(matcher_state)
 
   # Save updated matcher state back into master
-  master_state["matcher"] = dict(matcher_state)
+  master_state["matcher"] = {k: v for k, v in matcher_state.items() if k != "messages"}
   master_state["shadow_profile"] = matcher_state.get("shadow_profile", {})
   return master_state
 
 def run_planner(master_state: MasterState):
     planner_data = master_state.get("planner", {})
+    planner_data["real_profile"] = master_state.get("real_profile", {})
+    planner_data["shadow_profile"] = master_state.get("shadow_profile", {})
+    template = (master_state.get("matcher") or {}).get("selected_template")
+    prefetched = retrieval_prefetcher.take(master_state.get("session_id"), template)
+    if prefetched:
+      print(f"Planner using {len(prefetched)} prefetched chunks")
+    elif template and TEMPLATE_CONTEXT_ENABLED:
+      # Cached per-template context plus one profile-specific query instead of LLM-planned retrieval
+      prefetched = template_context.context_for(template, planner_data["real_profile"])
+      print(f"Planner using {len(prefetched)} cached template chunks")
+    user_email = master_state.get("user_email")
+    if prefetched and user_email and RAG_SERVICE_URL:
+      # Prefetched context skips the retrieve tool, so add the user's own documents here
+      query = profile_query(planner_data["real_profile"]) or "retirement plan"
+      own = chunk_index.search(query, k=USER_DOCUMENT_K, namespace=user_email, include_shared=False)
+      if own:
+        print(f"Planner using {len(own)} chunks from the user's documents")
+      prefetched = list(prefetched) + [(query, doc) for doc, _score in own]
+    planner_data["prefetched_context"] = prefetched or []
+    planner_data["user_email"] = user_email
     planner_state = PlannerState(**planner_data)
+
+    if PLAN_JOBS_ENABLED:
+      # Generate the plan on the planner worker pool; the client polls /chatbot/plan/{job_id}
+      planner_input = PlannerState(**{**planner_state, "messages": list(planner_state.get("messages", []))})
+      master_state["plan_job_id"] = plan_jobs.submit(
+          master_state.get("session_id"),
+          lambda progress: generate_plan(planner_input, progress),
+          owner=user_email,
+      )
+      return master_state
+
     planner_state=planner_subgraph.invoke(planner_state)
-    master_state["planner"] = dict(planner_state)
+    # Only the final plan message is read back (chat_step)
+    master_state["planner"] = {"messages": planner_state["messages"][-1:]}
     return master_state
 
+def generate_plan(planner_state: PlannerState, progress):
+    """Run the planner subgraph and formatter outside the request, reporting each stage."""
+    config = {"configurable": {"thread_id": f"plan-{uuid.uuid4().hex}"}}
+    progress("drafting" if planner_state.get("prefetched_context") else "retrieving")
+    raw_plan = ""
+    try:
+      for update in planner_subgraph.stream(planner_state, config, stream_mode="updates"):
+        for node, node_update in update.items():
+          if node == "tools":
+            progress("drafting")
+          messages = (node_update or {}).get("messages") or []
+          if messages and node not in ("tools", "calculators"):
+            raw_plan = messages[-1].content
+    finally:
+      # The per-job checkpoint thread is never resumed
+      memory.delete_thread(config["configurable"]["thread_id"])
+    progress("formatting")
+    return {"plan": call_formatter(raw_plan), "raw_plan": raw_plan}
+
 def run_summarizer(master_state: MasterState):
   summarizer_data = master_state.get("summarizer", {})
-  chatbot_data = master_state.get("chatbot", {})
+  message_log = master_state["message_log"]
+  message_refs = master_state.get("chatbot", {}).get("message_refs", [])
   summarizer_state = SummarizerState(**summarizer_data)
-  chatbot_state = ChatbotState(**chatbot_data)
 
-  chatbot_messages = [
-      m for m in chatbot_state.get("messages", [])
-  ]
+  chatbot_messages = message_log.get(message_refs)
+  if message_log.profile_snapshot is not None:
+    chatbot_messages = chatbot_messages + [message_log.profile_snapshot]
 
   summarizer_state["messages"] = [HumanMessage("Last Summary:" + summarizer_state.get("summary", "None"))] + chatbot_messages
 
   # Run the summarizer subgraph
   summarizer_state["summary"] = summarizer_subgraph.invoke(summarizer_state)["summary"]
-  chatbot_state["messages"] = [system_prompt_chatbot] + [HumanMessage("Summary:" + summarizer_state["summary"])] + chatbot_messages[-1:]
-  master_state["summarizer"] = dict(summarizer_state)
-  master_state["chatbot"] = dict(chatbot_state)
+  summary_ref = message_log.append(HumanMessage("Summary:" + summarizer_state["summary"]))
+  master_state["summarizer"] = {"summary": summarizer_state["summary"]}
+  master_state["chatbot"] = {"message_refs": message_refs[:1] + [summary_ref] + message_refs[-1:]}
   return master_state
 
+from Agentic_AI.plan_jobs import plan_jobs, PLAN_JOBS_ENABLED
+import uuid
+
 workflow = StateGraph(MasterState)
 
 workflow.add_node("chatbot", run_chatbot)
@@ -913,9 +1035,6 @@ Use the following guidelines:
 4. Ensure the report is easy to read and understand for a non-technical audience.
 """)
 def call_formatter(raw_json_str: str):
-   
-
-    model_formatter = ChatOpenAI(model="gpt-4o-mini", temperature=0)
     
     # Defensive parsing: if the input is already a string, parse to dict
     try:
@@ -932,16 +1051,25 @@ def call_formatter(raw_json_str: str):
     response = model_formatter.invoke(messages)
     return response.content
 
-state = None
+from Agentic_AI.sessions import sessions
+from Agentic_AI.profile_prefill import prefill_profile
+
+# Prefetched retrieval for abandoned sessions goes when the session expires
+sessions.on_evict.append(retrieval_prefetcher.discard)
+
 initialMessage = 'Hello! I am NestWiseAI. How can I help you today?'
-def start_session(session_id: str):
+def start_session(session_id: str, user_email: str | None = None):
     """
-    Initialize a new session and store its MasterState in the global sessions dict.
+    Initialize a new session and store its MasterState in the session store.
+    user_email selects the user's uploaded documents for retrieval.
     """
-    global state
+    retrieval_prefetcher.discard(session_id)
+    message_log = MessageLog()
     state = MasterState(
         messages=[],
-        chatbot={"messages": [system_prompt_chatbot, assistant_message]},
+        message_log=message_log,
+        turn_ref=None,
+        chatbot={"message_refs": message_log.extend([system_prompt_chatbot, assistant_message])},
         matcher={"need_no_more_fields": False},
         extractor={"all_fields_filled": False,
                    "conversation_title":"None"},
@@ -953,32 +1081,93 @@ def start_session(session_id: str):
         "savings": {"collected": False, "importance": 4},
         "location": {"collected": False, "importance": 5}
         },
-        conversation_title="initial"
+        conversation_title="initial",
+        session_id=session_id,
+        plan_job_id=None,
+        user_email=user_email,
+        profile_suggestions={}
     )
+    if user_email:
+        # Linked transactions add spending context and a salary estimate the chatbot asks the user to confirm
+        state["profile_suggestions"] = prefill_profile(user_email, state["real_profile"])
+        # The extractor keeps its own copy of real_profile between turns
+        state["extractor"]["real_profile"] = dict(state["real_profile"])
+    sessions.put(session_id, state)
     return session_id
 
 
 # config = {"configurable": {"thread_id": "3"}}
 assistant_message = AIMessage(content="Hello there, I'm NestWise! How can I help you plan for your retirement?")
-prev_assistant_message = None
 
-def chat_step(user_message: str, session_id: str):
+def chat_step(user_message: str, session_id: str, user_email: str | None = None):
+    session = sessions.get(session_id)
+    if session is None:
+        # Unknown or expired session (e.g. after a restart): start it fresh
+        start_session(session_id, user_email)
+        session = sessions.get(session_id)
+
+    if session.state.get("user_email") != user_email:
+        # Session ids are not secrets; a session (and its user's documents) only answers its owner
+        raise PermissionError(f"Session {session_id} belongs to another user")
+
+    with session.lock:
+        return _chat_step(session, user_message)
+
+def _chat_step(session, user_message: str):
     if user_message:
         human_message = HumanMessage(content=user_message)
     else:
         human_message = None
     
-    global state
-    global prev_assistant_message
+    state = session.state
+
+    # Off-topic messages skip the graph entirely
+    shortcut = guard_reply(user_message) if user_message else None
+    sources = None
+    if shortcut:
+        print("Topic guard redirected the message")
+    elif FAQ_ENABLED and user_message:
+        # Short generic questions get a reviewed answer instead of the chatbot and planner;
+        # the extractor still runs so nothing the user said is lost
+        faq_match = faq_index.match(user_message)
+        if faq_match:
+            entry, score = faq_match
+            print(f"FAQ match '{entry['question']}' ({score:.2f})")
+            sources = entry["sources"]
+            shortcut = f"{entry['answer']}\n\nSources: {format_sources(sources)}"
+            state["messages"] = [human_message]
+            state["turn_ref"] = state["message_log"].append(human_message)
+            state = session.state = run_extractor(state)
+            # Keep the exchange in the chatbot's history, and mark the answer as already shown
+            faq_message = AIMessage(content=shortcut)
+            message_refs = state["chatbot"]["message_refs"]
+            message_refs.append(state["turn_ref"])
+            message_refs.extend(state["message_log"].extend([faq_message]))
+            session.prev_assistant_message = faq_message
+    if shortcut:
+        return {
+            "response": shortcut,
+            "real_profile": {field: state["real_profile"].get(field, False) for field in state["shadow_profile"]},
+            "conversation_title": state["conversation_title"],
+            "plan_job_id": None,
+            "sources": sources
+        }
 
-    # Run the graph
-    state["messages"].append(human_message)
-    state = graph.invoke(state)
+    # Run the graph; the master state only carries this turn's message, history lives in the log
+    state["messages"] = [human_message] if human_message else []
+    state["turn_ref"] = state["message_log"].append(human_message) if human_message else None
+    state = session.state = graph.invoke(state)
 
     # Print the assistant's reply
-    assistant_message = state['chatbot']['messages'][-1]
-    
-    if assistant_message == prev_assistant_message:
+    assistant_message = state["message_log"].last(state['chatbot']['message_refs'])
+    plan_job_id = state.get("plan_job_id")
+
+    if plan_job_id:
+        # Planner was queued as a background job this turn
+        state["plan_job_id"] = None
+        response_text = "I have everything I need! I'm generating your retirement plan now, it will appear here shortly."
+
+    elif assistant_message == session.prev_assistant_message:
         planner_message = state['planner']['messages'][-1]
         raw_json = planner_message.content
 
@@ -988,7 +1177,7 @@ def chat_step(user_message: str, session_id: str):
 
     else:
         response_text = assistant_message.content
-        prev_assistant_message = assistant_message
+        session.prev_assistant_message = assistant_message
 
     
     ## Pass to the frontend.
@@ -1004,5 +1193,6 @@ def chat_step(user_message: str, session_id: str):
     return {
         "response": response_text,
         "real_profile": profile_data,
-        "conversation_title": conversation_title
+        "conversation_title": conversation_title,
+        "plan_job_id": plan_job_id
     } 
\ No newline at end of file
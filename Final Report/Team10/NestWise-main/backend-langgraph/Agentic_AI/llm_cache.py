@@ -0,0 +1,189 @@
+# backend_langgraph/Agentic_AI/llm_cache.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from langchain_core.runnables import Runnable
+from langchain_core.messages import BaseMessage, messages_to_dict, messages_from_dict
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# Every model runs at low temperature, so byte-identical prompts get the same answer: serve them from disk
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./llm_cache/responses.sqlite")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+EVICT_TO = 0.9                         # evict least recently used entries down to 90% of the limits
+CACHE_HIT_KEY = "llm_cache_hit"        # set in response_metadata of replayed answers
+
+
+def _serialize_input(input):
+    if isinstance(input, str):
+        return input
+    if isinstance(input, BaseMessage):
+        input = [input]
+    if isinstance(input, (list, tuple)):
+        return [messages_to_dict([m])[0] if isinstance(m, BaseMessage) else m for m in input]
+    if hasattr(input, "to_messages"):
+        return messages_to_dict(input.to_messages())
+    return input
+
+
+def cache_key(model: str, messages, tools=None, params=None) -> str:
+    """sha256 over (model, messages, tools, params)."""
+    payload = {
+        "model": model,
+        "messages": _serialize_input(messages),
+        "tools": tools or [],
+        "params": params or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Exact-match response cache in SQLite, shared by all workers on the host and kept across restarts.
+    Size is bounded by entry count and total bytes; least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.evictions = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._conn.commit()
+        self._entries, self._bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, value):
+        raw = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, raw, len(raw), now, now),
+            )
+            if old is None:
+                self._entries += 1
+            self._bytes += len(raw) - (old[0] if old else 0)
+            self.writes += 1
+            if self._entries > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        target_entries = int(self.max_entries * EVICT_TO)
+        target_bytes = int(self.max_bytes * EVICT_TO)
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._entries <= target_entries and self._bytes <= target_bytes:
+                break
+            evicted.append((key,))
+            self._entries -= 1
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._entries = self._bytes = 0
+
+    def stats(self) -> dict:
+        # Under the lock so the counters are a consistent snapshot (it is held during SQLite reads and writes)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": self._entries,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+def is_cache_hit(message) -> bool:
+    return bool((getattr(message, "response_metadata", None) or {}).get(CACHE_HIT_KEY))
+
+
+class CachedModel(Runnable):
+    """Runnable wrapper that answers a chat model's invoke from llm_cache when the exact prompt was seen before."""
+
+    def __init__(self, model, model_name: str, params=None, tools=None, cache=None):
+        self.model = model
+        self.model_name = model_name
+        self.params = params or {}
+        self.tools = tools
+        self.cache = cache or llm_cache
+
+    def invoke(self, input, config=None, **kwargs):
+        key = cache_key(self.model_name, input, self.tools, {**self.params, **kwargs})
+        cached = self.cache.get(key)
+        if cached is not None:
+            message = messages_from_dict(cached)[0]
+            message.response_metadata = {**message.response_metadata, CACHE_HIT_KEY: True}
+            return message
+        result = self.model.invoke(input, config, **kwargs)
+        if isinstance(result, BaseMessage):
+            self.cache.put(key, messages_to_dict([result]))
+        return result
+
+    def bind_tools(self, tools, **kwargs):
+        schemas = [convert_to_openai_tool(t) for t in tools]
+        return CachedModel(self.model.bind_tools(tools, **kwargs), self.model_name, {**self.params, **kwargs}, schemas, self.cache)
+
+    def __getattr__(self, name):
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+
+class _DisabledCache:
+    def get(self, key):
+        return None
+
+    def put(self, key, value):
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False}
+
+
+def cached(model, model_name: str, **params):
+    if not LLM_CACHE_ENABLED:
+        return model
+    return CachedModel(model, model_name, params)
+
+
+llm_cache = LLMCache() if LLM_CACHE_ENABLED else _DisabledCache()
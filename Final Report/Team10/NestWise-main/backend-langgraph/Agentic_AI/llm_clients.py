@@ -0,0 +1,90 @@
+# backend_langgraph/Agentic_AI/llm_clients.py
+import os
+import threading
+import httpx
+import openai
+from langchain_openai import ChatOpenAI
+
+from Agentic_AI.llm_stub import LLM_STUB, StubChatModel
+
+# One keep-alive connection pool per process, shared by every graph node and controller
+OPENAI_POOL_MAX_CONNECTIONS = int(os.getenv("OPENAI_POOL_MAX_CONNECTIONS", "20"))
+OPENAI_POOL_MAX_KEEPALIVE = int(os.getenv("OPENAI_POOL_MAX_KEEPALIVE", "10"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+# Every client is used behind llm_scheduler, which does the retrying so 429s reach its backoff
+OPENAI_MAX_RETRIES = 0
+
+_lock = threading.Lock()
+_http_client = None
+_async_http_client = None
+_openai_client = None
+_chat_models = {}
+
+
+def _limits():
+    return httpx.Limits(
+        max_connections=OPENAI_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout(seconds=None):
+    return httpx.Timeout(seconds or OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+
+
+def get_http_client() -> httpx.Client:
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+        return _async_http_client
+
+
+def get_openai_client() -> openai.OpenAI:
+    """Process-wide openai.OpenAI client on the shared connection pool."""
+    global _openai_client
+    http_client = get_http_client()
+    with _lock:
+        if _openai_client is None:
+            _openai_client = openai.OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                http_client=http_client,
+                timeout=_timeout(),
+                max_retries=OPENAI_MAX_RETRIES,
+            )
+        return _openai_client
+
+
+def get_chat_model(model: str, temperature: float = 0, timeout: float | None = None, **kwargs) -> ChatOpenAI:
+    """
+    Cached ChatOpenAI for (model, temperature, timeout, kwargs). All instances share the same
+    sync/async HTTP pools and retry policy; timeout overrides OPENAI_TIMEOUT per model.
+    """
+    if LLM_STUB:
+        return StubChatModel(model_name=model)
+    key = (model, temperature, timeout, tuple(sorted(kwargs.items())))
+    http_client = get_http_client()
+    async_http_client = get_async_http_client()
+    with _lock:
+        if key not in _chat_models:
+            _chat_models[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=async_http_client,
+                timeout=_timeout(timeout),
+                max_retries=OPENAI_MAX_RETRIES,
+                **kwargs,
+            )
+        return _chat_models[key]
@@ -0,0 +1,260 @@
+# backend_langgraph/Agentic_AI/llm_scheduler.py
+import os
+import time
+import heapq
+import itertools
+import threading
+import contextvars
+import openai
+from langchain_core.runnables import Runnable
+
+# Priority classes (lower runs first)
+INTERACTIVE = 0     # chatbot turns (extractor, matcher, chatbot) and the textizer shown next to them
+PLANNING = 1        # planner, retrieval planning, formatter
+BACKGROUND = 2      # summarizer
+PRIORITY_NAMES = {INTERACTIVE: "interactive", PLANNING: "planning", BACKGROUND: "background"}
+
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "2"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+LLM_INITIAL_CONCURRENCY = int(os.getenv("LLM_INITIAL_CONCURRENCY", "8"))
+LLM_LATENCY_TARGET_SECONDS = float(os.getenv("LLM_LATENCY_TARGET_SECONDS", "20"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "120"))
+# The OpenAI clients do not retry (llm_clients); 429s and 5xx are retried here, after the limit has shrunk
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = float(os.getenv("LLM_RETRY_BACKOFF_SECONDS", "0.5"))
+LLM_DECREASE_COOLDOWN_SECONDS = 5.0
+LLM_DECREASE_FACTOR = 0.5
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call was still queued when its caller's deadline passed, or the caller no longer wants it."""
+
+
+class CallControl:
+    """
+    Deadline and dispatch signal for one model call. Set it in call_control around invoke and the
+    scheduler drops the call once the deadline passes (or cancel() is called) while it is still queued,
+    and stamps dispatched_at when it gets a slot.
+    """
+
+    __slots__ = ("deadline", "dispatched_at", "started", "cancelled", "scheduler")
+
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self.dispatched_at = None
+        self.started = threading.Event()    # dispatched, or finished without the scheduler (cache hit, error)
+        self.cancelled = False
+        self.scheduler = None               # the scheduler it is queued in
+
+    def cancel(self):
+        """Drop the call if it is still queued; a call that already has a slot runs to completion."""
+        self.cancelled = True
+        if self.scheduler is not None:
+            self.scheduler.wake()
+
+
+call_control = contextvars.ContextVar("llm_call_control", default=None)
+
+
+class LLMScheduler:
+    """
+    Process-wide gate for outbound model calls.
+    Waiting calls are admitted strictly by priority (then FIFO) while in-flight calls stay
+    under an AIMD concurrency limit: +1 per limit's worth of fast successes, halved on a
+    429 or a call slower than the latency target (at most once per cooldown).
+    """
+
+    def __init__(
+        self,
+        min_limit=LLM_MIN_CONCURRENCY,
+        max_limit=LLM_MAX_CONCURRENCY,
+        initial_limit=LLM_INITIAL_CONCURRENCY,
+        latency_target=LLM_LATENCY_TARGET_SECONDS,
+        queue_timeout=LLM_QUEUE_TIMEOUT_SECONDS,
+        max_retries=LLM_MAX_RETRIES,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.queue_timeout = queue_timeout
+        self.max_retries = max(0, max_retries)
+
+        self._cond = threading.Condition()
+        self._waiting = []              # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._last_decrease = 0.0
+
+        self._queued = {p: 0 for p in PRIORITY_NAMES}
+        self._completed = {p: 0 for p in PRIORITY_NAMES}
+        self._wait_total = {p: 0.0 for p in PRIORITY_NAMES}
+        self._wait_max = {p: 0.0 for p in PRIORITY_NAMES}
+        self._rate_limited = 0
+        self._slow = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._dropped = 0
+        self._retries = 0
+
+    def acquire(self, priority=INTERACTIVE, control: CallControl | None = None):
+        ticket = (priority, next(self._seq))
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        caller_deadline = control.deadline if control is not None and control.deadline is not None else None
+        with self._cond:
+            if control is not None:
+                control.scheduler = self
+            heapq.heappush(self._waiting, ticket)
+            self._queued[priority] += 1
+            try:
+                while not (self._waiting[0] == ticket and self._in_flight < int(self.limit)):
+                    now = time.monotonic()
+                    if control is not None and (control.cancelled or (caller_deadline is not None and now >= caller_deadline)):
+                        self._leave_queue(ticket)
+                        self._dropped += 1
+                        raise DeadlineExceeded(f"LLM call dropped from the {PRIORITY_NAMES[priority]} queue")
+                    if now >= deadline:
+                        self._leave_queue(ticket)
+                        self._timeouts += 1
+                        raise TimeoutError(
+                            f"LLM call waited more than {self.queue_timeout}s in the {PRIORITY_NAMES[priority]} queue"
+                        )
+                    self._cond.wait(min(deadline, caller_deadline or deadline) - now)
+                heapq.heappop(self._waiting)
+                self._in_flight += 1
+            finally:
+                self._queued[priority] -= 1
+            if control is not None:
+                control.dispatched_at = time.monotonic()
+                control.started.set()
+            waited = time.monotonic() - start
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+            # The next ticket may also fit under the limit
+            self._cond.notify_all()
+
+    def _leave_queue(self, ticket):
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        self._cond.notify_all()
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def release(self, priority, latency, rate_limited=False, error=False):
+        with self._cond:
+            self._in_flight -= 1
+            self._completed[priority] += 1
+            now = time.monotonic()
+            if rate_limited or latency > self.latency_target:
+                if rate_limited:
+                    self._rate_limited += 1
+                else:
+                    self._slow += 1
+                if now - self._last_decrease >= LLM_DECREASE_COOLDOWN_SECONDS:
+                    self.limit = max(float(self.min_limit), self.limit * LLM_DECREASE_FACTOR)
+                    self._last_decrease = now
+            elif error:
+                self._errors += 1
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def run(self, priority, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) under the concurrency limit. A 429 or 5xx gives the slot back (a 429 also
+        halves the limit), waits out the backoff and queues again, up to max_retries times.
+        The CallControl in call_control, if any, bounds the time spent queued.
+        """
+        control = call_control.get()
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority, control)
+            start = time.monotonic()
+            rate_limited = error = False
+            try:
+                return fn(*args, **kwargs)
+            except (openai.RateLimitError, openai.InternalServerError) as exc:
+                rate_limited = isinstance(exc, openai.RateLimitError)
+                error = not rate_limited
+                if attempt == self.max_retries:
+                    raise
+                delay = retry_delay(exc, attempt)
+            except Exception:
+                error = True
+                raise
+            finally:
+                self.release(priority, time.monotonic() - start, rate_limited=rate_limited, error=error)
+            with self._cond:
+                self._retries += 1
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self._in_flight,
+                "queue_depth": {PRIORITY_NAMES[p]: n for p, n in self._queued.items()},
+                "completed": {PRIORITY_NAMES[p]: n for p, n in self._completed.items()},
+                "avg_wait_seconds": {
+                    PRIORITY_NAMES[p]: round(self._wait_total[p] / self._completed[p], 4) if self._completed[p] else 0.0
+                    for p in PRIORITY_NAMES
+                },
+                "max_wait_seconds": {PRIORITY_NAMES[p]: round(w, 4) for p, w in self._wait_max.items()},
+                "rate_limited": self._rate_limited,
+                "slow_calls": self._slow,
+                "errors": self._errors,
+                "queue_timeouts": self._timeouts,
+                "dropped": self._dropped,
+                "retries": self._retries,
+            }
+
+
+def retry_delay(exc, attempt: int) -> float:
+    """Exponential backoff, or the server's Retry-After when it asks for longer."""
+    delay = LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt
+    response = getattr(exc, "response", None)
+    try:
+        return max(delay, float(response.headers.get("retry-after", 0)))
+    except (AttributeError, TypeError, ValueError):
+        return delay
+
+
+llm_scheduler = LLMScheduler()
+
+
+class ScheduledModel(Runnable):
+    """
+    Runnable wrapper that sends every invoke of a chat model through llm_scheduler.
+    stream/batch/ainvoke are Runnable's defaults, which call invoke; the wrapped model's own methods
+    (generate, with_structured_output, ...) are not forwarded unless wrapped here, since they would
+    call the API without a slot.
+    """
+
+    def __init__(self, model, priority=INTERACTIVE, scheduler=None):
+        self.model = model
+        self.priority = priority
+        self.scheduler = scheduler or llm_scheduler
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.scheduler.run(self.priority, self.model.invoke, input, config, **kwargs)
+
+    def bind_tools(self, tools, **kwargs):
+        return ScheduledModel(self.model.bind_tools(tools, **kwargs), self.priority, self.scheduler)
+
+    def with_structured_output(self, schema, **kwargs):
+        return ScheduledModel(self.model.with_structured_output(schema, **kwargs), self.priority, self.scheduler)
+
+    def __getattr__(self, name):
+        # model_name, temperature, ... of the wrapped model
+        if name == "model":
+            raise AttributeError(name)
+        value = getattr(self.model, name)
+        if callable(value):
+            raise AttributeError(f"{name} would bypass llm_scheduler; wrap it in ScheduledModel first")
+        return value
+
+
+def scheduled(model, priority=INTERACTIVE) -> ScheduledModel:
+    return ScheduledModel(model, priority)
@@ -0,0 +1,27 @@
+# backend_langgraph/Agentic_AI/local_index.py
+import os
+import sys
+
+# Without RAG_SERVICE_URL (local development, in-process load tests) the chat service loads the index
+# itself with backend-RAG's retrieval package from the same checkout, so the index code exists once.
+# The langgraph container only has backend-langgraph and always goes through the service.
+RAG_SOURCE_DIR = os.path.abspath(os.getenv(
+    "RAG_SOURCE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend-RAG")
+))
+# Template context and FAQ caches are kept here (the local index too, when there is one)
+RAG_INDEX_DIR = os.getenv("RAG_INDEX_DIR", "./rag_index")
+
+
+def load_local_index():
+    """(ChunkIndex, index fingerprint) loaded or built by backend-RAG's retrieval code."""
+    if not os.path.isdir(os.path.join(RAG_SOURCE_DIR, "retrieval")):
+        raise RuntimeError(
+            f"RAG_SERVICE_URL is not set and backend-RAG was not found at {RAG_SOURCE_DIR}; set one of them"
+        )
+    if RAG_SOURCE_DIR not in sys.path:
+        sys.path.append(RAG_SOURCE_DIR)
+    from retrieval.rag_index import load_or_build_index, read_manifest
+    from retrieval.chunk_index import ChunkIndex
+
+    _embeddings, vector_store = load_or_build_index()
+    return ChunkIndex.from_vector_store(vector_store), read_manifest(RAG_INDEX_DIR).get("fingerprint")
@@ -0,0 +1,50 @@
+# backend_langgraph/Agentic_AI/message_log.py
+
+
+class MessageRecord:
+    """One logged message; kind is the message type ("human", "ai", "system", "tool") for cheap filtering."""
+
+    __slots__ = ("ref", "kind", "message")
+
+    def __init__(self, ref: int, message):
+        self.ref = ref
+        self.kind = message.type
+        self.message = message
+
+
+class MessageLog:
+    """
+    Append-only message log for one session.
+    Every message is stored exactly once; subgraph states keep lists of integer refs into the log
+    and only materialize the messages they hand to a model. The profile snapshot the chatbot sees
+    lives in a single slot that is overwritten each turn instead of being appended to the history.
+    """
+
+    __slots__ = ("_records", "profile_snapshot")
+
+    def __init__(self):
+        self._records = []
+        self.profile_snapshot = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def append(self, message) -> int:
+        ref = len(self._records)
+        self._records.append(MessageRecord(ref, message))
+        return ref
+
+    def extend(self, messages) -> list[int]:
+        return [self.append(m) for m in messages]
+
+    def get(self, refs) -> list:
+        records = self._records
+        return [records[ref].message for ref in refs]
+
+    def last(self, refs, kinds=None):
+        """Most recent message among refs (optionally of the given kinds), or None."""
+        records = self._records
+        for ref in reversed(refs):
+            if kinds is None or records[ref].kind in kinds:
+                return records[ref].message
+        return None
@@ -0,0 +1,258 @@
+# backend_langgraph/Agentic_AI/model_registry.py
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from langchain_core.runnables import Runnable
+
+from Agentic_AI.llm_clients import get_chat_model
+from Agentic_AI.llm_scheduler import (
+    scheduled, call_control, CallControl, DeadlineExceeded, INTERACTIVE, PLANNING, BACKGROUND,
+)
+from Agentic_AI.llm_cache import cached, is_cache_hit
+
+logger = logging.getLogger(__name__)
+
+# node -> primary/fallback model, per-call timeout (seconds), scheduler priority, and whether slow
+# primaries are hedged. hedge_after is the hedge delay until the primary has HEDGE_MIN_SAMPLES latencies,
+# after that the primary's observed p95 is used. Override any field with MODEL_REGISTRY (JSON), e.g.
+#   MODEL_REGISTRY='{"chatbot": {"primary": "gpt-4.1", "hedge_after": 5}}'
+DEFAULT_NODE_MODELS = {
+    "chatbot":    {"primary": "gpt-4o",      "fallback": "gpt-4o-mini", "timeout": 30,  "priority": INTERACTIVE, "hedge": True,  "hedge_after": 8},
+    "extractor":  {"primary": "gpt-4o-mini", "fallback": "gpt-4o",      "timeout": 20,  "priority": INTERACTIVE, "hedge": True,  "hedge_after": 5},
+    "matcher":    {"primary": "gpt-4o-mini", "fallback": "gpt-4o",      "timeout": 20,  "priority": INTERACTIVE, "hedge": True,  "hedge_after": 5},
+    "planner":    {"primary": "gpt-4o-mini", "fallback": "gpt-4o",      "timeout": 120, "priority": PLANNING,    "hedge": False, "hedge_after": 60},
+    "formatter":  {"primary": "gpt-4o-mini", "fallback": "gpt-4o",      "timeout": 90,  "priority": PLANNING,    "hedge": False, "hedge_after": 45},
+    "summarizer": {"primary": "gpt-4o-mini", "fallback": None,          "timeout": 60,  "priority": BACKGROUND,  "hedge": False, "hedge_after": 30},
+}
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200                     # latencies kept per (node, model) for the p95
+HEDGE_WORKERS = int(os.getenv("HEDGE_WORKERS", "32"))   # threads for hedged (interactive) nodes only
+
+
+def load_node_models() -> dict:
+    nodes = {name: dict(cfg) for name, cfg in DEFAULT_NODE_MODELS.items()}
+    raw = os.getenv("MODEL_REGISTRY", "").strip()
+    if raw:
+        try:
+            overrides = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"MODEL_REGISTRY is not valid JSON: {e}") from e
+        for name, cfg in overrides.items():
+            nodes.setdefault(name, dict(DEFAULT_NODE_MODELS["chatbot"])).update(cfg)
+    return nodes
+
+
+class LatencyTracker:
+    """
+    Rolling latencies of successful calls per (node, model): the same model answers a 5-second
+    extraction and a 2-minute plan, so pooling them would give every node the slowest node's p95.
+    """
+
+    def __init__(self, window: int = HEDGE_WINDOW):
+        self._samples = {}
+        self._lock = threading.Lock()
+        self.window = window
+
+    def record(self, key: tuple, seconds: float):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, key: tuple):
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return float(np.percentile(samples, 95))
+
+
+class NodeStats:
+    __slots__ = ("calls", "hedged", "fallback_wins", "primary_errors", "timeouts")
+
+    def __init__(self):
+        self.calls = self.hedged = self.fallback_wins = self.primary_errors = self.timeouts = 0
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class HedgedModel(Runnable):
+    """
+    Chat model for one graph node: calls the primary, and if it fails (or, for hedged nodes, has been
+    running for longer than its p95) sends the same request to the fallback; the first successful
+    response wins. Non-hedged nodes run in the caller's thread. The whole call is bounded by the
+    node's timeout: calls still queued in llm_scheduler at the deadline are dropped there.
+    """
+
+    def __init__(self, node, primary, fallback, primary_name, fallback_name, timeout, hedge, hedge_after, registry):
+        self.node = node
+        self.primary = primary
+        self.fallback = fallback
+        self.primary_name = primary_name
+        self.fallback_name = fallback_name
+        self.timeout = timeout
+        self.hedge = hedge and fallback is not None
+        self.hedge_after = hedge_after
+        self.registry = registry
+
+    def bind_tools(self, tools, **kwargs):
+        return HedgedModel(
+            self.node,
+            self.primary.bind_tools(tools, **kwargs),
+            self.fallback.bind_tools(tools, **kwargs) if self.fallback is not None else None,
+            self.primary_name, self.fallback_name, self.timeout, self.hedge, self.hedge_after, self.registry,
+        )
+
+    def hedge_delay(self) -> float:
+        p95 = self.registry.latencies.p95((self.node, self.primary_name))
+        return min(p95 if p95 is not None else self.hedge_after, self.timeout)
+
+    def _call(self, model, name, control, input, config, kwargs):
+        token = call_control.set(control)
+        try:
+            result = model.invoke(input, config, **kwargs)
+            # Time from dispatch: queue wait is the scheduler's, not the model's (and cache hits are never dispatched)
+            if control.dispatched_at is not None and not is_cache_hit(result):
+                self.registry.latencies.record((self.node, name), time.monotonic() - control.dispatched_at)
+            return result
+        finally:
+            call_control.reset(token)
+            control.started.set()
+
+    def _submit(self, model, name, control, input, config, kwargs):
+        # Keep callbacks/tracing context in the worker thread
+        ctx = contextvars.copy_context()
+        return self.registry.executor.submit(ctx.run, self._call, model, name, control, input, config, kwargs)
+
+    def _timed_out(self, stats):
+        stats.timeouts += 1
+        return TimeoutError(f"{self.node} model call exceeded {self.timeout}s")
+
+    def invoke(self, input, config=None, **kwargs):
+        stats = self.registry.node_stats(self.node)
+        stats.calls += 1
+        deadline = time.monotonic() + self.timeout
+        if not self.hedge:
+            return self._invoke_inline(stats, deadline, input, config, kwargs)
+
+        controls = {}
+
+        def submit(model, name):
+            control = CallControl(deadline)
+            future = self._submit(model, name, control, input, config, kwargs)
+            controls[future] = control
+            return future
+
+        def drop_others(keep=None):
+            for future, control in controls.items():
+                if future is not keep:
+                    control.cancel()
+
+        primary = submit(self.primary, self.primary_name)
+        pending = {primary}
+        # The hedge clock starts when the scheduler dispatches the primary: while it is still queued a
+        # fallback would only queue behind it and double the load on a congested (or throttled) API
+        primary_control = controls[primary]
+        primary_control.started.wait(max(0.0, deadline - time.monotonic()))
+        if primary_control.dispatched_at is not None:
+            hedge_at = min(primary_control.dispatched_at + self.hedge_delay(), deadline)
+            done, _ = wait(pending, timeout=max(0.0, hedge_at - time.monotonic()))
+            if not done and time.monotonic() < deadline:
+                stats.hedged += 1
+                pending.add(submit(self.fallback, self.fallback_name))
+
+        errors = []
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        stats.fallback_wins += 1
+                    drop_others(keep=future)
+                    return future.result()
+                if isinstance(future.exception(), DeadlineExceeded):
+                    continue
+                errors.append(future.exception())
+                if future is primary:
+                    stats.primary_errors += 1
+                    logger.warning("%s primary %s failed: %s", self.node, self.primary_name, future.exception())
+                    if len(pending) == 0 and len(errors) == 1:
+                        # Primary failed before any hedge went out: fall back now
+                        pending.add(submit(self.fallback, self.fallback_name))
+
+        drop_others()
+        if not pending and errors:
+            raise errors[-1]
+        raise self._timed_out(stats)
+
+    def _invoke_inline(self, stats, deadline, input, config, kwargs):
+        try:
+            return self._call(self.primary, self.primary_name, CallControl(deadline), input, config, kwargs)
+        except DeadlineExceeded:
+            raise self._timed_out(stats)
+        except Exception as exc:
+            stats.primary_errors += 1
+            logger.warning("%s primary %s failed: %s", self.node, self.primary_name, exc)
+            if self.fallback is None or time.monotonic() >= deadline:
+                raise
+        try:
+            result = self._call(self.fallback, self.fallback_name, CallControl(deadline), input, config, kwargs)
+        except DeadlineExceeded:
+            raise self._timed_out(stats)
+        stats.fallback_wins += 1
+        return result
+
+    def __getattr__(self, name):
+        # model_name, temperature, ... of the primary
+        if name == "primary":
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+
+class ModelRegistry:
+    def __init__(self, nodes=None, workers: int = HEDGE_WORKERS):
+        self.nodes = nodes if nodes is not None else load_node_models()
+        self.latencies = LatencyTracker()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-hedge")
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def node_stats(self, node) -> NodeStats:
+        with self._lock:
+            return self._stats.setdefault(node, NodeStats())
+
+    def model(self, node: str, temperature: float = 0):
+        """
+        Hedged primary/fallback pair for a node. Each model sits behind the exact-match response cache
+        on its own, so an answer is only ever stored and replayed under the model that produced it.
+        """
+        cfg = self.nodes[node]
+
+        def build(name):
+            model = scheduled(get_chat_model(name, temperature, timeout=cfg["timeout"]), cfg["priority"])
+            return cached(model, name, temperature=temperature)
+
+        return HedgedModel(
+            node, build(cfg["primary"]), build(cfg["fallback"]) if cfg.get("fallback") else None,
+            cfg["primary"], cfg.get("fallback"),
+            float(cfg["timeout"]), bool(cfg.get("hedge")), float(cfg.get("hedge_after", cfg["timeout"])), self,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {node: s.to_dict() for node, s in self._stats.items()}
+        for node, cfg in self.nodes.items():
+            entry = stats.setdefault(node, NodeStats().to_dict())
+            entry.update({"primary": cfg["primary"], "fallback": cfg.get("fallback"), "primary_p95": self.latencies.p95((node, cfg["primary"]))})
+        return stats
+
+
+model_registry = ModelRegistry()
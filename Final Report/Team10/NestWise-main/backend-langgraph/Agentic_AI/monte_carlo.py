@@ -0,0 +1,153 @@
+# backend_langgraph/Agentic_AI/monte_carlo.py
+import os
+import re
+import numpy as np
+
+MONTE_CARLO_PATHS = int(os.getenv("MONTE_CARLO_PATHS", "5000"))
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED", "42"))
+
+# Defaults for fields the profile usually does not have
+DEFAULT_RETIREMENT_AGE = 65
+DEFAULT_HORIZON_AGE = 95
+DEFAULT_SAVINGS_RATE = 0.10           # of salary, contributed every working year
+DEFAULT_REPLACEMENT_RATIO = 0.50      # of final salary, withdrawn every retirement year (today's dollars)
+DEFAULT_ALLOCATION = {"stocks": 60, "bonds": 30, "cash": 10, "other": 0}
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Annual nominal return assumptions per asset class, and inflation
+ASSET_CLASSES = ("stocks", "bonds", "cash", "other")
+RETURN_MEANS = np.array([0.095, 0.045, 0.030, 0.060])
+RETURN_VOLS = np.array([0.170, 0.060, 0.010, 0.110])
+RETURN_CORRELATION = np.array([
+    [1.00, 0.10, 0.00, 0.60],
+    [0.10, 1.00, 0.30, 0.20],
+    [0.00, 0.30, 1.00, 0.05],
+    [0.60, 0.20, 0.05, 1.00],
+])
+INFLATION_MEAN = 0.025
+INFLATION_VOL = 0.012
+# Worst single-year portfolio return; keeps cumulative growth strictly positive
+MIN_ANNUAL_RETURN = -0.95
+
+_RETURN_CHOLESKY = np.linalg.cholesky(RETURN_CORRELATION * np.outer(RETURN_VOLS, RETURN_VOLS))
+
+_AMOUNT = re.compile(r"(-?\d+(?:\.\d+)?)\s*(k|thousand|m|mm|million)?\b", re.IGNORECASE)
+_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mm": 1e6, "million": 1e6}
+
+
+def parse_amount(value, default=None):
+    """80000, "$80,000", "80k" or "1.2 million" -> float; default if nothing numeric is found."""
+    if isinstance(value, bool) or value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _AMOUNT.search(str(value).replace(",", ""))
+    if not match:
+        return default
+    return float(match.group(1)) * _MULTIPLIERS.get((match.group(2) or "").lower(), 1.0)
+
+
+def normalize_allocation(allocation) -> np.ndarray:
+    """Weights over ASSET_CLASSES from percentages or fractions; falls back to DEFAULT_ALLOCATION."""
+    allocation = allocation or DEFAULT_ALLOCATION
+    weights = np.array([max(parse_amount(allocation.get(name), 0.0), 0.0) for name in ASSET_CLASSES])
+    if weights.sum() <= 0:
+        return normalize_allocation(DEFAULT_ALLOCATION)
+    return weights / weights.sum()
+
+
+def simulate(
+    age,
+    salary,
+    savings,
+    allocation=None,
+    retirement_age=DEFAULT_RETIREMENT_AGE,
+    horizon_age=DEFAULT_HORIZON_AGE,
+    annual_contribution=None,
+    annual_spending=None,
+    paths: int = MONTE_CARLO_PATHS,
+    seed: int = MONTE_CARLO_SEED,
+) -> dict:
+    """
+    Monte Carlo projection of a retirement balance from age to horizon_age.
+    All paths x years are drawn in one call. Balances come from the closed form of
+    B[t+1] = B[t] * (1 + r[t]) + c[t] (cumulative products/sums instead of a per-year loop),
+    and a path is ruined from the first year its balance goes negative. Contributions and
+    spending are in today's dollars and grow with simulated inflation; reported balances are
+    deflated back to today's dollars.
+    """
+    age = int(age)
+    retirement_age = max(int(retirement_age), age)
+    horizon_age = max(int(horizon_age), retirement_age + 1)
+    years = horizon_age - age
+    working_years = retirement_age - age
+    salary = float(salary or 0.0)
+    if annual_contribution is None:
+        annual_contribution = salary * DEFAULT_SAVINGS_RATE
+    if annual_spending is None:
+        annual_spending = salary * DEFAULT_REPLACEMENT_RATIO
+    weights = normalize_allocation(allocation)
+
+    rng = np.random.default_rng(seed)
+    shocks = rng.standard_normal((paths, years, len(ASSET_CLASSES)))
+    asset_returns = RETURN_MEANS + shocks @ _RETURN_CHOLESKY.T
+    portfolio_returns = np.maximum(asset_returns @ weights, MIN_ANNUAL_RETURN)
+    inflation = INFLATION_MEAN + INFLATION_VOL * rng.standard_normal((paths, years))
+
+    # price_level[:, t] = prices at the start of year t relative to today
+    price_level = np.cumprod(np.concatenate([np.ones((paths, 1)), 1.0 + inflation], axis=1), axis=1)
+    flows = np.where(np.arange(years) < working_years, annual_contribution, -annual_spending)
+    cash_flows = flows * price_level[:, 1:]                   # at the end of each year
+
+    # growth[:, t] = prod of (1 + r) over years < t
+    growth = np.cumprod(np.concatenate([np.ones((paths, 1)), 1.0 + portfolio_returns], axis=1), axis=1)
+    discounted = np.cumsum(cash_flows / growth[:, 1:], axis=1)
+    balances = growth[:, 1:] * (float(savings or 0.0) + discounted)
+
+    ruined = np.maximum.accumulate(balances < 0, axis=1)
+    balances = np.where(ruined, 0.0, balances)
+    real_balances = balances / price_level[:, 1:]
+
+    bands = np.percentile(real_balances, PERCENTILES, axis=0)
+    at_retirement = real_balances[:, working_years - 1] if working_years > 0 else np.full(paths, float(savings or 0.0))
+    return {
+        "success_probability": round(float(1.0 - ruined[:, -1].mean()), 4),
+        "paths": paths,
+        "ages": list(range(age + 1, horizon_age + 1)),
+        "percentile_bands": {f"p{p}": [round(float(v), 2) for v in band] for p, band in zip(PERCENTILES, bands)},
+        "median_balance_at_retirement": round(float(np.median(at_retirement)), 2),
+        "assumptions": {
+            "retirement_age": retirement_age,
+            "horizon_age": horizon_age,
+            "annual_contribution": round(float(annual_contribution), 2),
+            "annual_spending": round(float(annual_spending), 2),
+            "allocation": {name: round(float(w), 4) for name, w in zip(ASSET_CLASSES, weights)},
+        },
+    }
+
+
+def simulate_profile(real_profile: dict, allocation=None, **overrides) -> dict:
+    """simulate() with age/salary/savings (and retirement_age when present) read from a real_profile."""
+    real_profile = real_profile or {}
+    params = {
+        "age": parse_amount(real_profile.get("age"), 40),
+        "salary": parse_amount(real_profile.get("salary"), 0.0),
+        "savings": parse_amount(real_profile.get("savings"), 0.0),
+        "retirement_age": parse_amount(real_profile.get("retirement_age"), DEFAULT_RETIREMENT_AGE),
+    }
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    return simulate(allocation=allocation, **params)
+
+
+def summarize(result: dict, every: int = 5) -> dict:
+    """Compact view of a simulate() result for a prompt: bands every `every` years plus the final age."""
+    ages = result["ages"]
+    keep = [i for i, a in enumerate(ages) if (a - ages[0]) % every == 0 or i == len(ages) - 1]
+    return {
+        "success_probability": result["success_probability"],
+        "median_balance_at_retirement": result["median_balance_at_retirement"],
+        "balance_bands_todays_dollars": {
+            str(ages[i]): {name: band[i] for name, band in result["percentile_bands"].items()} for i in keep
+        },
+        "assumptions": result["assumptions"],
+    }
@@ -0,0 +1,108 @@
+# backend_langgraph/Agentic_AI/plan_jobs.py
+import os
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# When enabled, /chatbot/answer returns a plan_job_id instead of generating the plan inline
+PLAN_JOBS_ENABLED = os.getenv("PLAN_JOBS_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+PLANNER_WORKERS = int(os.getenv("PLANNER_WORKERS", "4"))
+PLAN_JOB_TTL_SECONDS = float(os.getenv("PLAN_JOB_TTL_SECONDS", "3600"))
+
+# queued -> retrieving -> drafting -> formatting -> done (or failed at any point)
+STAGES = ("queued", "retrieving", "drafting", "formatting", "done", "failed")
+
+
+class PlanJob:
+    def __init__(self, job_id: str, session_id: str, owner: str | None = None):
+        self.job_id = job_id
+        self.session_id = session_id
+        self.owner = owner
+        self.stage = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.stage_started = {"queued": self.created_at}
+
+    @property
+    def finished(self) -> bool:
+        return self.stage in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        end = self.updated_at if self.finished else time.time()
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": "done" if self.stage == "done" else "failed" if self.stage == "failed" else "running",
+            "stage": self.stage,
+            "progress": STAGES.index(self.stage) / STAGES.index("done") if self.stage != "failed" else None,
+            "result": self.result,
+            "error": self.error,
+            "elapsed_seconds": round(end - self.created_at, 3),
+        }
+
+
+class PlanJobManager:
+    """Runs plan generation on a dedicated worker pool and keeps job status for polling."""
+
+    def __init__(self, workers: int = PLANNER_WORKERS, ttl_seconds: float = PLAN_JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="planner")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, session_id: str, fn, owner: str | None = None) -> str:
+        """fn(progress) generates the plan; progress(stage) moves the job to one of STAGES."""
+        self._expire()
+        job = PlanJob(uuid.uuid4().hex, session_id, owner)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job, fn)
+        return job.job_id
+
+    def status(self, job_id: str, owner: str | None = None):
+        """Snapshot of the job for polling, or None if unknown/expired or submitted for someone else."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job and job.owner == owner else None
+
+    def _set_stage(self, job: PlanJob, stage: str):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown plan job stage '{stage}'")
+        with self._lock:
+            job.stage = stage
+            job.updated_at = time.time()
+            job.stage_started[stage] = job.updated_at
+
+    def _run(self, job: PlanJob, fn):
+        try:
+            result = fn(lambda stage: self._set_stage(job, stage))
+            with self._lock:
+                job.result = result
+            self._set_stage(job, "done")
+        except Exception as exc:
+            logger.exception("Plan job %s failed", job.job_id)
+            with self._lock:
+                job.error = str(exc) or exc.__class__.__name__
+            self._set_stage(job, "failed")
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            for job_id in [j for j, job in self._jobs.items() if job.finished and job.updated_at < cutoff]:
+                del self._jobs[job_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.stage] = counts.get(job.stage, 0) + 1
+            return {"jobs": len(self._jobs), "by_stage": counts}
+
+
+plan_jobs = PlanJobManager()
@@ -0,0 +1,121 @@
+# backend_langgraph/Agentic_AI/prefetch.py
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Start retrieval once the weighted profile completeness crosses this ratio and a template is matched
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+PREFETCH_COMPLETENESS_THRESHOLD = float(os.getenv("PREFETCH_COMPLETENESS_THRESHOLD", "0.8"))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+PREFETCH_WAIT_SECONDS = 10.0
+PREFETCH_K = 3
+
+# (query, topic) pairs the planner typically needs for each prompt_infos template
+TEMPLATE_QUERIES = {
+    "spend": [
+        ("Safe withdrawal rates and how long retirement savings last when spending down", "withdrawals"),
+        ("Taxes owed on 401(k) and IRA withdrawals in retirement", "taxes"),
+        ("Annual 401(k) and IRA contribution limits and catch-up contributions", "contribution_limits"),
+    ],
+    "leave": [
+        ("Passing retirement accounts to beneficiaries and inheritance rules", "withdrawals"),
+        ("Tax treatment of inherited retirement accounts and Roth conversions", "taxes"),
+        ("Long-term investing and asset allocation to grow wealth", "investing"),
+    ],
+    "save": [
+        ("Conservative asset allocation and diversification for retirement", "investing"),
+        ("Required minimum distributions and withdrawal rules", "withdrawals"),
+        ("Annual 401(k) and IRA contribution limits and catch-up contributions", "contribution_limits"),
+    ],
+    "donate": [
+        ("Charitable giving from retirement accounts and tax deductions", "taxes"),
+        ("Withdrawal rules and required minimum distributions for retirement accounts", "withdrawals"),
+        ("Annual 401(k) and IRA contribution limits", "contribution_limits"),
+    ],
+    "default": [
+        ("Annual 401(k) and IRA contribution limits and catch-up contributions", "contribution_limits"),
+        ("Taxes in retirement and tax-advantaged accounts", "taxes"),
+        ("Early withdrawal penalties and withdrawal rules", "withdrawals"),
+    ],
+}
+EARLY_CAREER_QUERY = ("Saving for retirement in your 20s and 30s and the power of compounding", "early_career")
+EMPLOYER_MATCH_QUERY = ("Employer 401(k) matching contributions and vesting", "employer_match")
+
+
+def profile_age(real_profile: dict):
+    try:
+        return int(float(str(real_profile.get("age", "")).strip().split()[0]))
+    except (ValueError, IndexError):
+        return None
+
+
+def planner_queries(template: str, real_profile: dict) -> list[tuple[str, str]]:
+    """Likely retrieval queries for a profile: the template's fixed set plus age/salary-driven ones."""
+    queries = list(TEMPLATE_QUERIES.get(template, TEMPLATE_QUERIES["default"]))
+    age = profile_age(real_profile or {})
+    if age is not None and age < 40:
+        queries.append(EARLY_CAREER_QUERY)
+    if (real_profile or {}).get("salary"):
+        queries.append(EMPLOYER_MATCH_QUERY)
+    return queries
+
+
+class RetrievalPrefetcher:
+    """
+    Runs the likely planner queries in the background as a profile nears completion and
+    keeps the (query, Document) results per session until the planner takes them.
+    """
+
+    def __init__(self, search, workers: int = PREFETCH_WORKERS, threshold: float = PREFETCH_COMPLETENESS_THRESHOLD):
+        self.search = search                # search(query, k, topic) -> [(Document, score)]
+        self.threshold = threshold
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._pending = {}                  # session_id -> (template, Future)
+        self._lock = threading.Lock()
+
+    def _retrieve(self, template, real_profile):
+        query_docs, seen = [], set()
+        for query, topic in planner_queries(template, real_profile):
+            for doc, _score in self.search(query, k=PREFETCH_K, topic=topic):
+                if doc.id not in seen:
+                    seen.add(doc.id)
+                    query_docs.append((query, doc))
+        print(f"Prefetched {len(query_docs)} chunks for template '{template}'")
+        return query_docs
+
+    def maybe_start(self, session_id, template, real_profile, completeness) -> bool:
+        if not PREFETCH_ENABLED or not session_id or not template or completeness < self.threshold:
+            return False
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is not None and pending[0] == template:
+                return False
+            future = self._executor.submit(self._retrieve, template, dict(real_profile or {}))
+            self._pending[session_id] = (template, future)
+        return True
+
+    def take(self, session_id, template, timeout: float = PREFETCH_WAIT_SECONDS):
+        """Prefetched query_docs for this session/template, or None if nothing usable was prefetched."""
+        with self._lock:
+            pending = self._pending.pop(session_id, None)
+        if pending is None or pending[0] != template:
+            return None
+        try:
+            return pending[1].result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+        except Exception:
+            logger.exception("Retrieval prefetch failed for session %s", session_id)
+            return None
+
+    def discard(self, session_id):
+        with self._lock:
+            pending = self._pending.pop(session_id, None)
+        if pending is not None:
+            pending[1].cancel()
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,69 @@
+# backend_langgraph/Agentic_AI/profile_prefill.py
+import os
+import httpx
+
+# Transaction summary from backend-userFinancedata, used to suggest salary and add spending context before the first turn.
+# Disabled when USERFIN_SERVICE_URL is empty; any failure just leaves the profile empty.
+USERFIN_SERVICE_URL = os.getenv("USERFIN_SERVICE_URL", "").strip()
+PROFILE_PREFILL_TIMEOUT = float(os.getenv("PROFILE_PREFILL_TIMEOUT", "2"))
+TOP_CATEGORIES = 3
+
+_http = None
+
+
+def _client() -> httpx.Client:
+    global _http
+    if _http is None:
+        _http = httpx.Client(base_url=USERFIN_SERVICE_URL.rstrip("/"), timeout=httpx.Timeout(PROFILE_PREFILL_TIMEOUT))
+    return _http
+
+
+def fetch_summary(user_email: str):
+    """SummaryOut for the user ({monthly_income, monthly_expenses, savings_rate, categories}), or None."""
+    if not USERFIN_SERVICE_URL or not user_email:
+        return None
+    try:
+        response = _client().get("/summary/", params={"user_id": user_email})
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Profile prefill skipped for {user_email}: {e}")
+        return None
+
+
+def profile_from_summary(summary: dict) -> tuple[dict, dict]:
+    """
+    (suggestions, context) derived from the transaction summary. Suggestions are estimates for
+    shadow_profile fields (salary) that the chatbot offers for the user to confirm; context is
+    planner-only detail (monthly_expenses, monthly_savings, top spending categories). Savings from
+    transactions are a monthly flow, never the current savings balance.
+    """
+    months = int(summary.get("months_covered") or 0)
+    income = float(summary.get("monthly_income") or 0)
+    expenses = float(summary.get("monthly_expenses") or 0)
+    if months <= 0 or income <= 0:
+        # Older summaries were totals over all transactions, not monthly figures
+        return {}, {}
+
+    suggestions = {"salary": f"about ${income * 12:,.0f} per year (estimated from {months} months of linked transactions)"}
+    context = {"monthly_expenses": f"${expenses:,.0f} per month"}
+    saved = income - expenses
+    if saved > 0:
+        context["monthly_savings"] = f"${saved:,.0f} per month ({saved / income:.0%} of income)"
+
+    spending = sorted(((cat, -total / months) for cat, total in (summary.get("categories") or {}).items() if total < 0), key=lambda c: -c[1])
+    if spending:
+        context["top_spending_categories"] = ", ".join(f"{cat} ${total:,.0f}/month" for cat, total in spending[:TOP_CATEGORIES])
+    return suggestions, context
+
+
+def prefill_profile(user_email: str, real_profile: dict) -> dict:
+    """Add planner context from the user's summary to real_profile; returns suggestions for the chatbot to confirm."""
+    summary = fetch_summary(user_email)
+    if not summary:
+        return {}
+    suggestions, context = profile_from_summary(summary)
+    real_profile.update(context)
+    if suggestions:
+        print(f"Suggesting {', '.join(suggestions)} from transaction summary")
+    return suggestions
@@ -0,0 +1,108 @@
+# backend_langgraph/Agentic_AI/rag_client.py
+import os
+import time
+import httpx
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+# When set, retrieval goes to the backend-RAG service instead of an index loaded in this process
+RAG_SERVICE_URL = os.getenv("RAG_SERVICE_URL", "").strip()
+# Service credential for backend-RAG (same value as its RAG_SERVICE_TOKEN); lets searches name the user's namespace
+RAG_SERVICE_TOKEN = os.getenv("RAG_SERVICE_TOKEN", "").strip()
+RAG_SERVICE_TIMEOUT = float(os.getenv("RAG_SERVICE_TIMEOUT", "30"))
+RAG_POOL_MAX_CONNECTIONS = int(os.getenv("RAG_POOL_MAX_CONNECTIONS", "50"))
+RAG_POOL_MAX_KEEPALIVE = int(os.getenv("RAG_POOL_MAX_KEEPALIVE", "20"))
+RAG_CONNECT_RETRIES = 2
+# On a fresh `compose up` the retrieval service may still be building its index; wait this long for it
+RAG_STARTUP_TIMEOUT = float(os.getenv("RAG_STARTUP_TIMEOUT", "300"))
+RAG_STARTUP_POLL_SECONDS = 5
+
+
+def _to_results(hits) -> list[tuple[Document, float]]:
+    return [(Document(id=h.get("id"), page_content=h["page_content"], metadata=h.get("metadata") or {}), h["score"]) for h in hits]
+
+
+class RemoteEmbeddings(Embeddings):
+    """Embeddings computed by the retrieval service, so query vectors always match its index."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        return self.client.post("/embed", {"texts": list(texts)})["vectors"]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+class RemoteChunkIndex:
+    """
+    Thin pooled HTTP client for backend-RAG with the same search interface as ChunkIndex.
+    Documents returned by searches are remembered in by_id (cached template context refers to them by id).
+    """
+
+    def __init__(self, base_url: str = RAG_SERVICE_URL):
+        self._http = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {RAG_SERVICE_TOKEN}"} if RAG_SERVICE_TOKEN else None,
+            timeout=httpx.Timeout(RAG_SERVICE_TIMEOUT),
+            limits=httpx.Limits(max_connections=RAG_POOL_MAX_CONNECTIONS, max_keepalive_connections=RAG_POOL_MAX_KEEPALIVE),
+            transport=httpx.HTTPTransport(retries=RAG_CONNECT_RETRIES),
+        )
+        self.embeddings = RemoteEmbeddings(self)
+        self.by_id = {}
+        self.info = self._wait_for_index(base_url)
+        self.fingerprint = self.info.get("fingerprint")
+        print(f"Using retrieval service at {base_url} ({self.info.get('chunks')} chunks)")
+
+    def _wait_for_index(self, base_url: str) -> dict:
+        deadline = time.monotonic() + RAG_STARTUP_TIMEOUT
+        while True:
+            try:
+                return self.get("/index")
+            except httpx.HTTPError as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (401, 403):
+                    # Not a startup race: /index needs the service credential
+                    raise RuntimeError(
+                        f"Retrieval service at {base_url} rejected this service; set RAG_SERVICE_TOKEN to its RAG_SERVICE_TOKEN"
+                    ) from e
+                if time.monotonic() > deadline:
+                    raise
+                print(f"Retrieval service at {base_url} not ready ({e.__class__.__name__}), retrying")
+                time.sleep(RAG_STARTUP_POLL_SECONDS)
+
+    def get(self, path: str) -> dict:
+        response = self._http.get(path)
+        response.raise_for_status()
+        return response.json()
+
+    def post(self, path: str, payload: dict) -> dict:
+        response = self._http.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def __len__(self):
+        return self.info.get("chunks", 0)
+
+    def topic_counts(self) -> dict:
+        return self.info.get("topics", {})
+
+    def _remember(self, results):
+        for doc, _score in results:
+            if doc.id:
+                self.by_id[doc.id] = doc
+        return results
+
+    def search(self, query: str, k: int = 3, topic=None, namespace=None, include_shared: bool = True) -> list[tuple[Document, float]]:
+        """namespace adds that user's uploaded documents; include_shared=False searches only them."""
+        data = self.post("/search", {"query": query, "k": k, "topic": topic, "namespace": namespace, "include_shared": include_shared})
+        return self._remember(_to_results(data["results"]))
+
+    def search_batch(self, queries: list[str], k: int = 3, topics=None, namespace=None) -> list[list[tuple[Document, float]]]:
+        if not queries:
+            return []
+        topics = list(topics) if topics is not None else [None] * len(queries)
+        data = self.post("/search/batch", {"queries": [{"query": q, "k": k, "topic": t, "namespace": namespace} for q, t in zip(queries, topics)]})
+        return [self._remember(_to_results(hits)) for hits in data["results"]]
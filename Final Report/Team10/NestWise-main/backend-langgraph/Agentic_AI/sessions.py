@@ -0,0 +1,76 @@
+# backend_langgraph/Agentic_AI/sessions.py
+import os
+import time
+import threading
+
+# Idle sessions are dropped after SESSION_TTL_SECONDS; beyond SESSION_MAX the least recently used go first
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+SESSION_MAX = int(os.getenv("SESSION_MAX", "10000"))
+
+
+class Session:
+    """One conversation: its MasterState plus the last assistant message shown to the user."""
+
+    __slots__ = ("session_id", "state", "prev_assistant_message", "lock", "last_used")
+
+    def __init__(self, session_id: str, state):
+        self.session_id = session_id
+        self.state = state
+        self.prev_assistant_message = None
+        # Turns of the same session run one at a time
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    def __init__(self, ttl_seconds: float = SESSION_TTL_SECONDS, max_sessions: int = SESSION_MAX):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._lock = threading.Lock()
+        # on_evict(session_id) for every session that expires or is discarded, so per-session
+        # state kept elsewhere (prefetched retrieval) goes with it
+        self.on_evict = []
+
+    def put(self, session_id: str, state) -> Session:
+        session = Session(session_id, state)
+        with self._lock:
+            self._sessions[session_id] = session
+            expired = self._expire()
+        self._evicted(expired)
+        return session
+
+    def get(self, session_id: str):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+            return session
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        self._evicted([session_id])
+
+    def _expire(self) -> list:
+        now = time.monotonic()
+        expired = [s for s, session in self._sessions.items() if now - session.last_used > self.ttl_seconds]
+        for session_id in expired:
+            del self._sessions[session_id]
+        if len(self._sessions) > self.max_sessions:
+            by_age = sorted(self._sessions.values(), key=lambda session: session.last_used)
+            for session in by_age[:len(self._sessions) - self.max_sessions]:
+                del self._sessions[session.session_id]
+                expired.append(session.session_id)
+        return expired
+
+    def _evicted(self, session_ids):
+        for session_id in session_ids:
+            for callback in self.on_evict:
+                callback(session_id)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+sessions = SessionStore()
@@ -0,0 +1,110 @@
+# backend_langgraph/Agentic_AI/template_context.py
+import os
+import json
+
+from Agentic_AI.prefetch import TEMPLATE_QUERIES, PREFETCH_K, planner_queries, profile_age
+
+# When disabled the planner falls back to LLM-planned retrieval for every plan
+TEMPLATE_CONTEXT_ENABLED = os.getenv("TEMPLATE_CONTEXT_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+TEMPLATE_CONTEXT_FILE = "template_context.json"
+
+# Age band -> representative age used to pick the band's queries
+AGE_BANDS = {"under_40": 30, "40_to_59": 50, "60_plus": 65}
+
+
+def age_band(age) -> str:
+    if age is None or age < 40:
+        return "under_40"
+    if age < 60:
+        return "40_to_59"
+    return "60_plus"
+
+
+def profile_query(real_profile: dict):
+    """One retrieval query built from the profile's own details, or None if there is nothing specific."""
+    parts = []
+    goal = (real_profile or {}).get("goal")
+    if goal:
+        parts.append(f"Retirement goal: {goal}.")
+    age = profile_age(real_profile or {})
+    if age is not None:
+        parts.append(f"Age {age}.")
+    for field in ("location", "salary", "savings", "retirement_age", "risk_tolerance"):
+        value = (real_profile or {}).get(field)
+        if value and not isinstance(value, bool):
+            parts.append(f"{field.replace('_', ' ')}: {value}.")
+    return " ".join(parts) or None
+
+
+class TemplateContextCache:
+    """
+    Top chunks for every prompt_infos template and age band, computed once per index build
+    and persisted next to the index, so most plans need no live retrieval at all.
+    """
+
+    def __init__(self, chunk_index, entries=None):
+        self.chunk_index = chunk_index
+        self.entries = entries or {}        # "template|band" -> [(query, doc_id)]
+
+    @staticmethod
+    def _key(template, band):
+        return f"{template}|{band}"
+
+    @classmethod
+    def build(cls, chunk_index, k: int = PREFETCH_K):
+        entries = {}
+        for template in TEMPLATE_QUERIES:
+            for band, representative_age in AGE_BANDS.items():
+                profile = {"age": representative_age, "salary": True}
+                seen, pairs = set(), []
+                queries = planner_queries(template, profile)
+                results = chunk_index.search_batch([q for q, _ in queries], k=k, topics=[t for _, t in queries])
+                for (query, _topic), hits in zip(queries, results):
+                    for doc, _score in hits:
+                        if doc.id not in seen:
+                            seen.add(doc.id)
+                            pairs.append((query, doc.id))
+                entries[cls._key(template, band)] = pairs
+        return cls(chunk_index, entries)
+
+    @classmethod
+    def load_or_build(cls, chunk_index, index_dir: str, fingerprint):
+        path = os.path.join(index_dir, TEMPLATE_CONTEXT_FILE)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if fingerprint and data.get("fingerprint") == fingerprint:
+                entries = {key: [tuple(pair) for pair in pairs] for key, pairs in data["entries"].items()}
+                if all(doc_id in chunk_index.by_id for pairs in entries.values() for _, doc_id in pairs):
+                    print(f"Loaded template context cache from {path}")
+                    return cls(chunk_index, entries)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        cache = cls.build(chunk_index)
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"fingerprint": fingerprint, "entries": cache.entries}, f)
+        except OSError as e:
+            print(f"Failed to persist template context cache: {e}")
+        print(f"Built template context cache for {len(cache.entries)} template/age-band pairs")
+        return cache
+
+    def get(self, template, real_profile) -> list:
+        """Cached (query, Document) pairs for the profile's template and age band."""
+        band = age_band(profile_age(real_profile or {}))
+        pairs = self.entries.get(self._key(template, band)) or self.entries.get(self._key("default", band), [])
+        return [(query, self.chunk_index.by_id[doc_id]) for query, doc_id in pairs if doc_id in self.chunk_index.by_id]
+
+    def context_for(self, template, real_profile, k: int = PREFETCH_K) -> list:
+        """Cached template context merged with at most one live, profile-specific query."""
+        query_docs = self.get(template, real_profile)
+        query = profile_query(real_profile)
+        if query:
+            seen = {doc.id for _, doc in query_docs}
+            for doc, _score in self.chunk_index.search(query, k=k):
+                if doc.id not in seen:
+                    seen.add(doc.id)
+                    query_docs.append((query, doc))
+        return query_docs
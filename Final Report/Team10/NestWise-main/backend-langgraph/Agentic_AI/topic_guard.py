@@ -0,0 +1,166 @@
+# backend_langgraph/Agentic_AI/topic_guard.py
+import os
+import re
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+from Agentic_AI.faq import looks_like_question
+
+# Off-topic / abusive messages get a canned redirect instead of running the agent graph
+TOPIC_GUARD_ENABLED = os.getenv("TOPIC_GUARD_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+OFF_TOPIC_THRESHOLD = float(os.getenv("OFF_TOPIC_THRESHOLD", "0.75"))
+
+OFF_TOPIC_REPLY = (
+    "I can only help with retirement and personal finance, but I'd be happy to help you plan your retirement "
+    "or estimate your savings instead."
+)
+ABUSIVE_REPLY = (
+    "Let's keep things respectful. I'm here to help you plan for retirement whenever you're ready."
+)
+
+# Slurs and threats are abusive whatever else the message says
+ABUSIVE_PATTERN = re.compile(r"\b(cunt|retard\w*|kill yourself|kys)\b", re.IGNORECASE)
+# Swearing and insults only count as abuse without finance context: "am I an idiot for not saving?" is a question
+INSULT_PATTERN = re.compile(
+    r"\b(fuck\w*|shit\w*|bitch\w*|asshole|bastard|dickhead|idiot|moron|stupid bot|you suck)\b",
+    re.IGNORECASE,
+)
+# Any of these keeps the message on-topic regardless of the classifier
+FINANCE_PATTERN = re.compile(
+    r"(401\s*\(?k\)?|403\s*\(?b\)?|\bira\b|\broth\b|\bretire\w*|\bpension\b|\bsocial security\b|\bsav(e|es|ing|ings)\b"
+    r"|\binvest\w*|\bstock|\bbond|\bfund|\bportfolio|\btax\w*|\bincome\b|\bsalary\b|\bbudget\w*|\bdebt\b|\bloan\b"
+    r"|\bmortgage\b|\bmoney\b|\bdollars?\b|\$\s?\d|\bexpenses?\b|\bspend\w*|\bwithdraw\w*|\brmd\b|\bannuit\w*"
+    r"|\bmedicare\b|\binsurance\b|\bcontribut\w*|\bemployer\b|\bmatch\b|\binflation\b|\binterest\b|\bestate\b"
+    r"|\bdonat\w*|\bcharit\w*|\binherit\w*|\bbeneficiar\w*|\bfinanc\w*|\bafford\b|\bnest ?egg\b)",
+    re.IGNORECASE,
+)
+# Clearly unrelated subjects; only consulted for questions/requests without any finance keyword
+OFF_TOPIC_PATTERN = re.compile(
+    r"\b(recipes?|cook\w*|bake|baking|dinner|lunch|breakfast|pancakes?|pasta|movies?|films?|netflix|tv show|actors?"
+    r"|weather|rain\w*|snow\w*|forecast|super bowl|nba|nfl|football|soccer|basketball|baseball|scores?|jokes?|poems?"
+    r"|haiku|song|lyrics|homework|capital of|video games?|weight loss|lose weight|diet|symptoms?|election|politic\w*"
+    r"|dogs?|cats?|pets?|garden\w*|celebrit\w*|horoscope|zodiac)\b",
+    re.IGNORECASE,
+)
+_REQUEST_START = re.compile(r"^(please\s+)?(give me|write|recommend|suggest|show me|find|play|translate|help me)\b", re.IGNORECASE)
+
+# Labeled examples for the linear model: 1 = off-topic, 0 = retirement / personal finance conversation
+TRAINING_EXAMPLES = [
+    ("What's a good recipe for lasagna?", 1),
+    ("How do I bake chocolate chip cookies?", 1),
+    ("Can you give me a recipe for dinner tonight?", 1),
+    ("What should I cook for my kids?", 1),
+    ("Recommend a good movie to watch", 1),
+    ("Who won the Oscar for best picture?", 1),
+    ("What's the best Netflix series right now?", 1),
+    ("Who is your favorite actor?", 1),
+    ("What is the weather like tomorrow?", 1),
+    ("Will it rain this weekend?", 1),
+    ("Who won the game last night?", 1),
+    ("What are the NBA playoff scores?", 1),
+    ("Tell me a joke", 1),
+    ("Write me a poem about the ocean", 1),
+    ("Write a song about love", 1),
+    ("Can you help me with my math homework?", 1),
+    ("What is the capital of France?", 1),
+    ("How tall is Mount Everest?", 1),
+    ("Translate hello into Spanish", 1),
+    ("How do I fix my car engine?", 1),
+    ("How do I reset my iPhone?", 1),
+    ("Write Python code to sort a list", 1),
+    ("What's the best video game this year?", 1),
+    ("How do I lose weight fast?", 1),
+    ("What are the symptoms of the flu?", 1),
+    ("Who will win the election?", 1),
+    ("What do you think about politics?", 1),
+    ("How do I train my dog to sit?", 1),
+    ("What is the meaning of life?", 1),
+    ("Can you play some music?", 1),
+    ("What time is it in Tokyo?", 1),
+    ("How do I grow tomatoes in my garden?", 1),
+    ("Which restaurant near me is open?", 1),
+    ("Are you a human or a robot?", 1),
+    ("What's your favorite color?", 1),
+    ("What is a 401(k)?", 0),
+    ("Should I choose a Roth or traditional IRA?", 0),
+    ("How much should I save for retirement?", 0),
+    ("When can I retire?", 0),
+    ("Can I retire at 55?", 0),
+    ("How does Social Security work?", 0),
+    ("What happens to my pension if I change jobs?", 0),
+    ("How much can I withdraw each year?", 0),
+    ("What are the contribution limits this year?", 0),
+    ("Is my employer match free money?", 0),
+    ("How should I invest my savings?", 0),
+    ("What is a good asset allocation at my age?", 0),
+    ("How are withdrawals taxed?", 0),
+    ("Will I have enough to travel when I retire?", 0),
+    ("How much do I need to buy a boat in retirement?", 0),
+    ("Can I afford a vacation home?", 0),
+    ("How do I leave money to my children?", 0),
+    ("How can I donate to charity from my IRA?", 0),
+    ("What should my monthly budget be?", 0),
+    ("Should I pay off my mortgage before retiring?", 0),
+    ("How does inflation affect my plan?", 0),
+    ("What is an annuity?", 0),
+    ("How much does healthcare cost after retirement?", 0),
+    ("Can you make me a retirement plan?", 0),
+    ("What do I need to tell you next?", 0),
+    ("Why do you need my age?", 0),
+    ("What does this plan mean?", 0),
+    ("Can you explain the plan again?", 0),
+    ("How long will my money last?", 0),
+    ("What is my retirement goal?", 0),
+    ("I want to travel the world", 0),
+    ("I want to retire early", 0),
+    ("I want to leave something for my grandkids", 0),
+    ("I make 80000 a year", 0),
+    ("I live in Ohio", 0),
+]
+
+
+def _train():
+    texts, labels = zip(*TRAINING_EXAMPLES)
+    model = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+        LogisticRegression(C=4.0, class_weight="balanced", max_iter=1000),
+    )
+    model.fit(texts, labels)
+    return model
+
+
+_model = _train()
+
+
+def classify(message: str):
+    """Returns "abusive", "off_topic" or None (let the agent handle it)."""
+    text = (message or "").strip()
+    if not text:
+        return None
+    if ABUSIVE_PATTERN.search(text):
+        return "abusive"
+    if FINANCE_PATTERN.search(text):
+        return None
+    if INSULT_PATTERN.search(text):
+        return "abusive"
+    # Profile answers ("30", "Ohio", "a boat") are never questions or requests, so leave them to the extractor
+    if not (looks_like_question(text) or _REQUEST_START.match(text)):
+        return None
+    if OFF_TOPIC_PATTERN.search(text):
+        return "off_topic"
+    if _model.predict_proba([text])[0][1] >= OFF_TOPIC_THRESHOLD:
+        return "off_topic"
+    return None
+
+
+def guard_reply(message: str):
+    """Canned reply for off-topic/abusive input, or None if the message should go to the agent graph."""
+    if not TOPIC_GUARD_ENABLED:
+        return None
+    label = classify(message)
+    if label == "abusive":
+        return ABUSIVE_REPLY
+    if label == "off_topic":
+        return OFF_TOPIC_REPLY
+    return None
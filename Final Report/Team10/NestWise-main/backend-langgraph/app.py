@@ -1,7 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from auth import verify_admin
 from routers.chatBot import chatRouter
 from routers.textizer import textizer_router       
+from routers.evaluation import evalRouter
+from routers.documents import documentsRouter
+from Agentic_AI.llm_scheduler import llm_scheduler
+from Agentic_AI.model_registry import model_registry
+from Agentic_AI.llm_cache import llm_cache
+from Agentic_AI.batch_eval import EVAL_API_ENABLED
+from controllers import rate_limit
 import os
 
 
@@ -19,7 +28,25 @@ app.add_middleware(
 async def home():
     return {"message": "LangGraph backend running"}
 
+# Metrics are for operators: same admin accounts as the /eval API
+@app.get("/metrics/llm")
+async def llm_metrics(user_email: str = Depends(verify_admin)):
+    # Outbound LLM scheduler: concurrency limit, queue depth per priority, waits, 429s;
+    # per-node models: hedged calls, fallback wins, primary p95; response cache hit rate
+    # (cache stats wait on the cache lock, which SQLite reads and writes hold, so they run in the threadpool)
+    cache = await run_in_threadpool(llm_cache.stats)
+    return {**llm_scheduler.stats(), "nodes": model_registry.stats(), "cache": cache}
+
+
+@app.get("/metrics/rate-limit")
+async def rate_limit_metrics(user_email: str = Depends(verify_admin)):
+    # Per-user limits on /chatbot/start and /chatbot/answer, and how many requests got a 429
+    return rate_limit.stats()
+
 
 # Routers
 app.include_router(chatRouter, prefix="/chatbot", tags=["chatBot"])
-app.include_router(textizer_router, prefix="/textizer", tags=["textizer"])  
+app.include_router(textizer_router, prefix="/textizer", tags=["textizer"])
+if EVAL_API_ENABLED:
+    app.include_router(evalRouter, prefix="/eval", tags=["evaluation"])
+app.include_router(documentsRouter, prefix="/documents", tags=["documents"])
@@ -5,6 +5,8 @@ import os
 
 SECRET_KEY = os.getenv("AUTH_JWT_SECRET")
 ALGORITHM = os.getenv("AUTH_JWT_ALGORITHM")
+# Accounts allowed on the operator endpoints (/eval runs, /metrics)
+ADMIN_EMAILS = {e.strip().lower() for e in os.getenv("EVAL_ADMIN_EMAILS", "").split(",") if e.strip()}
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -16,4 +18,9 @@ def verify_access_token(token: str = Depends(oauth2_scheme)):
             raise HTTPException(status_code=401, detail="Invalid token")
         return email
     except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+def verify_admin(user_email: str = Depends(verify_access_token)):
+    if user_email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Limited to admins")
+    return user_email
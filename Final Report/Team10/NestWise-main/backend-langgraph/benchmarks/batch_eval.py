@@ -0,0 +1,47 @@
+# backend_langgraph/benchmarks/batch_eval.py
+# Run from backend-langgraph:
+#   python -m benchmarks.batch_eval benchmarks/eval_conversations.json
+#   python -m benchmarks.batch_eval my_suite.jsonl --parallel 16 --output benchmarks/results/prompt-v2
+# Each conversation gets its own session. Writes results.jsonl (transcript, per-turn timings, final profile
+# and plan per conversation) and summary.json into the output directory.
+import os
+import json
+import argparse
+
+from Agentic_AI.batch_eval import EVAL_PARALLELISM, load_conversations, run_batch
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def write_report(report: dict, output_dir: str):
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "results.jsonl"), "w") as f:
+        for result in report["results"]:
+            f.write(json.dumps(result) + "\n")
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump({"run_id": report["run_id"], **report["summary"]}, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted conversations through chat_step")
+    parser.add_argument("conversations", help="JSON or JSONL file of {id, messages}")
+    parser.add_argument("--parallel", type=int, default=EVAL_PARALLELISM)
+    parser.add_argument("--output", default=None, help="Directory for results.jsonl and summary.json")
+    args = parser.parse_args()
+
+    conversations = load_conversations(args.conversations)
+    print(f"Running {len(conversations)} conversations, {args.parallel} at a time")
+    report = run_batch(
+        conversations,
+        args.parallel,
+        on_result=lambda r: print(f"  {r['id']}: {len(r['turns'])} turns in {r['seconds']}s" + (f"  ERROR {r['error']}" if r["error"] else "")),
+    )
+
+    output_dir = args.output or os.path.join(RESULTS_DIR, f"eval-{report['run_id']}")
+    write_report(report, output_dir)
+    print(json.dumps(report["summary"], indent=2))
+    print(f"Wrote {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend_langgraph/benchmarks/faq_bench.py
+# Run from backend-langgraph: python -m benchmarks.faq_bench [--threshold 0.9]
+# Uses the same index as the chat service (RAG_SERVICE_URL, or the local index with EMBEDDING_BACKEND)
+import argparse
+import numpy as np
+
+from Agentic_AI.faq import FAQIndex, is_generic_question
+from Agentic_AI.local_index import load_local_index, RAG_INDEX_DIR
+from Agentic_AI.rag_client import RemoteChunkIndex, RAG_SERVICE_URL
+
+# (incoming question, canonical question it should be answered with, or None when no FAQ answer fits).
+# Near-misses are generic questions close to an entry that its answer does not actually answer
+LABELED = [
+    ("What's a 401k?", "What is a 401(k)?"),
+    ("How do 401(k) plans work?", "What is a 401(k)?"),
+    ("What is an individual retirement account?", "What is an IRA?"),
+    ("Roth or traditional 401k?", "What is the difference between Roth and traditional retirement accounts?"),
+    ("Should you pick Roth or traditional?", "What is the difference between Roth and traditional retirement accounts?"),
+    ("What is the maximum 401k contribution?", "How much can you contribute to a 401(k) in 2025?"),
+    ("How much can you put in a Roth 401k?", "How much can you contribute to a 401(k) in 2025?"),
+    ("How do catch-up contributions work?", "What are catch-up contributions?"),
+    ("How does a company 401k match work?", "What is an employer 401(k) match?"),
+    ("What is vesting?", "What is vesting in a 401(k)?"),
+    ("What does vesting mean for a 401k?", "What is vesting in a 401(k)?"),
+    ("When do required minimum distributions start?", "What are required minimum distributions?"),
+    ("What is the penalty for withdrawing early from a 401k?", "What is the penalty for early withdrawal from a 401(k) or IRA?"),
+    ("Are IRA withdrawals taxed?", "How are retirement account withdrawals taxed?"),
+    ("Why should you start saving for retirement early?", "Why start saving for retirement early?"),
+    ("How should you diversify retirement investments?", "How should retirement savings be invested?"),
+    # Near-misses
+    ("How much can you put in a Roth IRA?", None),
+    ("What is a Roth IRA?", None),
+    ("What is a 403(b)?", None),
+    ("Can you roll over a 401k to an IRA?", None),
+    ("Can you borrow from a 401k?", None),
+    ("What is a hardship withdrawal?", None),
+    ("How is Social Security taxed?", None),
+    ("What is the 4% rule?", None),
+    ("What fees do 401k plans charge?", None),
+    ("What is automatic enrollment?", None),
+    ("How do you name a beneficiary?", None),
+    ("What is a pension?", None),
+    ("What is an annuity?", None),
+    ("How does inflation affect retirement savings?", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score FAQ matching on labeled matches and near-misses")
+    parser.add_argument("--threshold", type=float, default=None, help="threshold to report (default: the backend's)")
+    args = parser.parse_args()
+
+    if RAG_SERVICE_URL:
+        chunk_index = RemoteChunkIndex(RAG_SERVICE_URL)
+        fingerprint, backend = chunk_index.fingerprint, chunk_index.info.get("backend")
+    else:
+        chunk_index, fingerprint = load_local_index()
+        backend = None
+    index = FAQIndex.load_or_build(chunk_index, RAG_INDEX_DIR, fingerprint, backend=backend)
+    threshold = index.threshold if args.threshold is None else args.threshold
+
+    rows = []
+    for question, expected in LABELED:
+        if not is_generic_question(question):
+            print(f"Not treated as a generic question, fix the label: {question}")
+            continue
+        best = index.best_match(question)
+        entry, score = best if best else (None, float("-inf"))
+        rows.append((question, expected, entry["question"] if entry else None, score))
+
+    for question, expected, got, score in rows:
+        served = got if score >= threshold else None
+        mark = "ok " if served == expected else "BAD"
+        print(f"{mark} {score:5.2f}  {question}  ->  {served}" + ("" if served else f"  (nearest: {got})"))
+
+    # A wrong answer costs more than a miss (a miss just goes to the chatbot), so the suggested threshold is
+    # the lowest one that serves no wrong answer on the labeled set
+    def served_counts(t):
+        right = sum(score >= t and got == expected for _q, expected, got, score in rows if expected)
+        wrong = sum(score >= t and got != expected for _q, expected, got, score in rows)
+        return right, wrong
+    wrong_scores = [score for _q, expected, got, score in rows if got != expected and np.isfinite(score)]
+    lowest_safe = max(wrong_scores) + 0.001 if wrong_scores else 0.0
+    matches = sum(1 for _q, expected, *_ in rows if expected)
+    for label, t in (("threshold", threshold), ("lowest safe threshold", lowest_safe)):
+        right, wrong = served_counts(t)
+        print(f"{label} {t:.3f}: {right}/{matches} matches served, {wrong} wrong answers")
+
+if __name__ == "__main__":
+    main()
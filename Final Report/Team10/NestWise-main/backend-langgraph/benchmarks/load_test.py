@@ -0,0 +1,312 @@
+# backend_langgraph/benchmarks/load_test.py
+# Run from backend-langgraph:
+#   python -m benchmarks.load_test --in-process --scenario chat --users 20 --duration 30
+#   python -m benchmarks.load_test --users 50 --duration 60 --ramp 10 \
+#       --target langgraph=http://localhost:8000 --target auth=http://localhost:7001 --target userfin=http://localhost:8001
+#   python -m benchmarks.load_test ... --save-baseline main      (then later)      ... --compare main
+#   python -m benchmarks.load_test --in-process --scenario chat --users 10 --duration 30 --compare in-process-stub
+# Virtual users loop over the default scenarios whose service has a target. Chat tokens are minted with
+# AUTH_JWT_SECRET/AUTH_JWT_ALGORITHM (same values as the services); run the servers with LLM_STUB=true
+# so the numbers measure the backend and not the model. --in-process serves backend-langgraph through
+# httpx's ASGI transport instead of a port (the stub is switched on and the per-user rate limits are off, since
+# virtual users answer far faster than people; pass RATE_LIMIT_ENABLED=true to measure with them).
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+import numpy as np
+import httpx
+
+BASELINES_DIR = os.path.join(os.path.dirname(__file__), "load_baselines")
+CONVERSATIONS = os.path.join(os.path.dirname(__file__), "eval_conversations.json")
+SERVICES = ("langgraph", "auth", "userfin")
+SCENARIO_SERVICES = {"chat": "langgraph", "auth": "auth", "finance": "userfin"}
+# finance uploads to /files/, which backend-userFinancedata does not serve yet: run it with --scenario finance
+DEFAULT_SCENARIOS = ("chat", "auth")
+
+# Regression when p95 grows or throughput drops by more than the tolerance, or errors rise by > 1 point.
+# p95 growth under P95_SLACK_MS is ignored: a few ms of jitter is most of a fast endpoint's p95
+DEFAULT_TOLERANCE = 0.2
+ERROR_RATE_SLACK = 0.01
+P95_SLACK_MS = 25.0
+# A throttled request is retried after Retry-After this many times, like the frontend does
+THROTTLE_RETRIES = 3
+
+SAMPLE_CSV = (
+    "date,amount,category,description\n"
+    "2025-01-01,5200.00,Income,Salary\n"
+    "2025-01-03,-1650.00,Housing,Rent\n"
+    "2025-01-07,-212.45,Groceries,Supermarket\n"
+    "2025-01-12,-64.10,Transport,Gas\n"
+    "2025-01-20,-48.99,Entertainment,Streaming and concerts\n"
+)
+
+
+class Stats:
+    """Latencies and outcomes per endpoint ("POST /chatbot/answer"). 429s count as throttled, not errors."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.throttled = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, seconds: float, status: int, ok: bool):
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+        if status == 429:
+            self.throttled[endpoint] += 1
+        elif not ok:
+            self.errors[endpoint] += 1
+
+    def summary(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for endpoint in sorted(self.latencies):
+            latencies = np.array(self.latencies[endpoint]) * 1000
+            count = len(latencies)
+            endpoints[endpoint] = {
+                "requests": count,
+                "rps": round(count / wall_seconds, 2),
+                "error_rate": round(self.errors[endpoint] / count, 4),
+                "throttled": self.throttled[endpoint],
+                "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+                "p90_ms": round(float(np.percentile(latencies, 90)), 1),
+                "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+                "max_ms": round(float(latencies.max()), 1),
+                "statuses": {str(s): n for s, n in sorted(self.statuses[endpoint].items())},
+            }
+        return endpoints
+
+
+class VirtualUser:
+    def __init__(self, index: int, clients: dict, stats: Stats, run_id: str):
+        self.index = index
+        self.clients = clients
+        self.stats = stats
+        self.email = f"loadtest-{run_id}-{index}@example.com"
+        self.password = f"pw-{uuid.uuid4().hex[:12]}"
+        self.token = None
+
+    async def request(self, service: str, method: str, path: str, name: str | None = None, expect=(200,), **kwargs):
+        endpoint = f"{method} {name or path}"
+        for attempt in range(THROTTLE_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.clients[service].request(method, path, **kwargs)
+            except httpx.HTTPError as exc:
+                self.stats.record(endpoint, time.perf_counter() - started, 0, False)
+                print(f"  vu{self.index} {endpoint}: {exc.__class__.__name__}: {exc}")
+                return None
+            self.stats.record(endpoint, time.perf_counter() - started, response.status_code, response.status_code in expect)
+            if response.status_code != 429 or attempt == THROTTLE_RETRIES:
+                return response
+            # Behave like the frontend: back off for as long as the server asks, then send the same request
+            # again (chat answers keep their Idempotency-Key, so a retry is the same turn)
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+        return response
+
+    def bearer(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def auth(self):
+        await self.request("auth", "POST", "/userauth/signup", expect=(200, 201, 400),
+                           json={"email": self.email, "name": f"Load Test {self.index}", "password": self.password})
+        response = await self.request("auth", "POST", "/userauth/signin", json={"email": self.email, "password": self.password})
+        if response is None or response.status_code != 200:
+            return
+        self.token = response.json()["access_token"]
+        await self.request("auth", "POST", "/userauth/validateToken", headers=self.bearer())
+
+    async def chat(self, conversations: list[dict]):
+        self.token = self.token or mint_token(self.email)
+        response = await self.request("langgraph", "POST", "/chatbot/start", headers=self.bearer())
+        if response is None or response.status_code != 200:
+            return
+        session_id = response.json()["session_id"]
+        for message in random.choice(conversations)["messages"]:
+            response = await self.request(
+                "langgraph", "POST", "/chatbot/answer",
+                headers={**self.bearer(), "Idempotency-Key": str(uuid.uuid4())},
+                json={"session_id": session_id, "message": message},
+            )
+            if response is None or response.status_code != 200:
+                return
+            job_id = response.json().get("plan_job_id")
+            if job_id:
+                await self.wait_for_plan(job_id)
+                return
+
+    async def wait_for_plan(self, job_id: str):
+        while True:
+            response = await self.request("langgraph", "GET", f"/chatbot/plan/{job_id}", name="/chatbot/plan/{job_id}", headers=self.bearer())
+            if response is None or response.status_code != 200 or response.json()["status"] != "running":
+                return
+            await asyncio.sleep(0.5)
+
+    async def finance(self):
+        params = {"user_id": self.email}
+        await self.request("userfin", "POST", "/files/", params=params,
+                           files={"file": ("transactions.csv", SAMPLE_CSV.encode(), "text/csv")})
+        await self.request("userfin", "GET", "/summary/", params=params)
+        await self.request("userfin", "GET", "/transactions/", params=params)
+
+    async def run(self, scenarios: list[str], conversations: list[dict], deadline: float):
+        while time.monotonic() < deadline:
+            for scenario in scenarios:
+                if time.monotonic() >= deadline:
+                    return
+                if scenario == "chat":
+                    await self.chat(conversations)
+                else:
+                    await getattr(self, scenario)()
+
+
+def mint_token(email: str) -> str:
+    from jose import jwt
+    secret, algorithm = os.getenv("AUTH_JWT_SECRET"), os.getenv("AUTH_JWT_ALGORITHM") or "HS256"
+    if not secret:
+        raise SystemExit("AUTH_JWT_SECRET must be set (the same secret the services use) to run the chat scenario")
+    return jwt.encode({"sub": email, "exp": int(time.time()) + 3600}, secret, algorithm=algorithm)
+
+
+def in_process_client() -> httpx.AsyncClient:
+    os.environ.setdefault("LLM_STUB", "true")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-stub")     # read at import; the stub never calls OpenAI
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ.setdefault("EMBEDDING_BACKEND", "local")
+    os.environ.setdefault("AUTH_JWT_SECRET", "load-test-secret")
+    os.environ.setdefault("AUTH_JWT_ALGORITHM", "HS256")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    from app import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://langgraph")
+
+
+async def run_load(targets: dict, scenarios: list[str], users: int, duration: float, ramp: float, timeout: float) -> dict:
+    clients = {
+        service: target if isinstance(target, httpx.AsyncClient) else httpx.AsyncClient(base_url=target, timeout=timeout)
+        for service, target in targets.items()
+    }
+    for client in clients.values():
+        client.timeout = httpx.Timeout(timeout)
+    with open(CONVERSATIONS) as f:
+        conversations = json.load(f)
+
+    stats = Stats()
+    run_id = uuid.uuid4().hex[:8]
+    started = time.monotonic()
+    deadline = started + duration
+
+    async def start_user(i):
+        await asyncio.sleep(ramp * i / users)
+        await VirtualUser(i, clients, stats, run_id).run(scenarios, conversations, deadline)
+
+    try:
+        await asyncio.gather(*(start_user(i) for i in range(users)))
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    wall_seconds = time.monotonic() - started
+    return {
+        "run_id": run_id,
+        "users": users,
+        "duration": duration,
+        "scenarios": scenarios,
+        "wall_seconds": round(wall_seconds, 2),
+        "endpoints": stats.summary(wall_seconds),
+    }
+
+
+def print_report(report: dict):
+    print(f"\n{report['users']} users, {report['wall_seconds']}s, scenarios: {', '.join(report['scenarios'])}")
+    print(f"{'endpoint':<32} {'reqs':>6} {'rps':>7} {'err%':>6} {'429':>5} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for endpoint, s in report["endpoints"].items():
+        print(
+            f"{endpoint:<32} {s['requests']:>6} {s['rps']:>7.1f} {s['error_rate'] * 100:>5.1f}% {s['throttled']:>5} "
+            f"{s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f} {s['max_ms']:>8.1f}"
+        )
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Endpoints that got slower, lost throughput or started failing compared to the baseline."""
+    regressions = []
+    for endpoint, base in baseline["endpoints"].items():
+        current = report["endpoints"].get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: no requests in this run")
+            continue
+        if current["p95_ms"] > max(base["p95_ms"] * (1 + tolerance), base["p95_ms"] + P95_SLACK_MS):
+            regressions.append(f"{endpoint}: p95 {base['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {base['rps']} -> {current['rps']} req/s")
+        if current["error_rate"] > base["error_rate"] + ERROR_RATE_SLACK:
+            regressions.append(f"{endpoint}: error rate {base['error_rate']:.2%} -> {current['error_rate']:.2%}")
+    return regressions
+
+
+def parse_targets(values) -> dict:
+    targets = {}
+    for value in values or []:
+        service, _, url = value.partition("=")
+        if service not in SERVICES or not url:
+            raise SystemExit(f"--target must be one of {', '.join(SERVICES)}=<url>, got {value!r}")
+        targets[service] = url
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test for the NestWise services")
+    parser.add_argument("--target", action="append", help="service=url, service in langgraph, auth, userfin (repeatable)")
+    parser.add_argument("--in-process", action="store_true", help="Serve backend-langgraph in this process with the stub LLM")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIO_SERVICES), help=f"Default: {', '.join(DEFAULT_SCENARIOS)} where they have a target")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds")
+    parser.add_argument("--ramp", type=float, default=0, help="Seconds over which users are started")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default=None, help="Write the report JSON here")
+    parser.add_argument("--save-baseline", metavar="NAME", help=f"Save the report as {BASELINES_DIR}/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with a saved baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    targets = parse_targets(args.target)
+    if args.in_process:
+        targets["langgraph"] = in_process_client()
+    scenarios = args.scenario or [s for s in DEFAULT_SCENARIOS if SCENARIO_SERVICES[s] in targets]
+    missing = [s for s in scenarios if SCENARIO_SERVICES[s] not in targets]
+    if missing or not scenarios:
+        raise SystemExit(f"No target for scenario(s): {', '.join(missing) or 'none selected'}")
+
+    report = asyncio.run(run_load(
+        {service: targets[service] for service in {SCENARIO_SERVICES[s] for s in scenarios}},
+        scenarios, args.users, args.duration, args.ramp, args.timeout,
+    ))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(BASELINES_DIR, exist_ok=True)
+        path = os.path.join(BASELINES_DIR, f"{args.save_baseline}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {path}")
+    if args.compare:
+        with open(os.path.join(BASELINES_DIR, f"{args.compare}.json")) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
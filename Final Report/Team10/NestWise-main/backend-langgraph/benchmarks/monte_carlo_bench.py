@@ -0,0 +1,49 @@
+# backend_langgraph/benchmarks/monte_carlo_bench.py
+# Run from backend-langgraph: python -m benchmarks.monte_carlo_bench [--paths 5000] [--repeat 20]
+import argparse
+import time
+import numpy as np
+
+from Agentic_AI.monte_carlo import simulate_profile, MONTE_CARLO_PATHS
+
+# Representative profiles: young saver, mid-career, near retirement, already retired
+PROFILES = [
+    ({"age": "25", "salary": "55000", "savings": "5000"}, {"stocks": 90, "bonds": 10, "cash": 0, "other": 0}),
+    ({"age": "40", "salary": "$95,000", "savings": "150k"}, {"stocks": 70, "bonds": 25, "cash": 5, "other": 0}),
+    ({"age": "58", "salary": "120000", "savings": "900000"}, {"stocks": 50, "bonds": 40, "cash": 10, "other": 0}),
+    ({"age": "67", "salary": "80000", "savings": "1.2 million"}, {"stocks": 40, "bonds": 45, "cash": 15, "other": 0}),
+]
+BUDGET_SECONDS = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Monte Carlo projection per profile")
+    parser.add_argument("--paths", type=int, default=MONTE_CARLO_PATHS)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'age':>4} {'years':>6} {'paths':>7} {'mean ms':>9} {'p95 ms':>9} {'success':>8}")
+    worst = 0.0
+    for profile, allocation in PROFILES:
+        simulate_profile(profile, allocation, paths=args.paths)    # warm-up
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = simulate_profile(profile, allocation, paths=args.paths)
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings)
+        worst = max(worst, float(np.percentile(timings, 95)))
+        print(
+            f"{profile['age']:>4} {len(result['ages']):>6} {args.paths:>7} {timings.mean() * 1000:>9.1f} "
+            f"{np.percentile(timings, 95) * 1000:>9.1f} {result['success_probability']:>8.2%}"
+        )
+
+    # Same seed must give the same answer
+    first = simulate_profile(*PROFILES[1], paths=args.paths)
+    again = simulate_profile(*PROFILES[1], paths=args.paths)
+    print(f"reproducible: {first == again}")
+    print(f"worst p95: {worst * 1000:.1f} ms (budget {BUDGET_SECONDS * 1000:.0f} ms) -> {'OK' if worst < BUDGET_SECONDS else 'OVER BUDGET'}")
+
+
+if __name__ == "__main__":
+    main()
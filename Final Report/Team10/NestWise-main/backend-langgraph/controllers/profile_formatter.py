@@ -0,0 +1,273 @@
+import re
+import difflib
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+#   LOCAL (NO LLM) FORMATTING RULES FOR PROFILE DATA SHOWN IN THE FRONTEND
+#   Mirrors the rules in the textizer prompt; anything it cannot classify is left for the LLM.
+
+MONEY_KEY_WORDS = (
+    "salary", "savings", "income", "expense", "expenses", "spending", "budget", "amount", "cost", "costs",
+    "debt", "contribution", "net_worth", "networth", "wealth", "assets", "balance", "pension",
+)
+PERCENT_KEY_WORDS = ("percentage", "percent", "rate", "pct")
+AGE_KEY_WORDS = ("age",)
+COUNT_KEY_WORDS = ("number", "count", "num")
+LOCATION_KEY_WORDS = ("location", "state", "city", "residence", "hometown")
+
+# Known misspellings from the textizer prompt plus common ones seen in chats
+SPELLING_FIXES = {
+    "retirment": "retirement",
+    "retirmeent": "retirement",
+    "retiremnt": "retirement",
+    "savigns": "savings",
+    "saveings": "savings",
+    "anual": "annual",
+    "anually": "annually",
+    "mortage": "mortgage",
+    "insurence": "insurance",
+    "benificiary": "beneficiary",
+    "beneficary": "beneficiary",
+    "charaty": "charity",
+    "donaton": "donation",
+    "invesment": "investment",
+    "investmant": "investment",
+    "helthcare": "healthcare",
+    "healtcare": "healthcare",
+    "montly": "monthly",
+    "travle": "travel",
+}
+
+# Domain vocabulary for fuzzy correction of words the explicit map does not cover
+DOMAIN_VOCABULARY = (
+    "retirement", "retire", "savings", "annual", "annually", "monthly", "yearly", "weekly", "income", "salary",
+    "expenses", "spending", "healthcare", "insurance", "investment", "investments", "beneficiary", "beneficiaries",
+    "inheritance", "estate", "charity", "charities", "donation", "donations", "travel", "traveling", "vacation",
+    "mortgage", "children", "grandchildren", "family", "spouse", "daughter", "daughters", "security", "financial",
+    "conservative", "moderate", "aggressive", "planning", "portfolio", "pension", "comfortable", "lifestyle",
+    "upgrades", "philanthropy", "foundation", "university", "hospital", "emergency", "medical",
+)
+
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California", "CO": "Colorado",
+    "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York", "NC": "North Carolina",
+    "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania",
+    "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas",
+    "UT": "Utah", "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia",
+}
+
+US_CITIES = (
+    "New York City", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio", "San Diego",
+    "Dallas", "San Jose", "Austin", "Jacksonville", "Fort Worth", "Columbus", "Charlotte", "San Francisco",
+    "Indianapolis", "Seattle", "Denver", "Boston", "El Paso", "Nashville", "Detroit", "Oklahoma City",
+    "Portland", "Las Vegas", "Memphis", "Louisville", "Baltimore", "Milwaukee", "Albuquerque", "Tucson",
+    "Fresno", "Sacramento", "Kansas City", "Mesa", "Atlanta", "Omaha", "Colorado Springs", "Raleigh",
+    "Miami", "Long Beach", "Virginia Beach", "Oakland", "Minneapolis", "Tulsa", "Tampa", "Arlington",
+    "New Orleans", "Cleveland", "Honolulu", "Pittsburgh", "Cincinnati", "St. Louis", "Orlando", "Salt Lake City",
+    "Fort Wayne", "Lafayette", "West Lafayette", "Bloomington", "Ann Arbor", "Madison", "Buffalo", "Anchorage",
+    "Boise", "Des Moines", "Richmond", "Spokane", "Santa Fe", "Savannah", "Charleston", "Scottsdale", "Naples",
+    "Sarasota", "Palm Springs", "Brooklyn", "Manhattan", "Queens", "Washington D.C.",
+)
+
+# compact lowercase form ("newyork", "ny") -> display name
+GAZETTEER = {}
+for _code, _state in US_STATES.items():
+    GAZETTEER[re.sub(r"[^a-z]", "", _state.lower())] = _state
+for _city in US_CITIES:
+    GAZETTEER[re.sub(r"[^a-z]", "", _city.lower())] = _city
+GAZETTEER["nyc"] = "New York City"
+GAZETTEER["la"] = "Los Angeles"
+GAZETTEER["sf"] = "San Francisco"
+GAZETTEER["dc"] = "Washington D.C."
+GAZETTEER["usa"] = "United States"
+GAZETTEER["unitedstates"] = "United States"
+
+_NUMBER = re.compile(r"^\s*\$?\s*(-?\d[\d,]*(?:\.\d+)?)\s*(k|m|mm|million|thousand|grand|b|billion)?\s*(?:dollars|usd)?\s*$", re.I)
+_PERCENT = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(%|percent|pct)?\s*$", re.I)
+_AGE = re.compile(r"^\s*(?:age\s*)?(\d{1,3})(?:\s*(?:years?(?:\s*old)?|yrs?|yo))?\s*$", re.I)
+_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "grand": 1e3, "m": 1e6, "mm": 1e6, "million": 1e6, "b": 1e9, "billion": 1e9}
+
+
+class Unclassified(Exception):
+    """Raised when a value cannot be formatted with the local rules."""
+
+
+def humanize_key(key: str) -> str:
+    """'desiredMonthlySpending' / 'desired_monthly_spending' -> 'Desired Monthly Spending'."""
+    spaced = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", str(key))
+    spaced = re.sub(r"[_\-]+", " ", spaced)
+    return title_case(spaced)
+
+
+def title_case(text: str) -> str:
+    words = []
+    for word in str(text).split():
+        if len(word) > 1 and word.isupper():
+            words.append(word)              # keep acronyms like IRA, NYC
+        elif word[0].isalpha():
+            words.append(word[0].upper() + word[1:].lower())
+        else:
+            words.append(word)              # 401(k), $50,000, ...
+    return " ".join(words)
+
+
+@lru_cache(maxsize=4096)
+def _correct_word(lower: str):
+    if lower in SPELLING_FIXES:
+        return SPELLING_FIXES[lower]
+    if len(lower) >= 5 and lower not in DOMAIN_VOCABULARY:
+        # Same first letter only, so real words like "early" are not "corrected" to "yearly"
+        candidates = [w for w in DOMAIN_VOCABULARY if w[0] == lower[0]]
+        close = difflib.get_close_matches(lower, candidates, n=1, cutoff=0.88)
+        if close:
+            return close[0]
+    return None
+
+
+def correct_spelling(text: str) -> str:
+    def fix(match):
+        word = match.group(0)
+        return _correct_word(word.lower()) or word
+    return re.sub(r"[A-Za-z]+", fix, str(text))
+
+
+def _key_has(key: str, words) -> bool:
+    parts = re.split(r"[_\s]+", re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", str(key)).lower())
+    return any(w in parts for w in words)
+
+
+def parse_amount(value) -> float:
+    if isinstance(value, bool):
+        raise Unclassified(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.match(str(value))
+    if not match:
+        raise Unclassified(value)
+    number = float(match.group(1).replace(",", ""))
+    suffix = (match.group(2) or "").lower()
+    return number * _MULTIPLIERS.get(suffix, 1)
+
+
+def format_money(value) -> str:
+    amount = parse_amount(value)
+    sign = "-" if amount < 0 else ""
+    amount = abs(amount)
+    if amount == int(amount):
+        return f"{sign}${int(amount):,}"
+    return f"{sign}${amount:,.2f}"
+
+
+def format_percent(value) -> str:
+    if isinstance(value, bool):
+        raise Unclassified(value)
+    if isinstance(value, (int, float)):
+        number, explicit = float(value), False
+    else:
+        match = _PERCENT.match(str(value))
+        if not match:
+            raise Unclassified(value)
+        number, explicit = float(match.group(1)), bool(match.group(2))
+    # Fractions like 0.075 mean 7.5% unless the user wrote a % sign
+    if not explicit and 0 < abs(number) < 1:
+        number *= 100
+    text = f"{number:.2f}".rstrip("0").rstrip(".")
+    return f"{text}%"
+
+
+def format_age(value) -> str:
+    if isinstance(value, bool):
+        raise Unclassified(value)
+    if isinstance(value, (int, float)):
+        return str(int(round(value)))
+    match = _AGE.match(str(value))
+    if not match:
+        raise Unclassified(value)
+    return str(int(match.group(1)))
+
+
+def format_count(value) -> str:
+    if isinstance(value, bool):
+        raise Unclassified(value)
+    if isinstance(value, (int, float)):
+        return str(int(round(value)))
+    match = re.match(r"^\s*(\d+)\s*$", str(value))
+    if not match:
+        raise Unclassified(value)
+    return match.group(1)
+
+
+@lru_cache(maxsize=4096)
+def _lookup_place(part: str):
+    raw = part.strip()
+    if len(raw) == 2 and raw.upper() in US_STATES:
+        return raw.upper()                  # keep "TX" in "Austin, TX"
+    compact = re.sub(r"[^a-z]", "", raw.lower())
+    if not compact:
+        return None
+    if compact in GAZETTEER:
+        return GAZETTEER[compact]
+    close = difflib.get_close_matches(compact, GAZETTEER.keys(), n=1, cutoff=0.8)
+    return GAZETTEER[close[0]] if close else None
+
+
+def format_location(value) -> str:
+    if not isinstance(value, str):
+        raise Unclassified(value)
+    parts = [p for p in value.split(",") if p.strip()]
+    places = [_lookup_place(p) for p in parts]
+    if not places or any(p is None for p in places):
+        raise Unclassified(value)
+    return ", ".join(places)
+
+
+def format_text(value) -> str:
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, (int, float)):
+        return f"{value:,}" if isinstance(value, int) else str(value)
+    if isinstance(value, (list, tuple)):
+        return ", ".join(format_text(v) for v in value)
+    if isinstance(value, dict):
+        raise Unclassified(value)
+    return title_case(correct_spelling(value))
+
+
+def format_value(key: str, value) -> str:
+    """Format one profile value from its key; raises Unclassified when the LLM should decide."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return ""
+    # Flags such as has_pension or owns_home: bool is an int, so route it before the number formatters
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if _key_has(key, AGE_KEY_WORDS):
+        return format_age(value)
+    if _key_has(key, PERCENT_KEY_WORDS):
+        return format_percent(value)
+    if _key_has(key, MONEY_KEY_WORDS):
+        return format_money(value)
+    if _key_has(key, COUNT_KEY_WORDS):
+        return format_count(value)
+    if _key_has(key, LOCATION_KEY_WORDS):
+        return format_location(value)
+    return format_text(value)
+
+
+def format_profile(data: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Format what the local rules can handle.
+    Returns (formatted, unresolved): formatted maps humanized keys to display strings,
+    unresolved holds the original key/value pairs that still need the LLM.
+    """
+    formatted, unresolved = {}, {}
+    for key, value in data.items():
+        try:
+            formatted[humanize_key(key)] = format_value(key, value)
+        except Unclassified:
+            unresolved[key] = value
+    return formatted, unresolved
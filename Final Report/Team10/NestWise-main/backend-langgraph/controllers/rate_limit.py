@@ -0,0 +1,187 @@
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from fastapi import Depends, HTTPException, status
+
+from auth import verify_access_token
+
+# Per-user token buckets (requests per minute + burst) and a cap on requests in flight per user.
+# Without RATE_LIMIT_REDIS_URL the limits are per process; with it they are shared by every worker
+# through any Redis-compatible server (needs `pip install redis`).
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "").strip()
+CHAT_MAX_IN_FLIGHT = int(os.getenv("CHAT_MAX_IN_FLIGHT", "2"))
+IN_FLIGHT_TTL_SECONDS = 300            # Redis in-flight counters expire in case a worker dies mid-request
+MAX_IDLE_BUCKETS = 10000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+
+RATE_LIMITS = {
+    "start": RateLimit(float(os.getenv("CHAT_START_PER_MINUTE", "10")), int(os.getenv("CHAT_START_BURST", "5"))),
+    "answer": RateLimit(float(os.getenv("CHAT_ANSWER_PER_MINUTE", "30")), int(os.getenv("CHAT_ANSWER_BURST", "10"))),
+}
+
+
+class InMemoryRateLimiter:
+    """Token buckets and in-flight counters in this process. Only touched from the event loop."""
+
+    def __init__(self, max_in_flight: int = CHAT_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self._buckets = {}              # key -> [tokens, updated_at]
+        self._in_flight = {}            # user -> requests being processed
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take one token; returns 0 if allowed, else the seconds until a token is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[key] = [float(limit.burst), now]
+        tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / limit.rate
+
+    def _prune(self, now: float):
+        # Drop buckets that have refilled completely; they are equivalent to a new one
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            name = key.split(":", 1)[0]
+            limit = RATE_LIMITS.get(name)
+            if limit is None or tokens + (now - updated_at) * limit.rate >= limit.burst:
+                del self._buckets[key]
+
+    async def enter(self, user: str) -> bool:
+        count = self._in_flight.get(user, 0)
+        if count >= self.max_in_flight:
+            return False
+        self._in_flight[user] = count + 1
+        return True
+
+    async def leave(self, user: str):
+        count = self._in_flight.get(user, 0) - 1
+        if count > 0:
+            self._in_flight[user] = count
+        else:
+            self._in_flight.pop(user, None)
+
+
+# Refill, take one token and return the wait (as a string, Lua numbers are truncated to integers)
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """Same limits kept in Redis, so they hold across uvicorn workers and replicas."""
+
+    def __init__(self, url: str, max_in_flight: int = CHAT_MAX_IN_FLIGHT, prefix: str = "nestwise:ratelimit"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed") from e
+        self.client = redis.from_url(url)
+        self.max_in_flight = max_in_flight
+        self.prefix = prefix
+        self._token_bucket = self.client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        wait = await self._token_bucket(keys=[f"{self.prefix}:bucket:{key}"], args=[limit.rate, limit.burst, time.time()])
+        return float(wait)
+
+    async def enter(self, user: str) -> bool:
+        key = f"{self.prefix}:inflight:{user}"
+        count = await self.client.incr(key)
+        await self.client.expire(key, IN_FLIGHT_TTL_SECONDS)
+        if count > self.max_in_flight:
+            await self.client.decr(key)
+            return False
+        return True
+
+    async def leave(self, user: str):
+        await self.client.decr(f"{self.prefix}:inflight:{user}")
+
+
+rate_limiter = RedisRateLimiter(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else InMemoryRateLimiter()
+rejected = {"rate": 0, "in_flight": 0}
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+@asynccontextmanager
+async def rate_limit(endpoint: str, user_email: str):
+    """Apply the endpoint's per-user rate limit and the per-user in-flight cap around a request."""
+    if not RATE_LIMIT_ENABLED:
+        yield
+        return
+
+    wait = await rate_limiter.take(f"{endpoint}:{user_email}", RATE_LIMITS[endpoint])
+    if wait > 0:
+        rejected["rate"] += 1
+        raise _too_many_requests("Too many requests, slow down", wait)
+
+    if not await rate_limiter.enter(user_email):
+        rejected["in_flight"] += 1
+        raise _too_many_requests("Another request is still being processed", 1)
+    try:
+        yield
+    finally:
+        await rate_limiter.leave(user_email)
+
+
+def rate_limited(endpoint: str):
+    """
+    Dependency for a chat endpoint: authenticates like verify_access_token (and returns the email),
+    then applies the endpoint's rate limit and in-flight cap (see rate_limit).
+    """
+    async def dependency(user_email: str = Depends(verify_access_token)):
+        async with rate_limit(endpoint, user_email):
+            yield user_email
+
+    return dependency
+
+
+def stats() -> dict:
+    return {
+        "enabled": RATE_LIMIT_ENABLED,
+        "backend": "redis" if RATE_LIMIT_REDIS_URL else "memory",
+        "max_in_flight": CHAT_MAX_IN_FLIGHT,
+        "limits": {name: {"per_minute": limit.per_minute, "burst": limit.burst} for name, limit in RATE_LIMITS.items()},
+        "rejected": dict(rejected),
+    }
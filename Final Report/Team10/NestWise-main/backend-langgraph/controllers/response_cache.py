@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Stable hash of JSON-like data (key order and whitespace do not matter)."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AsyncTTLCache:
+    """
+    In-process TTL + LRU cache with single-flight coalescing for async endpoints.
+    Concurrent callers with the same key await one shared computation; its result
+    is then served from the cache until it expires. A computation runs to completion even
+    when its callers are cancelled. Failures are not cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._in_flight = {}            # key -> asyncio.Future
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _get_fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        """True while the key has a fresh value or a computation running."""
+        return key in self._in_flight or self._get_fresh(key) is not None
+
+    async def _compute_and_store(self, key, compute):
+        try:
+            value = await compute()
+            self._store(key, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        entry = self._get_fresh(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The computation is its own task, so it finishes and is stored even if every caller
+            # goes away; callers only shield themselves on it
+            task = asyncio.get_running_loop().create_task(self._compute_and_store(key, compute))
+            # Mark retrieved so an exception nobody awaited is not logged as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
@@ -1,4 +1,3 @@
-import openai
 import json
 from typing import Dict, Any, Union
 import os
@@ -6,10 +5,38 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from Agentic_AI.llm_clients import get_openai_client
+from Agentic_AI.llm_scheduler import llm_scheduler, INTERACTIVE
+from Agentic_AI.llm_cache import llm_cache, cache_key
+
+from controllers.profile_formatter import format_profile, humanize_key
+
 #   FUNCTION TO FORMAT USER RESPONSES BASED ON CONTEXT FOR DISPLAY IN FRONTEND
 def textizer(data: Dict[str, Any], last_chatbot_response: str = "") -> Dict[str, str]:
+    # Local rules handle keys, money, percentages, ages, US locations and spelling;
+    # only values they cannot classify go to the LLM.
+    formatted_data, unresolved = format_profile(data)
+    if not unresolved:
+        return formatted_data
+
+    llm_formatted = llm_textizer(unresolved, last_chatbot_response)
+    llm_by_key = {humanize_key(key): value for key, value in llm_formatted.items()}
+    formatted_data.update(llm_by_key)
+
+    # Keep the original field order for the frontend
+    ordered = {}
+    for key in data:
+        display_key = humanize_key(key)
+        if display_key in formatted_data:
+            ordered[display_key] = formatted_data.pop(display_key)
+    ordered.update(formatted_data)
+    return ordered
 
-    client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+#   LLM FALLBACK FOR VALUES THE LOCAL RULES COULD NOT CLASSIFY
+def llm_textizer(data: Dict[str, Any], last_chatbot_response: str = "") -> Dict[str, str]:
+
+    client = get_openai_client()
     
     prompt = f"""
     You are a data formatter for a retirement planning application. Format the following data appropriately based on context.
@@ -47,25 +74,35 @@ def textizer(data: Dict[str, Any], last_chatbot_response: str = "") -> Dict[str,
     Return ONLY a JSON object with formatted key-value pairs. No other text. All keys and values must be returned, IF there is no value, return nothing for the value.
     """
 
+    messages = [
+        {
+            "role": "system", 
+            "content": "You are a precise data formatter. Return only valid JSON with no additional text or explanation."
+        },
+        {
+            "role": "user", 
+            "content": prompt
+        }
+    ]
+    params = {"temperature": 0.1, "max_tokens": 1000}  # Low temperature for consistent formatting
+    key = cache_key("gpt-4o", messages, params=params)
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "You are a precise data formatter. Return only valid JSON with no additional text or explanation."
-                },
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
-            ],
-            temperature=0.1,  # Low temperature for consistent formatting
-            max_tokens=1000
-        )
-        
-        # Extract and parse the response
-        formatted_text = response.choices[0].message.content.strip()
+        cached_response = llm_cache.get(key)
+        if cached_response is not None:
+            formatted_text = cached_response["content"]
+        else:
+            # The formatted profile is shown in the UI as soon as it comes back
+            response = llm_scheduler.run(
+                INTERACTIVE,
+                client.chat.completions.create,
+                model="gpt-4o",
+                messages=messages,
+                **params
+            )
+
+            # Extract and parse the response
+            formatted_text = response.choices[0].message.content.strip()
         
         # Remove any markdown code blocks if present
         if formatted_text.startswith('```json'):
@@ -75,6 +112,9 @@ def textizer(data: Dict[str, Any], last_chatbot_response: str = "") -> Dict[str,
         
         # Parse JSON response
         formatted_data = json.loads(formatted_text)
+        if cached_response is None:
+            # Only cache responses that parsed
+            llm_cache.put(key, {"content": formatted_text})
         
         return formatted_data
         
@@ -15,6 +15,18 @@ class AnswerResponse(BaseModel):
     response: str
     real_profile: dict | None = None
     conversation_title: str | None = None
+    plan_job_id: str | None = None
+    sources: list[dict] | None = None   # [{"source", "page"}] behind a reviewed FAQ answer
+
+
+class PlanJobResponse(BaseModel):
+    job_id: str
+    status: str                     # running | done | failed
+    stage: str                      # queued | retrieving | drafting | formatting | done | failed
+    progress: float | None = None
+    result: dict | None = None      # {"plan": formatted plan, "raw_plan": planner output}
+    error: str | None = None
+    elapsed_seconds: float
 
 class ProfileUpdateRequest(BaseModel):
     session_id: str
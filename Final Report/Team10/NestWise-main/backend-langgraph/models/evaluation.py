@@ -0,0 +1,26 @@
+# models/evaluation.py
+from pydantic import BaseModel, Field
+
+# Pydantic models
+class EvalConversation(BaseModel):
+    id: str | None = None
+    messages: list[str] = Field(..., min_length=1)
+
+
+class EvalRunRequest(BaseModel):
+    conversations: list[EvalConversation] = Field(..., min_length=1, max_length=1000)
+    parallelism: int = Field(8, ge=1, le=64)
+
+
+class EvalRunStartResponse(BaseModel):
+    run_id: str
+    total: int
+
+
+class EvalRunResponse(BaseModel):
+    run_id: str
+    status: str                     # running | done | failed
+    completed: int
+    total: int
+    report: dict | None = None      # {"run_id", "summary", "results": [per conversation]}
+    error: str | None = None
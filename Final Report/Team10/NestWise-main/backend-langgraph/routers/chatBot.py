@@ -1,29 +1,40 @@
 # routers/chatBot.py
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Header, status
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import time
+import os
+import uuid
 import logging
 from auth import verify_access_token
+from controllers.rate_limit import rate_limit, rate_limited
+from controllers.response_cache import AsyncTTLCache, canonical_hash
 
 # Import your langgraph functions and shared sessions
 from Agentic_AI.langgraph import chat_step, start_session
+from Agentic_AI.plan_jobs import plan_jobs
 
 #import models
-from models.chat import StartResponse, AnswerRequest, AnswerResponse, ProfileUpdateRequest
+from models.chat import StartResponse, AnswerRequest, AnswerResponse, ProfileUpdateRequest, PlanJobResponse
 
 logger = logging.getLogger(__name__)
 chatRouter = APIRouter()
 
+# Completed (and in-flight) turns by Idempotency-Key, so a retried or double-submitted message
+# is answered once and replayed instead of re-running the graph
+answer_turns = AsyncTTLCache(
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL", "900")),
+    max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "4096")),
+)
+
 # --- Start a new session ---
 @chatRouter.post("/start", response_model=StartResponse)
-async def start_chat(user_email: str = Depends(verify_access_token)) -> StartResponse:
+async def start_chat(user_email: str = Depends(rate_limited("start"))) -> StartResponse:
     """
     Start a new chat session and return a unique session_id.
     """
-    session_id = str(time.time())  # simple timestamp-based session id
+    session_id = uuid.uuid4().hex  # random, so session ids cannot be guessed
     try:
-        await run_in_threadpool(start_session, session_id)
+        await run_in_threadpool(start_session, session_id, user_email)
     except Exception as exc:
         logger.exception("Failed to start session")
         raise HTTPException(
@@ -36,9 +47,15 @@ async def start_chat(user_email: str = Depends(verify_access_token)) -> StartRes
 
 # --- Send a message and get a response ---
 @chatRouter.post("/answer", response_model=AnswerResponse)
-async def answer_question(payload: AnswerRequest, user_email: str = Depends(verify_access_token)) -> AnswerResponse:
+async def answer_question(
+    payload: AnswerRequest,
+    user_email: str = Depends(verify_access_token),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> AnswerResponse:
     """
     Handle a user message for the given session_id and return the assistant's response.
+    With an Idempotency-Key header, repeats of a turn return the stored response (or wait for the
+    running one) instead of processing the message again; those repeats are not rate limited.
     """
     if not payload.session_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing session_id")
@@ -46,20 +63,50 @@ async def answer_question(payload: AnswerRequest, user_email: str = Depends(veri
     if not payload.message.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message cannot be empty")
 
+    if not idempotency_key:
+        async with rate_limit("answer", user_email):
+            return await run_turn(payload, user_email)
+
+    message_hash = canonical_hash(payload.message)
+
+    async def compute():
+        return message_hash, await run_turn(payload, user_email)
+
+    key = canonical_hash(user_email, payload.session_id, idempotency_key)
+    if key in answer_turns:
+        # A retry of a turn that finished or is still running costs nothing, so it is not charged a token
+        turn_message_hash, response = await answer_turns.get_or_compute(key, compute)
+    else:
+        async with rate_limit("answer", user_email):
+            turn_message_hash, response = await answer_turns.get_or_compute(key, compute)
+    if turn_message_hash != message_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different message",
+        )
+    return response
+
+
+async def run_turn(payload: AnswerRequest, user_email: str) -> AnswerResponse:
     try:
         # Run chat_step in a threadpool to avoid blocking
-        result = await run_in_threadpool(chat_step, payload.message, payload.session_id)
+        result = await run_in_threadpool(chat_step, payload.message, payload.session_id, user_email)
 
         if isinstance(result, dict):
             return AnswerResponse(
                 response=result.get("response", ""),
                 real_profile=result.get("real_profile", {}),
-                conversation_title=result.get("conversation_title", None)
+                conversation_title=result.get("conversation_title", None),
+                plan_job_id=result.get("plan_job_id", None),
+                sources=result.get("sources", None)
             )
         else:
             # backward compatibility fallback
             return AnswerResponse(response=str(result), real_profile={})
 
+    except PermissionError as exc:
+        # Someone else's session: answer as if it did not exist
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found") from exc
     except Exception as exc:
         logger.exception("Error while generating chat response")
         raise HTTPException(
@@ -67,6 +114,17 @@ async def answer_question(payload: AnswerRequest, user_email: str = Depends(veri
             detail="Internal error while processing request",
         ) from exc
 
+# --- Poll a background plan-generation job ---
+@chatRouter.get("/plan/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(job_id: str, user_email: str = Depends(verify_access_token)) -> PlanJobResponse:
+    """
+    Return the progress (retrieving, drafting, formatting) and, once done, the result of a plan job.
+    """
+    job = plan_jobs.status(job_id, owner=user_email)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan job not found")
+    return PlanJobResponse(**job)
+
 # --- Update user profile ---
 # @router.post("/profile")
 # async def update_profile(payload: ProfileUpdateRequest):
@@ -0,0 +1,44 @@
+# routers/documents.py
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Response, status
+import httpx
+from auth import oauth2_scheme, verify_access_token
+from Agentic_AI.rag_client import RAG_SERVICE_URL, RAG_SERVICE_TIMEOUT
+
+# The retrieval service is not published on the host, so users reach their documents through here.
+# Requests are forwarded with the user's own token; backend-RAG scopes them to the token's namespace.
+documentsRouter = APIRouter()
+
+_rag = None
+
+
+def rag_client() -> httpx.AsyncClient:
+    global _rag
+    if not RAG_SERVICE_URL:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Document uploads need the retrieval service")
+    if _rag is None:
+        _rag = httpx.AsyncClient(base_url=RAG_SERVICE_URL.rstrip("/"), timeout=httpx.Timeout(RAG_SERVICE_TIMEOUT))
+    return _rag
+
+
+async def forward(method: str, path: str, token: str, **kwargs) -> Response:
+    try:
+        response = await rag_client().request(method, path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    except httpx.HTTPError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Retrieval service unavailable") from exc
+    return Response(content=response.content, status_code=response.status_code, media_type=response.headers.get("content-type"))
+
+
+@documentsRouter.post("/")
+async def upload_document(file: UploadFile = File(...), token: str = Depends(oauth2_scheme), user_email: str = Depends(verify_access_token)):
+    data = await file.read()
+    return await forward("POST", "/documents", token, files={"file": (file.filename, data, file.content_type)})
+
+
+@documentsRouter.get("/")
+async def list_documents(token: str = Depends(oauth2_scheme), user_email: str = Depends(verify_access_token)):
+    return await forward("GET", "/documents", token)
+
+
+@documentsRouter.delete("/{doc_id}")
+async def delete_document(doc_id: str, token: str = Depends(oauth2_scheme), user_email: str = Depends(verify_access_token)):
+    return await forward("DELETE", f"/documents/{doc_id}", token)
@@ -0,0 +1,28 @@
+# routers/evaluation.py
+from fastapi import APIRouter, HTTPException, Depends, status
+from auth import verify_admin
+
+from Agentic_AI.batch_eval import eval_runs, normalize_conversations
+from models.evaluation import EvalRunRequest, EvalRunStartResponse, EvalRunResponse
+
+evalRouter = APIRouter()
+
+
+# --- Start a batch of scripted conversations (each in its own session) ---
+@evalRouter.post("/runs", response_model=EvalRunStartResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_eval_run(payload: EvalRunRequest, user_email: str = Depends(verify_admin)) -> EvalRunStartResponse:
+    try:
+        conversations = normalize_conversations([c.model_dump(exclude_none=True) for c in payload.conversations])
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    run_id = eval_runs.submit(conversations, payload.parallelism, owner=user_email)
+    return EvalRunStartResponse(run_id=run_id, total=len(conversations))
+
+
+# --- Poll a run; the report (transcripts, final profiles, plans, timings) is included once done ---
+@evalRouter.get("/runs/{run_id}", response_model=EvalRunResponse)
+async def get_eval_run(run_id: str, user_email: str = Depends(verify_admin)) -> EvalRunResponse:
+    run = eval_runs.status(run_id, owner=user_email)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Eval run not found")
+    return EvalRunResponse(**run)
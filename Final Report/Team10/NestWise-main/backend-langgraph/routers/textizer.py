@@ -1,10 +1,19 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Dict, Any
+import os
 from controllers.textizer import textizer
+from controllers.response_cache import AsyncTTLCache, canonical_hash
 
 textizer_router = APIRouter()
 
+# Identical payloads (React re-renders, several tabs) share one result for TEXTIZER_CACHE_TTL seconds
+textizer_cache = AsyncTTLCache(
+    ttl_seconds=float(os.getenv("TEXTIZER_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("TEXTIZER_CACHE_MAX_ENTRIES", "1024")),
+)
+
 #   MAY NEED TO ADD THIS TO THE MODELS FILE AS A PYDANTIC MODEL
 class TextizerRequest(BaseModel):
     profileData: Dict[str, Any]
@@ -12,5 +21,15 @@ class TextizerRequest(BaseModel):
 
 @textizer_router.post("/")
 async def format_data(request: TextizerRequest):
-    formatted_data = textizer(request.profileData, request.lastChatbotResponse)
-    return formatted_data
\ No newline at end of file
+    key = canonical_hash(request.profileData, request.lastChatbotResponse)
+
+    # textizer() may block on OpenAI, so run it off the event loop
+    async def compute():
+        return await run_in_threadpool(textizer, request.profileData, request.lastChatbotResponse)
+
+    formatted_data = await textizer_cache.get_or_compute(key, compute)
+    return formatted_data
+
+@textizer_router.get("/cache")
+async def cache_stats():
+    return textizer_cache.stats()
@@ -0,0 +1,166 @@
+# backend_langgraph/tests/test_calculators.py
+# Run from backend-langgraph: python -m pytest tests
+import json
+import numpy as np
+import pytest
+
+from Agentic_AI.calculators import (
+    contribution_limits,
+    federal_income_tax,
+    income_tax,
+    normalize_filing_status,
+    project_balance,
+    required_annual_savings,
+    required_minimum_distribution,
+    rmd,
+    rmd_start_age,
+)
+
+
+## Federal income tax
+
+def test_tax_single_2025():
+    # 100,000 - 15,750 deduction = 84,250: 10% of 11,925 + 12% of 36,550 + 22% of 35,775
+    tax, marginal, taxable = federal_income_tax(100000, "single", 2025)
+    assert taxable == 84250
+    assert tax == pytest.approx(1192.5 + 4386 + 7870.5)
+    assert marginal == 0.22
+
+
+def test_tax_married_joint_2024():
+    # 150,000 - 29,200 = 120,800: 10% of 23,200 + 12% of 71,100 + 22% of 26,500
+    tax, marginal, taxable = federal_income_tax(150000, "married_joint", 2024)
+    assert taxable == 120800
+    assert tax == pytest.approx(2320 + 8532 + 5830)
+    assert marginal == 0.22
+
+
+def test_tax_head_of_household_2025():
+    # 100,000 - 23,625 = 76,375: 10% of 17,000 + 12% of 47,850 + 22% of 11,525
+    tax, marginal, taxable = federal_income_tax(100000, "head_of_household", 2025)
+    assert taxable == 76375
+    assert tax == pytest.approx(9977.5)
+    assert marginal == 0.22
+
+
+def test_tax_top_bracket_married_separate_2025():
+    # 35% bracket for separate filers ends at 375,800 (half the joint figure), not at the single 626,350
+    _tax, marginal, _taxable = federal_income_tax(400000 + 15750, "married_separate", 2025)
+    assert marginal == 0.37
+
+
+def test_tax_below_deduction_is_zero():
+    tax, marginal, taxable = federal_income_tax(10000, "single", 2025)
+    assert taxable == 0 and tax == 0
+    assert marginal == 0.10
+
+
+def test_tax_itemized_deductions_above_standard():
+    tax, _marginal, taxable = federal_income_tax(100000, "single", 2025, itemized_deductions=30000)
+    assert taxable == 70000
+    assert tax == pytest.approx(1192.5 + 4386 + 0.22 * (70000 - 48475))
+
+
+def test_tax_array_matches_scalars():
+    incomes = np.array([0, 30000, 100000, 800000])
+    taxes, _rates, _taxable = federal_income_tax(incomes, "single", 2025)
+    assert taxes == pytest.approx([float(federal_income_tax(i, "single", 2025)[0]) for i in incomes])
+
+
+def test_tax_year_outside_table_uses_nearest():
+    assert federal_income_tax(100000, "single", 2030)[0] == federal_income_tax(100000, "single", 2025)[0]
+    assert federal_income_tax(100000, "single", 2019)[0] == federal_income_tax(100000, "single", 2024)[0]
+
+
+@pytest.mark.parametrize("status, expected", [
+    ("Single", "single"),
+    ("married", "married_joint"),
+    ("Married Filing Jointly", "married_joint"),
+    ("married_filing_jointly", "married_joint"),
+    ("MFS", "married_separate"),
+    ("married-filing-separately", "married_separate"),
+    ("Head of Household", "head_of_household"),
+    ("qualifying widow(er)", "married_joint"),
+    (None, "single"),
+])
+def test_filing_status_aliases(status, expected):
+    assert normalize_filing_status(status) == expected
+
+
+def test_income_tax_tool_reports_unknown_status():
+    result = json.loads(income_tax.invoke({"gross_income": 50000, "filing_status": "divorced-ish"}))
+    assert "error" in result
+
+
+def test_income_tax_tool():
+    result = json.loads(income_tax.invoke({"gross_income": 100000, "filing_status": "Single", "year": 2025}))
+    assert result == {"taxable_income": 84250.0, "federal_tax": 13449.0, "marginal_rate": 0.22, "effective_rate": 0.1345}
+
+
+## Required minimum distributions
+
+@pytest.mark.parametrize("birth_year, expected", [(None, 73), (1950, 72), (1951, 73), (1959, 73), (1960, 75)])
+def test_rmd_start_age(birth_year, expected):
+    assert rmd_start_age(birth_year) == expected
+
+
+def test_rmd_uniform_lifetime_table():
+    amount, period = required_minimum_distribution(500000, 75, 73)
+    assert period == 24.6
+    assert amount == pytest.approx(500000 / 24.6)
+
+
+def test_rmd_zero_before_start_age():
+    amount, _period = required_minimum_distribution(500000, 74, 75)
+    assert amount == 0
+
+
+def test_rmd_past_end_of_table():
+    amount, period = required_minimum_distribution(100000, 125)
+    assert period == 2.0
+    assert amount == pytest.approx(50000)
+
+
+def test_rmd_array_of_ages():
+    amounts, periods = required_minimum_distribution(100000, [72, 73, 80], 73)
+    assert list(periods) == [27.4, 26.5, 20.2]
+    assert amounts == pytest.approx([0, 100000 / 26.5, 100000 / 20.2])
+
+
+def test_rmd_tool():
+    result = json.loads(rmd.invoke({"balance": 265000, "age": 73, "birth_year": 1952}))
+    assert result == {"rmd": 10000.0, "distribution_period": 26.5, "rmd_start_age": 73}
+
+
+## Compound growth and level contributions (annuity)
+
+def test_project_balance_end_of_year_contributions():
+    assert project_balance(1000, 100, 0.10, 2) == pytest.approx([1000, 1200, 1420])
+
+
+def test_project_balance_zero_return():
+    assert project_balance(1000, 100, 0.0, 3) == pytest.approx([1000, 1100, 1200, 1300])
+
+
+def test_required_annual_savings_inverts_projection():
+    assert required_annual_savings(1420, 1000, 0.10, 2) == pytest.approx(100)
+    needed = required_annual_savings(1_000_000, 50000, 0.06, 30)
+    assert project_balance(50000, needed, 0.06, 30)[-1] == pytest.approx(1_000_000)
+
+
+def test_required_annual_savings_zero_return():
+    assert required_annual_savings(1300, 1000, 0.0, 3) == pytest.approx(100)
+
+
+def test_required_annual_savings_target_already_reached():
+    assert required_annual_savings(1000, 1000, 0.05, 10) == 0.0
+    assert required_annual_savings(5000, 1000, 0.05, 0) == 4000
+
+
+## Contribution limits
+
+def test_contribution_limits_by_age():
+    assert contribution_limits(40, 2025)["401k_elective_deferral"] == 23500
+    assert contribution_limits(55, 2025)["401k_elective_deferral"] == 31000
+    assert contribution_limits(61, 2025)["401k_elective_deferral"] == 34750
+    assert contribution_limits(61, 2025)["ira"] == 8000
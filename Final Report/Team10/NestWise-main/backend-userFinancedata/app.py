@@ -6,7 +6,7 @@ from routers.summary import summaryRouter
 app = FastAPI(title="User Finance Data Ingest (Mongo)")
 
 app.include_router(filesRouter, prefix="/files", tags=["files"])
-app.include_router(summaryRouter, prefix="/files", tags=["files"])
+app.include_router(summaryRouter, prefix="/summary", tags=["summary"])
 app.include_router(transactionsRouter, prefix="/transactions", tags=["transactions"])   
 
 
@@ -68,6 +68,17 @@ def get_transactions_for_user(user_id: str, limit: int = 100, offset: int = 0):
     return docs
 
 
+def months_covered(first, last) -> int:
+    """Calendar months from the first to the last transaction, both included (0 without dates)."""
+    if first is None or last is None:
+        return 0
+    if isinstance(first, str):
+        first = datetime.fromisoformat(first)
+    if isinstance(last, str):
+        last = datetime.fromisoformat(last)
+    return (last.year - first.year) * 12 + last.month - first.month + 1
+
+
 def get_summary_for_user(user_id: str):
     db = get_db()
     pipeline = [
@@ -86,6 +97,8 @@ def get_summary_for_user(user_id: str):
                         "$cond": [{"$lt": ["$amount", 0]}, "$amount", 0],
                     }
                 },
+                "first": {"$min": "$date"},
+                "last": {"$max": "$date"},
             }
         },
     ]
@@ -101,8 +114,13 @@ def get_summary_for_user(user_id: str):
         income += float(r["income"])
         expenses += abs(float(r["expenses"]))
 
-    monthly_income = income
-    monthly_expenses = expenses
+    # Totals cover every ingested transaction; divide by the months they span for per-month figures
+    months = months_covered(
+        min((r["first"] for r in results if r.get("first")), default=None),
+        max((r["last"] for r in results if r.get("last")), default=None),
+    )
+    monthly_income = income / months if months else 0.0
+    monthly_expenses = expenses / months if months else 0.0
     savings_rate = (
         (monthly_income - monthly_expenses) / monthly_income if monthly_income > 0 else 0.0
     )
@@ -112,5 +130,6 @@ def get_summary_for_user(user_id: str):
         "monthly_income": monthly_income,
         "monthly_expenses": monthly_expenses,
         "savings_rate": savings_rate,
+        "months_covered": months,
         "categories": categories,
     }
@@ -30,4 +30,5 @@ class SummaryOut(BaseModel):
     monthly_income: float = 0.0
     monthly_expenses: float = 0.0
     savings_rate: float = 0.0
+    months_covered: int = 0         # months of transactions the monthly figures are averaged over
     categories: Dict[str, float] = Field(default_factory=dict)
@@ -208,17 +208,9 @@ export default function PlannerBot() {
     try {
       if (!sessionId) throw new Error('Session not started');
 
-      const res = await fetch('http://localhost:8000/chatbot/answer', {
-        method: 'POST',
-        headers: { 
-          "Authorization": `Bearer ${token}`,
-          'Content-Type': 'application/json' 
-        },
-        body: JSON.stringify({
-          session_id: sessionId,
-          message: userInput,
-        }),
-      });
+      // SAME KEY FOR EVERY RETRY OF THIS TURN, THE BACKEND REPLAYS IT INSTEAD OF ANSWERING TWICE
+      const idempotencyKey = crypto.randomUUID();
+      const res = await sendAnswer(userInput, idempotencyKey, token);
 
       if (res.status === 401) {
             removeThinkingMessage();
@@ -238,6 +230,14 @@ export default function PlannerBot() {
       removeThinkingMessage();
       await addBotMessage(data.response);
 
+      // PLAN IS GENERATED IN THE BACKGROUND, POLL UNTIL IT IS READY
+      if (data.plan_job_id) {
+        addThinkingMessage();
+        const plan = await pollPlanJob(data.plan_job_id, token);
+        removeThinkingMessage();
+        await addBotMessage(plan);
+      }
+
 
     } catch (err) {
 
@@ -259,6 +259,61 @@ export default function PlannerBot() {
 
 
 
+  const sendAnswer = async (message, idempotencyKey, token) => {
+    const maxAttempts = 3;
+
+    for (let attempt = 1; ; attempt++) {
+      let res;
+      try {
+        res = await fetch('http://localhost:8000/chatbot/answer', {
+          method: 'POST',
+          headers: { 
+            "Authorization": `Bearer ${token}`,
+            'Content-Type': 'application/json',
+            'Idempotency-Key': idempotencyKey,
+          },
+          body: JSON.stringify({
+            session_id: sessionId,
+            message,
+          }),
+        });
+      } catch (err) {
+        // NETWORK ERROR, THE TURN MAY STILL BE RUNNING ON THE SERVER
+        if (attempt >= maxAttempts) throw err;
+        await new Promise((resolve) => setTimeout(resolve, 1000 * attempt));
+        continue;
+      }
+
+      // 500 MEANS THE TURN FAILED ON THE SERVER, ONLY RETRY RATE LIMITS AND GATEWAY ERRORS
+      const retryable = res.status === 429 || [502, 503, 504].includes(res.status);
+      if (!retryable || attempt >= maxAttempts) return res;
+
+      const retryAfter = Number(res.headers.get('Retry-After')) || attempt;
+      await new Promise((resolve) => setTimeout(resolve, retryAfter * 1000));
+    }
+  };
+
+  const pollPlanJob = async (jobId, token) => {
+    const pollIntervalMs = 2000;
+    const maxPolls = 300;
+
+    for (let i = 0; i < maxPolls; i++) {
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+
+      const res = await fetch(`http://localhost:8000/chatbot/plan/${jobId}`, {
+        headers: { "Authorization": `Bearer ${token}` },
+      });
+      if (!res.ok) throw new Error(`Server error: ${res.status}`);
+
+      const job = await res.json();
+      if (job.status === 'done') return job.result.plan;
+      if (job.status === 'failed') throw new Error(job.error || 'Plan generation failed');
+    }
+    throw new Error('Plan generation timed out');
+  };
+
+
+
   const handleFileUpload = (event) => {
     const files = event.target.files;
     if (files.length > 0) console.log('Uploaded files:', files);